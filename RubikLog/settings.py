@@ -5,6 +5,7 @@ Django settings for RubikLog project.
 from pathlib import Path
 import os
 import sys
+import tempfile
 from decouple import config, Csv
 
 # Check if we're running tests
@@ -41,6 +42,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Outside PerformanceMiddleware, so EXPLAINs are not counted as request time
+    "tracker.middleware.QueryPlanMiddleware",
+    # Then this, so its timings cover everything below it
+    "tracker.middleware.PerformanceMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -151,21 +156,67 @@ if os.path.exists(FRONTEND_BUILD_DIR):
 # Default primary key field type
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
-# Cache settings - Use file-based cache instead of memory cache
+# Cache settings - a bounded in-process LRU in front of the file-based cache
+# shared by every worker (see tracker.cache_backends.TwoTierCache); backends
+# report hits and misses to tracker.metrics
 CACHES = {
     "default": {
         "BACKEND": (
-            "django.core.cache.backends.filebased.FileBasedCache"
+            "tracker.cache_backends.TwoTierCache"
             if not TESTING
-            else "django.core.cache.backends.dummy.DummyCache"
+            else "tracker.cache_backends.DummyCache"
         ),
         "LOCATION": "/tmp/django_cache",
+        "OPTIONS": (
+            {
+                # Seconds a worker may serve a key from memory
+                "LOCAL_TIMEOUT": config("CACHE_LOCAL_TIMEOUT", default=5, cast=float),
+                "LOCAL_MAX_ENTRIES": config(
+                    "CACHE_LOCAL_MAX_ENTRIES", default=1024, cast=int
+                ),
+                "LOCAL_MAX_BYTES": config(
+                    "CACHE_LOCAL_MAX_BYTES", default=16 * 1024 * 1024, cast=int
+                ),
+                # Seconds before invalidations by other workers are noticed
+                "SYNC_INTERVAL": config("CACHE_SYNC_INTERVAL", default=1, cast=float),
+            }
+            if not TESTING
+            else {}
+        ),
     }
 }
 
 # Reduce cache timeout
 CACHE_TTL = 60  # 1 minute
 
+# Seconds an expired solve list or stats entry may still be served while one
+# request recomputes it (tracker.caching.cached_compute)
+CACHE_STALE_GRACE = config("CACHE_STALE_GRACE", default=30, cast=float)
+# Refresh cached stats in the background this many seconds before they
+# expire; 0 turns it off
+STATS_CACHE_REFRESH_AHEAD = config("STATS_CACHE_REFRESH_AHEAD", default=30, cast=float)
+
+# Memory-mapped solve columns for analytics (tracker.columnar); derived data,
+# rebuilt from the database whenever it is missing or out of step
+SOLVE_SNAPSHOT_DIR = config(
+    "SOLVE_SNAPSHOT_DIR",
+    default=(
+        tempfile.mkdtemp(prefix="rubiklog_snapshot_")
+        if TESTING
+        else "/tmp/rubiklog_snapshot"
+    ),
+)
+
+# Query plan profiling - explain the slowest query of 1 in N requests (0 = off)
+QUERY_PLAN_SAMPLE_RATE = config("QUERY_PLAN_SAMPLE_RATE", default=0, cast=int)
+# Let clients ask for a plan with the X-Query-Plan: 1 header
+QUERY_PLAN_HEADER_ENABLED = config(
+    "QUERY_PLAN_HEADER_ENABLED", default=DEBUG, cast=bool
+)
+# Also explain any query at least this slow, sampled or not (0 = off)
+QUERY_PLAN_SLOW_MS = config("QUERY_PLAN_SLOW_MS", default=0, cast=float)
+QUERY_PLAN_BUFFER_SIZE = config("QUERY_PLAN_BUFFER_SIZE", default=50, cast=int)
+
 REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 5,  # Reduce page size
@@ -187,6 +238,27 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Cube scanners kept ready per worker process (one per concurrent scan)
+CUBE_SCANNER_POOL_SIZE = config("CUBE_SCANNER_POOL_SIZE", default=1, cast=int)
+# Load the TensorFlow model when scanners are built instead of on first use
+CUBE_SCANNER_LOAD_MODEL = config("CUBE_SCANNER_LOAD_MODEL", default=False, cast=bool)
+
+# Process pool size for the run_scan_worker command
+SCAN_WORKER_PROCESSES = config("SCAN_WORKER_PROCESSES", default=2, cast=int)
+
+# Trained solve time predictor (model and fitted scaler), loaded once per
+# worker process by tracker.ml_service.get_prediction_service
+SOLVE_PREDICTOR_DIR = config(
+    "SOLVE_PREDICTOR_DIR",
+    default=os.path.join(BASE_DIR, "ml_models", "solve_predictor"),
+)
+# Concurrent predictions are batched: up to this many per model call, waiting
+# at most this long for the batch to fill
+SOLVE_PREDICTOR_BATCH_SIZE = config("SOLVE_PREDICTOR_BATCH_SIZE", default=32, cast=int)
+SOLVE_PREDICTOR_BATCH_WAIT_MS = config(
+    "SOLVE_PREDICTOR_BATCH_WAIT_MS", default=5, cast=float
+)
+
 # Channel Layers configuration
 CHANNEL_LAYERS = {
     "default": {
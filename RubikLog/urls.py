@@ -20,7 +20,7 @@ from django.urls import path, include
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 from rest_framework import permissions
-from tracker.views import health_check, readiness_check, liveness_check
+from tracker.views import health_check, readiness_check, liveness_check, metrics_view
 
 schema_view = get_schema_view(
     openapi.Info(
@@ -40,5 +40,6 @@ urlpatterns = [
         path("health/", health_check, name="health-check"),
         path("ready/", readiness_check, name="readiness-check"),
         path("alive/", liveness_check, name="liveness-check"),
+        path("metrics/", metrics_view, name="metrics"),
     ], "api"))),
 ]
@@ -1,5 +1,6 @@
 # Gunicorn configuration file
 import multiprocessing
+import os
 
 # Server socket
 bind = "0.0.0.0:10000"
@@ -7,8 +8,14 @@ backlog = 2048
 
 # Worker processes
 workers = 1  # Single worker to save memory
-worker_class = 'sync'
-worker_connections = 100
+# The deploy configs serve RubikLog.asgi:application: the Uvicorn worker keeps
+# up to worker_connections requests in flight in the same single process and
+# serves the live stats websocket (ws/solves/stats/). The in-memory channel
+# layer only reaches clients of its own process, so more workers need the
+# Redis layer in settings.CHANNEL_LAYERS. GUNICORN_WORKER_CLASS=sync with
+# RubikLog.wsgi:application still works, without websockets.
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'uvicorn_worker.UvicornWorker')
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 100))
 timeout = 60  # Increased timeout
 keepalive = 2
 
@@ -35,4 +42,13 @@ certfile = None
 # Memory optimization
 max_requests = 1000
 max_requests_jitter = 50
-worker_tmp_dir = '/dev/shm'  # Use RAM for temporary files
\ No newline at end of file
+worker_tmp_dir = '/dev/shm'  # Use RAM for temporary files
+
+
+# Hooks
+def post_worker_init(worker):
+    """Build the cube scanner pool and load the solve predictor up front"""
+    from tracker.ml_service import get_prediction_service, get_scanner_pool
+
+    get_scanner_pool().warm_up()
+    get_prediction_service().warm_up()
@@ -0,0 +1,299 @@
+"""
+Daily and weekly solve rollups.
+
+Each ``SolveAggregate`` row holds count, sum, sum of squares, best and
+worst for one period (day or week), cube type and session. Inserts are added
+to their buckets with a single UPDATE each; deletes and edits recompute the
+one bucket they touched, which is a range scan over at most a week of
+solves. Trend charts then read a handful of rows per period no matter how
+long the history is.
+"""
+
+import logging
+import math
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from django.db import IntegrityError, transaction
+from django.db.models import (
+    Count,
+    DateField,
+    F,
+    Max,
+    Min,
+    QuerySet,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Coalesce, Greatest, Least, TruncDay, TruncWeek
+from django.utils import timezone
+
+from .models import Solve, SolveAggregate
+
+logger = logging.getLogger(__name__)
+
+DAY = SolveAggregate.DAY
+WEEK = SolveAggregate.WEEK
+PERIODS = (DAY, WEEK)
+
+# (period, period_start, cube_type_id, session_id)
+BucketKey = Tuple[str, date, Optional[int], Optional[int]]
+
+
+def period_start_of(day: date, period: str) -> date:
+    """Return the first day of the period (the day itself, or its Monday)"""
+    if period == WEEK:
+        return day - timedelta(days=day.weekday())
+    return day
+
+
+def period_start(moment: datetime, period: str) -> date:
+    """Return the start of the period a moment falls in, in TIME_ZONE"""
+    return period_start_of(timezone.localdate(moment), period)
+
+
+def period_bounds(start: date, period: str) -> Tuple[datetime, datetime]:
+    """Return the aware [start, end) datetimes covered by a bucket"""
+    end = start + timedelta(days=7 if period == WEEK else 1)
+    return (
+        timezone.make_aware(datetime.combine(start, time.min)),
+        timezone.make_aware(datetime.combine(end, time.min)),
+    )
+
+
+def bucket_keys(solve: Solve) -> List[BucketKey]:
+    """Return the day and week buckets a solve belongs to"""
+    return [
+        (
+            period,
+            period_start(solve.created_at, period),
+            solve.cube_type_id,
+            solve.session_id,
+        )
+        for period in PERIODS
+    ]
+
+
+def _dimension_lookup(key: BucketKey) -> Dict[str, Any]:
+    # Spelled out because filter(field_id=None) never matches a NULL
+    _, _, cube_type_id, session_id = key
+    lookup: Dict[str, Any] = {}
+    for field, value in (("cube_type", cube_type_id), ("session", session_id)):
+        if value is None:
+            lookup[f"{field}__isnull"] = True
+        else:
+            lookup[f"{field}_id"] = value
+    return lookup
+
+
+def _bucket_lookup(key: BucketKey) -> Dict[str, Any]:
+    period, start, _, _ = key
+    return {"period": period, "period_start": start, **_dimension_lookup(key)}
+
+
+def bucket_solves(key: BucketKey) -> QuerySet:
+    """Return the solves that make up a bucket, bounded by the created_at index"""
+    period, start, _, _ = key
+    begin, end = period_bounds(start, period)
+    return Solve.objects.filter(
+        created_at__gte=begin, created_at__lt=end, **_dimension_lookup(key)
+    )
+
+
+def _merge(key: BucketKey, times: np.ndarray) -> None:
+    count = len(times)
+    total = float(times.sum())
+    total_squared = float(np.dot(times, times))
+    best, worst = float(times.min()), float(times.max())
+    changes = {
+        "count": F("count") + count,
+        "total_time": F("total_time") + total,
+        "total_time_squared": F("total_time_squared") + total_squared,
+        "best_time": Least(Coalesce(F("best_time"), Value(best)), Value(best)),
+        "worst_time": Greatest(Coalesce(F("worst_time"), Value(worst)), Value(worst)),
+    }
+    lookup = _bucket_lookup(key)
+
+    if SolveAggregate.objects.filter(**lookup).update(**changes):
+        return
+    period, start, cube_type_id, session_id = key
+    try:
+        with transaction.atomic():
+            SolveAggregate.objects.create(
+                period=period,
+                period_start=start,
+                cube_type_id=cube_type_id,
+                session_id=session_id,
+                count=count,
+                total_time=total,
+                total_time_squared=total_squared,
+                best_time=best,
+                worst_time=worst,
+            )
+    except IntegrityError:
+        # A concurrent writer created the bucket first; add to theirs
+        SolveAggregate.objects.filter(**lookup).update(**changes)
+
+
+def record_solves(solves: Iterable[Solve]) -> None:
+    """Add newly created solves to their day and week buckets"""
+    by_bucket: Dict[BucketKey, List[float]] = {}
+    for solve in solves:
+        for key in bucket_keys(solve):
+            by_bucket.setdefault(key, []).append(solve.time_taken)
+    with transaction.atomic():
+        for key, times in by_bucket.items():
+            _merge(key, np.array(times, dtype=float))
+
+
+def rebuild_bucket(key: BucketKey) -> None:
+    """Recompute one bucket from the solve table (after a delete or edit)"""
+    aggregates = bucket_solves(key).aggregate(
+        count=Count("id"),
+        total=Sum("time_taken"),
+        total_squared=Sum(F("time_taken") * F("time_taken")),
+        best=Min("time_taken"),
+        worst=Max("time_taken"),
+    )
+    lookup = _bucket_lookup(key)
+    with transaction.atomic():
+        if not aggregates["count"]:
+            SolveAggregate.objects.filter(**lookup).delete()
+            return
+        values = {
+            "count": aggregates["count"],
+            "total_time": aggregates["total"],
+            "total_time_squared": aggregates["total_squared"],
+            "best_time": aggregates["best"],
+            "worst_time": aggregates["worst"],
+        }
+        if not SolveAggregate.objects.filter(**lookup).update(**values):
+            period, start, cube_type_id, session_id = key
+            SolveAggregate.objects.create(
+                period=period,
+                period_start=start,
+                cube_type_id=cube_type_id,
+                session_id=session_id,
+                **values,
+            )
+
+
+def rebuild_buckets(solves: Iterable[Solve]) -> None:
+    """Recompute every bucket the given solves belong to"""
+    keys = {key for solve in solves for key in bucket_keys(solve)}
+    for key in keys:
+        rebuild_bucket(key)
+
+
+def rebuild_all(batch_size: int = 1000) -> int:
+    """Recompute every rollup with one grouped query per period"""
+    with transaction.atomic():
+        SolveAggregate.objects.all().delete()
+        created = 0
+        for period, trunc in ((DAY, TruncDay), (WEEK, TruncWeek)):
+            rows = (
+                Solve.objects.order_by()
+                .annotate(bucket=trunc("created_at", output_field=DateField()))
+                .values("bucket", "cube_type_id", "session_id")
+                .annotate(
+                    count=Count("id"),
+                    total=Sum("time_taken"),
+                    total_squared=Sum(F("time_taken") * F("time_taken")),
+                    best=Min("time_taken"),
+                    worst=Max("time_taken"),
+                )
+            )
+            aggregates = [
+                SolveAggregate(
+                    period=period,
+                    period_start=row["bucket"],
+                    cube_type_id=row["cube_type_id"],
+                    session_id=row["session_id"],
+                    count=row["count"],
+                    total_time=row["total"],
+                    total_time_squared=row["total_squared"],
+                    best_time=row["best"],
+                    worst_time=row["worst"],
+                )
+                for row in rows.iterator()
+            ]
+            SolveAggregate.objects.bulk_create(aggregates, batch_size=batch_size)
+            created += len(aggregates)
+    logger.info(f"Rebuilt {created} solve aggregates")
+    return created
+
+
+def _day_queryset(day: date, **filters: Optional[int]) -> QuerySet:
+    queryset = SolveAggregate.objects.filter(period=DAY, period_start=day)
+    for field in ("cube_type_id", "session_id"):
+        if filters.get(field) is not None:
+            queryset = queryset.filter(**{field: filters[field]})
+    return queryset
+
+
+def solve_count_on(day: date, **filters: Optional[int]) -> int:
+    """
+    Number of solves recorded on a day, from the daily rollups.
+
+    Optionally narrowed by ``cube_type_id`` and/or ``session_id``.
+    """
+    return _day_queryset(day, **filters).aggregate(total=Sum("count"))["total"] or 0
+
+
+async def asolve_count_on(day: date, **filters: Optional[int]) -> int:
+    """Async ``solve_count_on``"""
+    result = await _day_queryset(day, **filters).aaggregate(total=Sum("count"))
+    return result["total"] or 0
+
+
+def trend_queryset(
+    period: str,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    cube_type_id: Optional[int] = None,
+    session_id: Optional[int] = None,
+) -> QuerySet:
+    """Per-period sums across the buckets matching the filters, oldest first"""
+    queryset = SolveAggregate.objects.filter(period=period)
+    if since is not None:
+        queryset = queryset.filter(period_start__gte=period_start_of(since, period))
+    if until is not None:
+        queryset = queryset.filter(period_start__lte=until)
+    if cube_type_id is not None:
+        queryset = queryset.filter(cube_type_id=cube_type_id)
+    if session_id is not None:
+        queryset = queryset.filter(session_id=session_id)
+    return (
+        queryset.values("period_start")
+        .annotate(
+            count=Sum("count"),
+            total=Sum("total_time"),
+            total_squared=Sum("total_time_squared"),
+            best=Min("best_time"),
+            worst=Max("worst_time"),
+        )
+        .order_by("period_start")
+    )
+
+
+def build_trend_point(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn one summed period into the payload served by the trends endpoint"""
+    count = row["count"]
+    std_deviation = None
+    if count >= 2:
+        variance = (row["total_squared"] - row["total"] ** 2 / count) / (count - 1)
+        std_deviation = math.sqrt(max(variance, 0.0))
+    return {
+        "period_start": row["period_start"],
+        "count": count,
+        "average_time": row["total"] / count,
+        "best_time": row["best"],
+        "worst_time": row["worst"],
+        "std_deviation": std_deviation,
+    }
+
+
+def trend_series(period: str = DAY, **filters: Any) -> List[Dict[str, Any]]:
+    """Chart-ready points for a period, oldest first (see ``trend_queryset``)"""
+    return [build_trend_point(row) for row in trend_queryset(period, **filters)]
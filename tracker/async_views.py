@@ -0,0 +1,177 @@
+"""
+Async read endpoints for solves and stats.
+
+These mirror ``SolveList``, ``SolveDetail`` and ``SolveStats`` for reads but
+are native ``async def`` Django views using the async ORM and cache APIs.
+Served by an ASGI worker (see ``gunicorn_config.py``) one process can keep
+many slow reads in flight at once instead of one per sync worker. Writes
+stay on the DRF views, where the signal hooks keep caches and stats current.
+"""
+
+import logging
+import math
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.http import Http404, HttpRequest, JsonResponse
+from django.utils import timezone
+from django.views import View
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from . import aggregates, stats_store
+from .caching import SOLVE_STATS_NAMESPACE, SOLVES_LIST_NAMESPACE, acached_compute
+from .models import CubeType, Solve
+from .serializers import SolveSerializer, SolveStatsSerializer
+from .views import (
+    SolveKeysetPagination,
+    SolvePagination,
+    filter_solves,
+    parse_cube_type,
+    solve_list_cache_suffix,
+    stats_cache_suffix,
+    use_cursor_pagination,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncSolveList(View):
+    """Async ``GET`` of the solve list; same filters and pagination as SolveList"""
+
+    http_method_names = ["get"]
+    pagination_class = SolvePagination
+    cursor_pagination_class = SolveKeysetPagination
+
+    async def get(self, request: HttpRequest) -> JsonResponse:
+        logger.info("Starting AsyncSolveList.get request")
+        try:
+            data = await acached_compute(
+                SOLVES_LIST_NAMESPACE,
+                # Links in the payload point at this endpoint, so keep its
+                # entries apart from the sync view's
+                f"async_{solve_list_cache_suffix(request.GET)}",
+                lambda: self.list_page(request),
+                timeout=60,
+            )
+            return JsonResponse(data)
+
+        except ValidationError as e:
+            return JsonResponse(e.detail, status=400)
+        except Http404:
+            return JsonResponse({"detail": "Invalid page."}, status=404)
+        except Exception as e:
+            logger.error(f"Error in AsyncSolveList.get: {str(e)}", exc_info=True)
+            return JsonResponse(
+                {"error": "Failed to fetch solves. Please try again."}, status=500
+            )
+
+    async def list_page(self, request: HttpRequest) -> Dict[str, Any]:
+        solves, sort_by = filter_solves(request.GET)
+        if use_cursor_pagination(request.GET):
+            return await self.get_cursor_page(solves, request, sort_by)
+        return await self.get_numbered_page(solves, request)
+
+    async def get_cursor_page(
+        self, solves: Any, request: HttpRequest, sort_by: str
+    ) -> Dict[str, Any]:
+        paginator = self.cursor_pagination_class()
+        page_queryset = paginator.get_page_queryset(solves, request, sort_by)
+        rows = paginator.paginate_rows([solve async for solve in page_queryset])
+        return paginator.get_paginated_data(SolveSerializer(rows, many=True).data)
+
+    async def get_numbered_page(
+        self, solves: Any, request: HttpRequest
+    ) -> Dict[str, Any]:
+        paginator = self.pagination_class()
+        try:
+            per_page = int(request.GET[paginator.page_size_query_param])
+            per_page = min(per_page, paginator.max_page_size) if per_page > 0 else 0
+        except (KeyError, ValueError):
+            per_page = 0
+        per_page = per_page or paginator.page_size
+
+        count = await solves.acount()
+        num_pages = max(math.ceil(count / per_page), 1)
+        page_param = request.GET.get(paginator.page_query_param, 1)
+        try:
+            number = num_pages if page_param == "last" else int(page_param)
+        except (TypeError, ValueError):
+            raise Http404
+        if number < 1 or number > num_pages:
+            raise Http404
+
+        offset = (number - 1) * per_page
+        rows = [solve async for solve in solves[offset : offset + per_page]]
+        url = request.build_absolute_uri()
+        return {
+            "count": count,
+            "next": self.get_page_link(url, paginator, number + 1, num_pages),
+            "previous": self.get_page_link(url, paginator, number - 1, num_pages),
+            "results": SolveSerializer(rows, many=True).data,
+        }
+
+    def get_page_link(
+        self, url: str, paginator: SolvePagination, number: int, num_pages: int
+    ) -> Optional[str]:
+        # Same link shape as PageNumberPagination: page 1 drops the parameter
+        if number < 1 or number > num_pages:
+            return None
+        if number == 1:
+            return remove_query_param(url, paginator.page_query_param)
+        return replace_query_param(url, paginator.page_query_param, number)
+
+
+class AsyncSolveDetail(View):
+    http_method_names = ["get"]
+
+    async def get(self, request: HttpRequest, pk: int) -> JsonResponse:
+        try:
+            solve = await Solve.objects.aget(pk=pk)
+        except Solve.DoesNotExist:
+            return JsonResponse(
+                {"detail": "No Solve matches the given query."}, status=404
+            )
+        return JsonResponse(SolveSerializer(solve).data)
+
+
+class AsyncSolveStats(View):
+    """Async ``GET`` of the stats payload served by SolveStats"""
+
+    http_method_names = ["get"]
+
+    async def get(self, request: HttpRequest) -> JsonResponse:
+        try:
+            cube_type_id = parse_cube_type(request.GET)
+        except ValidationError as e:
+            return JsonResponse(e.detail, status=400)
+        user = await request.auser()
+        try:
+            data = await acached_compute(
+                SOLVE_STATS_NAMESPACE,
+                stats_cache_suffix(user.id, cube_type_id),
+                lambda: self.compute_stats(cube_type_id),
+                timeout=60 * 5,
+                refresh_ahead=settings.STATS_CACHE_REFRESH_AHEAD,
+            )
+            return JsonResponse(data)
+        except NotFound as e:
+            return JsonResponse(e.detail, status=404)
+        except Exception as e:
+            logger.error(f"Error calculating stats: {str(e)}")
+            return JsonResponse({"error": "Could not calculate statistics"}, status=500)
+
+    async def compute_stats(self, cube_type_id: Optional[int]) -> Dict[str, Any]:
+        if (
+            cube_type_id is not None
+            and not await CubeType.objects.filter(pk=cube_type_id).aexists()
+        ):
+            raise NotFound({"cube_type": "Unknown cube type"})
+
+        scope = stats_store.stats_scope(cube_type_id)
+        record = await stats_store.aget_statistics(scope)
+        stats_data = stats_store.build_stats_data(record)
+        stats_data["solve_count_today"] = await aggregates.asolve_count_on(
+            timezone.localdate(), cube_type_id=cube_type_id
+        )
+        return SolveStatsSerializer(stats_data).data
@@ -0,0 +1,242 @@
+"""
+Latency benchmarks for the solves API, the stats engine and the scanner.
+
+Each dataset is seeded through the same bulk path the importer uses, so
+stats, rollups, PBs and the columnar snapshot are maintained as they are in
+production. Every scenario is then requested ``warmup`` times untimed and
+``trials`` times timed. The results report p50/p95/p99 latency in
+milliseconds and the number of queries per request. They are plain JSON, so
+a run can be stored as a baseline and later runs compared against it.
+
+``manage.py benchmark`` runs the suite against a throwaway test database,
+with the test environment set up and request throttling turned off.
+"""
+
+import base64
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone as dt_timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import cv2
+import numpy as np
+from django.conf import settings
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+
+from . import fake_data
+from .caching import invalidate_solve_caches
+from .models import Solve
+from .signals import solves_bulk_created
+
+logger = logging.getLogger(__name__)
+
+DATASETS = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+SCRAMBLE = "R U R' U' R' F R2 U' R' U' R U R' F'"
+# Fixed so every run seeds the same solves
+SEED_END = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+PERCENTILES = (50, 95, 99)
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+@dataclass
+class Scenario:
+    name: str
+    request: Callable[[APIClient], Any]
+    # Drop cached solve lists and stats before every trial
+    cold: bool = False
+
+
+def _face_image() -> str:
+    """A base64 data URL of a solved red face, as the scanner UI posts it"""
+    image = np.zeros((300, 300, 3), dtype=np.uint8)
+    image[:] = cv2.cvtColor(np.uint8([[[0, 200, 200]]]), cv2.COLOR_HSV2BGR)
+    ok, encoded = cv2.imencode(".jpg", image)
+    if not ok:
+        raise BenchmarkError("Could not encode the scanner test image")
+    return "data:image/jpeg;base64," + base64.b64encode(encoded.tobytes()).decode()
+
+
+def default_scenarios() -> List[Scenario]:
+    image = _face_image()
+    return [
+        Scenario(
+            "solve_list", lambda client: client.get(reverse("api:solve-list")), True
+        ),
+        Scenario(
+            "solve_list_cached", lambda client: client.get(reverse("api:solve-list"))
+        ),
+        Scenario(
+            "solve_stats", lambda client: client.get(reverse("api:solve-stats")), True
+        ),
+        Scenario(
+            "solve_create",
+            lambda client: client.post(
+                reverse("api:solve-list"),
+                {"time_taken": 12.34, "scramble": SCRAMBLE},
+                format="json",
+            ),
+        ),
+        Scenario(
+            "scan",
+            lambda client: client.post(
+                reverse("api:scan-cube"), {"image": image}, format="json"
+            ),
+        ),
+    ]
+
+
+def seed_solves(total: int, seed: int = 0) -> int:
+    """Add generated solves until the table holds ``total``; returns how many"""
+    existing = Solve.objects.count()
+    # Seeded by the table size too, so growing a dataset adds fresh rows
+    spec = fake_data.FakeDataSpec(
+        count=max(total - existing, 0),
+        end=SEED_END,
+        seed=seed + existing,
+        days_back=365,
+    )
+    for index in range(spec.batches):
+        with transaction.atomic():
+            solves = Solve.objects.bulk_create(fake_data.generate_batch(spec, index))
+            solves_bulk_created(solves)
+    if spec.count:
+        logger.info(f"Seeded {spec.count} solves ({total} in total)")
+    return spec.count
+
+
+def summarize(latencies_ms: List[float], queries: List[int]) -> Dict[str, float]:
+    latencies = np.asarray(latencies_ms, dtype=float)
+    summary = {"trials": len(latencies)}
+    for percentile in PERCENTILES:
+        summary[f"p{percentile}_ms"] = round(
+            float(np.percentile(latencies, percentile)), 3
+        )
+    summary["mean_ms"] = round(float(latencies.mean()), 3)
+    summary["max_ms"] = round(float(latencies.max()), 3)
+    summary["queries_median"] = float(np.median(queries))
+    summary["queries_max"] = int(max(queries))
+    return summary
+
+
+def run_scenario(
+    client: APIClient, scenario: Scenario, trials: int, warmup: int
+) -> Dict[str, float]:
+    for _ in range(warmup):
+        scenario.request(client)
+
+    latencies, queries = [], []
+    for _ in range(trials):
+        if scenario.cold:
+            invalidate_solve_caches()
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            response = scenario.request(client)
+            elapsed = time.perf_counter() - start
+        if response.status_code >= 400:
+            raise BenchmarkError(
+                f"{scenario.name} answered {response.status_code}: "
+                f"{response.content[:200]!r}"
+            )
+        latencies.append(elapsed * 1000)
+        queries.append(len(captured.captured_queries))
+    return summarize(latencies, queries)
+
+
+@contextmanager
+def unthrottled() -> Iterator[None]:
+    """Turn off DRF throttling, which a benchmark run would exhaust at once"""
+    rest_framework = {
+        name: value
+        for name, value in settings.REST_FRAMEWORK.items()
+        if name != "DEFAULT_THROTTLE_CLASSES"
+    }
+    # Views copy DEFAULT_THROTTLE_CLASSES when they are defined, so the
+    # override alone does not reach the ones already imported
+    get_throttles = APIView.get_throttles
+    APIView.get_throttles = lambda self: []
+    try:
+        with override_settings(REST_FRAMEWORK=rest_framework):
+            yield
+    finally:
+        APIView.get_throttles = get_throttles
+
+
+def run_suite(
+    datasets: Dict[str, int],
+    trials: int = 50,
+    warmup: int = 5,
+    scenarios: Optional[Iterable[str]] = None,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Seed each dataset (smallest first, growing the table) and run the scenarios"""
+    selected = [
+        scenario
+        for scenario in default_scenarios()
+        if scenarios is None or scenario.name in scenarios
+    ]
+    unknown = set(scenarios or ()) - {scenario.name for scenario in selected}
+    if unknown:
+        raise BenchmarkError(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+    results: Dict[str, Any] = {
+        "meta": {
+            "created_at": timezone.now().isoformat(),
+            "database": connection.vendor,
+            "trials": trials,
+            "warmup": warmup,
+        },
+        "datasets": {},
+    }
+    client = APIClient()
+    for name, size in sorted(datasets.items(), key=lambda item: item[1]):
+        seed_solves(size, seed=seed)
+        results["datasets"][name] = {
+            "solves": size,
+            "scenarios": {
+                scenario.name: run_scenario(client, scenario, trials, warmup)
+                for scenario in selected
+            },
+        }
+        logger.info(f"Benchmarked dataset {name} ({size} solves)")
+    return results
+
+
+def compare(
+    results: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = 0.25,
+    metric: str = "p95_ms",
+) -> List[str]:
+    """
+    List regressions against a baseline run.
+
+    A scenario regresses when ``metric`` grew by more than ``tolerance``
+    (a fraction) or when it issues more queries than before.
+    """
+    regressions = []
+    for name, dataset in results["datasets"].items():
+        base_scenarios = baseline.get("datasets", {}).get(name, {}).get("scenarios", {})
+        for scenario, summary in dataset["scenarios"].items():
+            base = base_scenarios.get(scenario)
+            if base is None:
+                continue
+            if summary[metric] > base[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{name}/{scenario}: {metric} {summary[metric]} > "
+                    f"{base[metric]} (+{tolerance:.0%})"
+                )
+            if summary["queries_max"] > base["queries_max"]:
+                regressions.append(
+                    f"{name}/{scenario}: {summary['queries_max']} queries > "
+                    f"{base['queries_max']}"
+                )
+    return regressions
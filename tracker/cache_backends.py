@@ -0,0 +1,256 @@
+"""
+Django cache backends that report hits and misses to ``tracker.metrics``.
+
+The first three are the stock backends of the same name with ``get``
+counting whether the key was found. ``get_many`` and the async methods go
+through ``get`` on these backends, so they are counted too.
+
+``TwoTierCache`` puts a bounded in-process LRU in front of a shared backend
+(the file cache by default). Reads of hot keys are then served from memory
+without opening a file.
+"""
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from django.core.cache.backends import dummy, filebased, locmem
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.utils.module_loading import import_string
+
+from . import metrics
+
+_MISSING = object()
+
+
+class InstrumentedCacheMixin:
+    def get(self, key: str, default: Any = None, version: Optional[int] = None) -> Any:
+        value = super().get(key, _MISSING, version=version)
+        metrics.record_cache(value is not _MISSING)
+        return default if value is _MISSING else value
+
+
+class FileBasedCache(InstrumentedCacheMixin, filebased.FileBasedCache):
+    pass
+
+
+class LocMemCache(InstrumentedCacheMixin, locmem.LocMemCache):
+    pass
+
+
+class DummyCache(InstrumentedCacheMixin, dummy.DummyCache):
+    pass
+
+
+class BaseTwoTierCache(BaseCache):
+    """
+    In-process LRU over a shared cache, one instance per worker process.
+
+    Writes go through to the shared tier and refresh the local copy. Local
+    entries live at most ``LOCAL_TIMEOUT`` seconds (and never past their
+    own timeout); the LRU holds at most ``LOCAL_MAX_ENTRIES`` values and
+    ``LOCAL_MAX_BYTES`` of pickled data. Values are kept pickled, as in
+    ``LocMemCache``, so callers never share a mutable object.
+
+    Deletes, ``incr``/``decr`` (which is how ``tracker.caching`` bumps
+    namespace versions) and ``clear`` also bump a generation counter in the
+    shared tier. Every worker compares it with the generation it last saw at
+    most once per ``SYNC_INTERVAL`` seconds, and drops its local tier when it
+    has moved. Another worker's invalidation therefore shows up within
+    ``SYNC_INTERVAL``. A plain ``set`` of a key another worker holds only
+    shows up once that worker's copy expires (``LOCAL_TIMEOUT``). Keys
+    starting with one of ``LOCAL_EXCLUDE_PREFIXES`` (DRF throttle history and
+    the query plan buffer by default) are never kept locally, so deleting or
+    incrementing them leaves the local tiers alone.
+    """
+
+    GENERATION_KEY = "two_tier_generation"
+
+    def __init__(self, location: str, params: Dict[str, Any]) -> None:
+        super().__init__(params)
+        options = dict(params.get("OPTIONS", {}))
+        self._local_timeout = float(options.pop("LOCAL_TIMEOUT", 5))
+        self._local_max_entries = int(options.pop("LOCAL_MAX_ENTRIES", 1024))
+        self._local_max_bytes = int(options.pop("LOCAL_MAX_BYTES", 16 * 1024 * 1024))
+        self._sync_interval = float(options.pop("SYNC_INTERVAL", 1))
+        self._exclude_prefixes = tuple(
+            options.pop("LOCAL_EXCLUDE_PREFIXES", ("throttle_", "query_plan_"))
+        )
+        backend = import_string(
+            options.pop(
+                "SHARED_BACKEND", "django.core.cache.backends.filebased.FileBasedCache"
+            )
+        )
+        self._shared: BaseCache = backend(location, {**params, "OPTIONS": options})
+
+        # local key -> (monotonic expiry, pickled value)
+        self._local: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._local_bytes = 0
+        self._lock = threading.Lock()
+        self._generation: Any = None
+        self._next_sync = 0.0
+
+    # Local tier
+
+    def _keeps_locally(self, key: str) -> bool:
+        """Whether a key (as the caller passed it, before prefixing) may be kept"""
+        return not key.startswith(self._exclude_prefixes)
+
+    def _local_expiry(self, timeout: Any) -> Optional[float]:
+        """Monotonic expiry of a local copy; None when it should not be kept"""
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        ttl = (
+            self._local_timeout
+            if timeout is None
+            else min(timeout, self._local_timeout)
+        )
+        return time.monotonic() + ttl if ttl > 0 else None
+
+    def _drop(self, local_key: str) -> None:
+        entry = self._local.pop(local_key, None)
+        if entry is not None:
+            self._local_bytes -= len(entry[1])
+
+    def _store(
+        self, local_key: str, value: Any, timeout: Any = DEFAULT_TIMEOUT
+    ) -> None:
+        expires = self._local_expiry(timeout)
+        with self._lock:
+            self._drop(local_key)
+            if expires is None:
+                return
+            data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            if len(data) > self._local_max_bytes:
+                return
+            self._local[local_key] = (expires, data)
+            self._local_bytes += len(data)
+            while (
+                len(self._local) > self._local_max_entries
+                or self._local_bytes > self._local_max_bytes
+            ):
+                _, (_, evicted) = self._local.popitem(last=False)
+                self._local_bytes -= len(evicted)
+
+    def _lookup(self, local_key: str) -> Optional[bytes]:
+        self._sync()
+        with self._lock:
+            entry = self._local.get(local_key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._drop(local_key)
+                return None
+            self._local.move_to_end(local_key)
+            return entry[1]
+
+    def _clear_local(self) -> None:
+        with self._lock:
+            self._local.clear()
+            self._local_bytes = 0
+
+    # Cross-worker invalidation
+
+    def _sync(self) -> None:
+        now = time.monotonic()
+        if now < self._next_sync:
+            return
+        self._next_sync = now + self._sync_interval
+        generation = self._shared.get(self.GENERATION_KEY)
+        if generation != self._generation:
+            self._clear_local()
+            self._generation = generation
+
+    def _bump_generation(self) -> None:
+        try:
+            generation = self._shared.incr(self.GENERATION_KEY)
+        except ValueError:
+            generation = time.time_ns()
+            self._shared.set(self.GENERATION_KEY, generation, timeout=None)
+        # Other workers' bumps may have been folded into this one
+        self._clear_local()
+        self._generation = generation
+
+    # Cache API
+
+    def get(self, key: str, default: Any = None, version: Optional[int] = None) -> Any:
+        local_key = self.make_and_validate_key(key, version=version)
+        if self._keeps_locally(key):
+            data = self._lookup(local_key)
+            if data is not None:
+                return pickle.loads(data)
+        value = self._shared.get(key, self._missing_key, version=version)
+        if value is self._missing_key:
+            return default
+        if self._keeps_locally(key):
+            self._store(local_key, value)
+        return value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        timeout: Any = DEFAULT_TIMEOUT,
+        version: Optional[int] = None,
+    ) -> None:
+        self._shared.set(key, value, timeout=timeout, version=version)
+        local_key = self.make_and_validate_key(key, version=version)
+        if self._keeps_locally(key):
+            self._store(local_key, value, timeout)
+
+    def add(
+        self,
+        key: str,
+        value: Any,
+        timeout: Any = DEFAULT_TIMEOUT,
+        version: Optional[int] = None,
+    ) -> bool:
+        added = self._shared.add(key, value, timeout=timeout, version=version)
+        local_key = self.make_and_validate_key(key, version=version)
+        if added and self._keeps_locally(key):
+            self._store(local_key, value, timeout)
+        return added
+
+    def touch(
+        self, key: str, timeout: Any = DEFAULT_TIMEOUT, version: Optional[int] = None
+    ) -> bool:
+        with self._lock:
+            self._drop(self.make_and_validate_key(key, version=version))
+        return self._shared.touch(key, timeout=timeout, version=version)
+
+    def has_key(self, key: str, version: Optional[int] = None) -> bool:
+        local_key = self.make_and_validate_key(key, version=version)
+        if self._keeps_locally(key) and self._lookup(local_key) is not None:
+            return True
+        return self._shared.has_key(key, version=version)
+
+    def delete(self, key: str, version: Optional[int] = None) -> bool:
+        deleted = self._shared.delete(key, version=version)
+        if self._keeps_locally(key):
+            self._bump_generation()
+        return deleted
+
+    def delete_many(self, keys: Any, version: Optional[int] = None) -> None:
+        keys = list(keys)
+        self._shared.delete_many(keys, version=version)
+        if any(self._keeps_locally(key) for key in keys):
+            self._bump_generation()
+
+    def incr(self, key: str, delta: int = 1, version: Optional[int] = None) -> int:
+        value = self._shared.incr(key, delta, version=version)
+        if self._keeps_locally(key):
+            self._bump_generation()
+        return value
+
+    def clear(self) -> None:
+        self._shared.clear()
+        self._bump_generation()
+
+    def close(self, **kwargs: Any) -> None:
+        self._shared.close(**kwargs)
+
+
+class TwoTierCache(InstrumentedCacheMixin, BaseTwoTierCache):
+    pass
@@ -0,0 +1,311 @@
+"""
+Versioned cache namespaces.
+
+Cached solve lists and stats are stored under keys that embed a namespace
+version. A write bumps the version of the namespaces it affects, which makes
+every older entry unreachable at once (they simply age out) while leaving the
+rest of the cache - throttles, health checks, other namespaces - untouched.
+
+``cached_compute`` (and ``acached_compute``) fill those entries without
+stampedes. Concurrent misses for one key in a process share a single
+computation. Across workers, a lock key lets one worker compute while the
+others wait briefly for its result. Entries outlive their freshness by a
+grace window, during which one request recomputes and the rest are served
+the stale value. Optionally, an entry is refreshed in the background shortly
+before it goes stale.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+SOLVES_LIST_NAMESPACE = "solves_list"
+SOLVE_STATS_NAMESPACE = "solve_stats"
+
+# Every namespace whose contents depend on the solve table
+SOLVE_NAMESPACES = (SOLVES_LIST_NAMESPACE, SOLVE_STATS_NAMESPACE)
+
+
+def _version_key(namespace: str) -> str:
+    return f"{namespace}_version"
+
+
+def _initial_version() -> int:
+    # Seed from the clock so a counter that was evicted never restarts at a
+    # value whose entries may still be cached
+    return int(time.time() * 1000)
+
+
+def namespace_version(namespace: str) -> int:
+    """Return the current version of a namespace, creating it if needed"""
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), timeout=None)
+        version = cache.get(key) or 0
+    return version
+
+
+def namespaced_key(namespace: str, suffix: str) -> str:
+    """Build a cache key that is invalidated when the namespace is bumped"""
+    return f"{namespace}_v{namespace_version(namespace)}_{suffix}"
+
+
+async def anamespace_version(namespace: str) -> int:
+    """Async counterpart of ``namespace_version`` for async views"""
+    key = _version_key(namespace)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, _initial_version(), timeout=None)
+        version = await cache.aget(key) or 0
+    return version
+
+
+async def anamespaced_key(namespace: str, suffix: str) -> str:
+    """Async counterpart of ``namespaced_key``"""
+    return f"{namespace}_v{await anamespace_version(namespace)}_{suffix}"
+
+
+def bump_namespace(*namespaces: str) -> None:
+    """Invalidate everything cached under the given namespaces"""
+    for namespace in namespaces:
+        key = _version_key(namespace)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Counter missing (never read, or evicted): start a fresh one
+            cache.set(key, _initial_version(), timeout=None)
+        logger.debug(f"Bumped cache namespace {namespace}")
+
+
+def invalidate_solve_caches() -> None:
+    """Drop cached solve lists and stats after the solve table changed"""
+    bump_namespace(*SOLVE_NAMESPACES)
+
+
+@dataclass
+class CachedValue:
+    value: Any
+    fresh_until: float
+
+
+# How long a computation may hold its lock, and how long others wait for it
+LOCK_TIMEOUT = 10
+WAIT_TIMEOUT = 2.0
+WAIT_INTERVAL = 0.05
+
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+# Per event loop: an asyncio future can only be awaited on its own loop, and
+# each loop's map is only touched from that loop's thread
+_ainflight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Any]]"
+_ainflight = weakref.WeakKeyDictionary()
+_background_tasks: Set["asyncio.Task[Any]"] = set()
+
+
+def _grace() -> float:
+    return settings.CACHE_STALE_GRACE
+
+
+def _lock_key(key: str) -> str:
+    return f"{key}_lock"
+
+
+def _release(key: str) -> None:
+    # Expired rather than deleted: a delete makes TwoTierCache drop every
+    # worker's local tier
+    cache.set(_lock_key(key), 0, timeout=0)
+
+
+def _entry(value: Any) -> Optional[CachedValue]:
+    # Anything else is an entry written before values were wrapped
+    return value if isinstance(value, CachedValue) else None
+
+
+def _wrap(value: Any, timeout: float) -> CachedValue:
+    return CachedValue(value=value, fresh_until=time.time() + timeout)
+
+
+def _store(key: str, value: Any, timeout: float) -> None:
+    cache.set(key, _wrap(value, timeout), timeout + _grace())
+
+
+def _compute_and_store(key: str, compute: Callable[[], Any], timeout: float) -> Any:
+    """Compute and cache a value while holding the key's lock"""
+    try:
+        value = compute()
+        _store(key, value, timeout)
+        return value
+    finally:
+        _release(key)
+
+
+def _refresh_in_background(
+    key: str, compute: Callable[[], Any], timeout: float
+) -> None:
+    if not cache.add(_lock_key(key), 1, LOCK_TIMEOUT):
+        return  # Someone is already refreshing it
+
+    def refresh() -> None:
+        try:
+            _compute_and_store(key, compute, timeout)
+        except Exception as e:
+            logger.warning(f"Background refresh of {key} failed: {str(e)}")
+        finally:
+            connections.close_all()
+
+    threading.Thread(target=refresh, name=f"refresh-{key}", daemon=True).start()
+
+
+def _fill(key: str, compute: Callable[[], Any], timeout: float) -> Any:
+    """Compute a missing value, or wait for the worker already computing it"""
+    if cache.add(_lock_key(key), 1, LOCK_TIMEOUT):
+        return _compute_and_store(key, compute, timeout)
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(WAIT_INTERVAL)
+        entry = _entry(cache.get(key))
+        if entry is not None:
+            return entry.value
+    logger.warning(f"Gave up waiting for {key}; computing it here")
+    value = compute()
+    _store(key, value, timeout)
+    return value
+
+
+def _single_flight(key: str, fill: Callable[[], Any]) -> Any:
+    """Run ``fill`` once for concurrent callers in this process"""
+    with _inflight_lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = _inflight[key] = Future()
+    if not leader:
+        return future.result()
+    try:
+        value = fill()
+        future.set_result(value)
+        return value
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+def cached_compute(
+    namespace: str,
+    suffix: str,
+    compute: Callable[[], Any],
+    timeout: float,
+    refresh_ahead: float = 0,
+) -> Any:
+    """
+    Return the cached value for a namespaced key, computing it at most once
+    at a time. Exceptions from ``compute`` propagate and nothing is cached.
+    """
+    key = namespaced_key(namespace, suffix)
+    entry = _entry(cache.get(key))
+    if entry is not None:
+        now = time.time()
+        if now < entry.fresh_until:
+            if refresh_ahead and now >= entry.fresh_until - refresh_ahead:
+                _refresh_in_background(key, compute, timeout)
+            return entry.value
+        # Stale: one request recomputes, the rest keep the old value meanwhile
+        if not cache.add(_lock_key(key), 1, LOCK_TIMEOUT):
+            return entry.value
+        return _single_flight(key, lambda: _compute_and_store(key, compute, timeout))
+    return _single_flight(key, lambda: _fill(key, compute, timeout))
+
+
+async def _acompute_and_store(
+    key: str, compute: Callable[[], Awaitable[Any]], timeout: float
+) -> Any:
+    try:
+        value = await compute()
+        await cache.aset(key, _wrap(value, timeout), timeout + _grace())
+        return value
+    finally:
+        await cache.aset(_lock_key(key), 0, timeout=0)
+
+
+async def _afill(
+    key: str, compute: Callable[[], Awaitable[Any]], timeout: float
+) -> Any:
+    if await cache.aadd(_lock_key(key), 1, LOCK_TIMEOUT):
+        return await _acompute_and_store(key, compute, timeout)
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        await asyncio.sleep(WAIT_INTERVAL)
+        entry = _entry(await cache.aget(key))
+        if entry is not None:
+            return entry.value
+    logger.warning(f"Gave up waiting for {key}; computing it here")
+    value = await compute()
+    await cache.aset(key, _wrap(value, timeout), timeout + _grace())
+    return value
+
+
+async def _asingle_flight(key: str, fill: Callable[[], Awaitable[Any]]) -> Any:
+    """Run ``fill`` once for concurrent callers on this event loop"""
+    loop = asyncio.get_running_loop()
+    with _inflight_lock:
+        inflight = _ainflight.setdefault(loop, {})
+    future = inflight.get(key)
+    if future is not None:
+        return await asyncio.shield(future)
+    future = inflight[key] = loop.create_future()
+    try:
+        value = await fill()
+        future.set_result(value)
+        return value
+    except BaseException as e:
+        future.set_exception(e)
+        # Retrieved here so an exception nobody awaited is not logged
+        future.exception()
+        raise
+    finally:
+        inflight.pop(key, None)
+
+
+async def acached_compute(
+    namespace: str,
+    suffix: str,
+    compute: Callable[[], Awaitable[Any]],
+    timeout: float,
+    refresh_ahead: float = 0,
+) -> Any:
+    """Async counterpart of ``cached_compute``; entries are shared with it"""
+    key = await anamespaced_key(namespace, suffix)
+    entry = _entry(await cache.aget(key))
+    if entry is not None:
+        now = time.time()
+        if now < entry.fresh_until:
+            if (
+                refresh_ahead
+                and now >= entry.fresh_until - refresh_ahead
+                and await cache.aadd(_lock_key(key), 1, LOCK_TIMEOUT)
+            ):
+                task = asyncio.create_task(_acompute_and_store(key, compute, timeout))
+                _background_tasks.add(task)
+                task.add_done_callback(_background_tasks.discard)
+            return entry.value
+        if not await cache.aadd(_lock_key(key), 1, LOCK_TIMEOUT):
+            return entry.value
+        return await _asingle_flight(
+            key, lambda: _acompute_and_store(key, compute, timeout)
+        )
+    return await _asingle_flight(key, lambda: _afill(key, compute, timeout))
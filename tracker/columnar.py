@@ -0,0 +1,307 @@
+"""
+Columnar snapshot of solve times for analytics.
+
+Each column (id, time_taken, created_at as an epoch, cube type id, scramble
+length) is a flat binary file that ``load`` memory-maps as a NumPy array, so
+analytics run vectorized over millions of solves without building a single
+model instance. Writes append to the files after their transaction commits;
+deletes and edits only record the dead row numbers (tombstones), which
+readers mask out. ``rebuild`` rewrites everything as a new *generation* and
+switches to it by replacing the manifest, so readers never see half a
+rebuild.
+
+The snapshot is derived data. A reader checks its live row count against the
+stats store's count (a single-row read), appends anything newer than the
+last id it holds, and rebuilds from the table if the two still disagree.
+"""
+
+import fcntl
+import functools
+import json
+import logging
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+from django.conf import settings
+
+from . import stats_store
+from .models import Solve
+
+logger = logging.getLogger(__name__)
+
+COLUMNS: Dict[str, np.dtype] = {
+    "id": np.dtype(np.int64),
+    "time_taken": np.dtype(np.float64),
+    "created_at": np.dtype(np.float64),
+    "cube_type": np.dtype(np.int64),  # -1 when unset
+    "scramble_length": np.dtype(np.int16),
+}
+# Solve fields the columns are encoded from
+ROW_FIELDS = ("id", "time_taken", "created_at", "cube_type_id", "scramble")
+TOMBSTONES = "deleted"
+NO_CUBE_TYPE = -1
+
+REBUILD_CHUNK_SIZE = 100_000
+
+
+@dataclass
+class SolveColumns:
+    """Live rows of the snapshot, one NumPy array per column"""
+
+    id: np.ndarray
+    time_taken: np.ndarray
+    created_at: np.ndarray
+    cube_type: np.ndarray
+    scramble_length: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    def take(self, index: np.ndarray) -> "SolveColumns":
+        return SolveColumns(**{name: getattr(self, name)[index] for name in COLUMNS})
+
+    def for_cube_type(self, cube_type_id: Optional[int]) -> "SolveColumns":
+        value = NO_CUBE_TYPE if cube_type_id is None else cube_type_id
+        return self.take(self.cube_type == value)
+
+    def chronological(self) -> "SolveColumns":
+        """Rows ordered by (created_at, id); appends are not always in order"""
+        return self.take(np.lexsort((self.id, self.created_at)))
+
+
+def snapshot_dir() -> str:
+    return str(settings.SOLVE_SNAPSHOT_DIR)
+
+
+def _path(name: str, generation: int) -> str:
+    return os.path.join(snapshot_dir(), f"{name}.{generation}.bin")
+
+
+def _manifest_path() -> str:
+    return os.path.join(snapshot_dir(), "manifest.json")
+
+
+def _read_manifest() -> Optional[dict]:
+    try:
+        with open(_manifest_path()) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_manifest(manifest: dict) -> None:
+    tmp = _manifest_path() + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp, _manifest_path())
+
+
+@contextmanager
+def _locked() -> Iterator[None]:
+    """Serialize writers across threads and worker processes"""
+    os.makedirs(snapshot_dir(), exist_ok=True)
+    with open(os.path.join(snapshot_dir(), "lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _best_effort(func: Callable) -> Callable:
+    """Write-path updates log failures; the next read repairs the snapshot"""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs) -> None:
+        try:
+            func(*args, **kwargs)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not update solve snapshot: {str(e)}")
+
+    return wrapper
+
+
+def _encode(rows: Iterable[tuple]) -> Dict[str, np.ndarray]:
+    """(id, time_taken, created_at, cube_type_id, scramble) rows -> columns"""
+    rows = list(rows)
+    return {
+        "id": np.fromiter((row[0] for row in rows), COLUMNS["id"], len(rows)),
+        "time_taken": np.fromiter(
+            (row[1] for row in rows), COLUMNS["time_taken"], len(rows)
+        ),
+        "created_at": np.fromiter(
+            (row[2].timestamp() for row in rows), COLUMNS["created_at"], len(rows)
+        ),
+        "cube_type": np.fromiter(
+            (NO_CUBE_TYPE if row[3] is None else row[3] for row in rows),
+            COLUMNS["cube_type"],
+            len(rows),
+        ),
+        "scramble_length": np.fromiter(
+            (len(row[4]) if row[4] else 0 for row in rows),
+            COLUMNS["scramble_length"],
+            len(rows),
+        ),
+    }
+
+
+def _solve_row(solve: Solve) -> tuple:
+    return (
+        solve.pk,
+        solve.time_taken,
+        solve.created_at,
+        solve.cube_type_id,
+        solve.scramble,
+    )
+
+
+def _append_columns(manifest: dict, columns: Dict[str, np.ndarray]) -> None:
+    count = len(columns["id"])
+    if not count:
+        return
+    for name, values in columns.items():
+        with open(_path(name, manifest["generation"]), "ab") as f:
+            f.write(values.astype(COLUMNS[name]).tobytes())
+    manifest["rows"] += count
+    manifest["max_id"] = max(manifest["max_id"], int(columns["id"].max()))
+    # Last, so readers only ever see fully written rows
+    _write_manifest(manifest)
+
+
+def rebuild() -> dict:
+    """Rewrite the snapshot from the solve table as a new generation"""
+    with _locked():
+        previous = _read_manifest()
+        generation = previous["generation"] + 1 if previous else 1
+        manifest = {"generation": generation, "rows": 0, "deleted": 0, "max_id": 0}
+        for name in list(COLUMNS) + [TOMBSTONES]:
+            open(_path(name, generation), "wb").close()
+
+        rows = Solve.objects.order_by("id").values_list(*ROW_FIELDS)
+        chunk: List[tuple] = []
+        for row in rows.iterator(chunk_size=REBUILD_CHUNK_SIZE):
+            chunk.append(row)
+            if len(chunk) == REBUILD_CHUNK_SIZE:
+                _append_columns(manifest, _encode(chunk))
+                chunk = []
+        _append_columns(manifest, _encode(chunk))
+        _write_manifest(manifest)
+
+        if previous:
+            for name in list(COLUMNS) + [TOMBSTONES]:
+                try:
+                    os.remove(_path(name, previous["generation"]))
+                except OSError:
+                    pass
+    logger.info(f"Rebuilt solve snapshot with {manifest['rows']} rows")
+    return manifest
+
+
+@_best_effort
+def append(solves: Iterable[Solve]) -> None:
+    """Add committed solves to the end of the snapshot"""
+    with _locked():
+        manifest = _read_manifest()
+        if manifest is None:
+            return  # Built in full on first read
+        solves = list(solves)
+        if any(solve.pk <= manifest["max_id"] for solve in solves):
+            # Committed out of id order, so a reader may have caught up
+            # past some of these already
+            existing = _column(manifest, "id", COLUMNS["id"], manifest["rows"])
+            present = set(existing[np.isin(existing, [s.pk for s in solves])].tolist())
+            solves = [solve for solve in solves if solve.pk not in present]
+        _append_columns(manifest, _encode(_solve_row(solve) for solve in solves))
+
+
+def _tombstones(manifest: dict) -> np.ndarray:
+    return _column(manifest, TOMBSTONES, np.dtype(np.int64), manifest["deleted"])
+
+
+def _column(manifest: dict, name: str, dtype: np.dtype, count: int) -> np.ndarray:
+    if not count:
+        return np.empty(0, dtype=dtype)
+    path = _path(name, manifest["generation"])
+    return np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+
+
+def _tombstone(manifest: dict, ids: np.ndarray) -> None:
+    # A scan of the id column, but vectorized; deletes and edits are rare
+    existing = _column(manifest, "id", COLUMNS["id"], manifest["rows"])
+    rows = np.setdiff1d(np.flatnonzero(np.isin(existing, ids)), _tombstones(manifest))
+    if not len(rows):
+        return
+    with open(_path(TOMBSTONES, manifest["generation"]), "ab") as f:
+        f.write(rows.astype(np.int64).tobytes())
+    manifest["deleted"] += len(rows)
+    _write_manifest(manifest)
+
+
+@_best_effort
+def remove(solve_ids: Iterable[int]) -> None:
+    """Tombstone the rows of deleted solves"""
+    with _locked():
+        manifest = _read_manifest()
+        if manifest is not None:
+            _tombstone(manifest, np.fromiter(solve_ids, dtype=np.int64))
+
+
+@_best_effort
+def replace(solve: Solve) -> None:
+    """Swap an edited solve's row for one with its new values"""
+    with _locked():
+        manifest = _read_manifest()
+        if manifest is not None:
+            _tombstone(manifest, np.array([solve.pk], dtype=np.int64))
+            _append_columns(manifest, _encode([_solve_row(solve)]))
+
+
+def _catch_up() -> None:
+    """Append solves newer than the snapshot's last id"""
+    with _locked():
+        manifest = _read_manifest()
+        rows = (
+            Solve.objects.filter(id__gt=manifest["max_id"])
+            .order_by("id")
+            .values_list(*ROW_FIELDS)
+        )
+        _append_columns(manifest, _encode(rows))
+
+
+def _open(manifest: dict) -> SolveColumns:
+    count = manifest["rows"]
+    snapshot = SolveColumns(
+        **{
+            name: _column(manifest, name, dtype, count)
+            for name, dtype in COLUMNS.items()
+        }
+    )
+    dead = _tombstones(manifest)
+    if len(dead):
+        alive = np.ones(count, dtype=bool)
+        alive[dead] = False
+        snapshot = snapshot.take(alive)
+    return snapshot
+
+
+def load() -> SolveColumns:
+    """Return the live snapshot, bringing it up to date with the table first"""
+    expected = stats_store.get_statistics(stats_store.GLOBAL_SCOPE).count
+    manifest = _read_manifest()
+    if manifest is None:
+        manifest = rebuild()
+
+    snapshot = _open(manifest)
+    if len(snapshot) < expected:
+        _catch_up()
+        manifest = _read_manifest()
+        snapshot = _open(manifest)
+    if len(snapshot) != expected:
+        logger.warning(
+            f"Solve snapshot has {len(snapshot)} rows, expected {expected}; rebuilding"
+        )
+        snapshot = _open(rebuild())
+    return snapshot
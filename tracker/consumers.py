@@ -0,0 +1,25 @@
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from . import stats_store
+from .live_stats import STATS_GROUP, stats_summary
+
+
+class SolveStatsConsumer(AsyncJsonWebsocketConsumer):
+    """Streams stat deltas to a dashboard as solves are written"""
+
+    async def connect(self) -> None:
+        await self.channel_layer.group_add(STATS_GROUP, self.channel_name)
+        await self.accept()
+        # Start the client from the current numbers; deltas follow
+        await self.send_json({"event": "snapshot", "stats": await self.current_stats()})
+
+    async def disconnect(self, code: int) -> None:
+        await self.channel_layer.group_discard(STATS_GROUP, self.channel_name)
+
+    async def stats_delta(self, event: dict) -> None:
+        await self.send_json(event["delta"])
+
+    @database_sync_to_async
+    def current_stats(self) -> dict:
+        return stats_summary(stats_store.get_statistics(stats_store.GLOBAL_SCOPE))
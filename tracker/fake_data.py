@@ -0,0 +1,140 @@
+"""
+Deterministic fake solves for development and load testing.
+
+Solves are generated a batch at a time with vectorized NumPy draws. Each
+batch uses its own generator seeded from ``(seed, batch index)``, so a batch
+never depends on the ones before it. Worker processes can therefore insert
+disjoint batches in any order and still produce exactly the rows of a serial
+run with the same seed.
+
+Rows are written with ``bulk_create``. Derived data (stats, rollups, PBs,
+the columnar snapshot) is rebuilt once at the end rather than per batch.
+"""
+
+import logging
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import List, Optional, Sequence
+
+import numpy as np
+from django.db import transaction
+
+from . import aggregates, columnar, personal_bests, stats_store, tagging
+from .caching import invalidate_solve_caches
+from .models import VALID_MOVES, Solve
+
+logger = logging.getLogger(__name__)
+
+# (min seconds, max seconds, share of solves) per skill level
+TIME_RANGES = (
+    (8, 15, 0.4),  # Expert
+    (15, 25, 0.4),  # Advanced
+    (25, 45, 0.15),  # Intermediate
+    (45, 120, 0.05),  # Beginner
+)
+SCRAMBLE_LENGTH = 20
+# Outer-layer turns, grouped by face: B B' B2 D D' D2 F ...
+FACE_MOVES = np.array(sorted(move for move in VALID_MOVES if move[0] in "RLUDFB"))
+TAG_NAMES = ("OH", "BLD", "practice", "warmup", "comp", "feet")
+NOTES = (
+    "Good lookahead",
+    "Lockup on the last layer",
+    "Skipped OLL",
+    "Timer started late",
+    "New F2L trick",
+)
+
+BATCH_SIZE = 5_000
+
+
+@dataclass(frozen=True)
+class FakeDataSpec:
+    count: int
+    # Newest possible solve time; fixed so a seed reproduces the same rows
+    end: datetime
+    seed: int = 0
+    days_back: int = 30
+    batch_size: int = BATCH_SIZE
+    cube_type_ids: Sequence[Optional[int]] = (None,)
+    session_ids: Sequence[Optional[int]] = (None,)
+    tag_rate: float = 0.2
+    note_rate: float = 0.2
+
+    @property
+    def batches(self) -> int:
+        return math.ceil(self.count / self.batch_size)
+
+
+def _scrambles(rng: np.random.Generator, size: int) -> List[str]:
+    # Each turn moves to a different face than the one before it
+    faces = rng.integers(0, 6, (size, 1)) + np.cumsum(
+        rng.integers(1, 6, (size, SCRAMBLE_LENGTH)), axis=1
+    )
+    moves = FACE_MOVES[faces % 6 * 3 + rng.integers(0, 3, (size, SCRAMBLE_LENGTH))]
+    return [" ".join(row) for row in moves.tolist()]
+
+
+def _tags(rng: np.random.Generator, size: int, rate: float) -> List[str]:
+    tagged = rng.random(size) < rate
+    counts = rng.integers(1, 3, size)
+    # Two distinct tags per row; rows with one tag use the first
+    picks = rng.random((size, len(TAG_NAMES))).argsort(axis=1)[:, :2]
+    return [
+        tagging.format_tags(TAG_NAMES[i] for i in pick[:count]) if is_tagged else ""
+        for is_tagged, count, pick in zip(tagged, counts, picks)
+    ]
+
+
+def generate_batch(spec: FakeDataSpec, index: int) -> List[Solve]:
+    """Build (without saving) batch ``index`` of the solves described by ``spec``"""
+    size = min(spec.batch_size, spec.count - index * spec.batch_size)
+    if size <= 0:
+        return []
+    rng = np.random.default_rng([spec.seed, index])
+
+    low, high, shares = (np.array(column, dtype=float) for column in zip(*TIME_RANGES))
+    level = rng.choice(len(TIME_RANGES), size, p=shares / shares.sum())
+    times = np.round(rng.uniform(low[level], high[level]), 2)
+    end = spec.end.timestamp()
+    timestamps = end - rng.uniform(
+        0, timedelta(days=spec.days_back).total_seconds(), size
+    )
+    scrambles = _scrambles(rng, size)
+    cube_types = rng.integers(0, len(spec.cube_type_ids), size)
+    sessions = rng.integers(0, len(spec.session_ids), size)
+    tags = _tags(rng, size, spec.tag_rate)
+    noted = rng.random(size) < spec.note_rate
+    notes = rng.integers(0, len(NOTES), size)
+
+    return [
+        Solve(
+            time_taken=float(times[i]),
+            scramble=scrambles[i],
+            created_at=datetime.fromtimestamp(timestamps[i], tz=dt_timezone.utc),
+            note=NOTES[notes[i]] if noted[i] else "",
+            cube_type_id=spec.cube_type_ids[cube_types[i]],
+            session_id=spec.session_ids[sessions[i]],
+            tags=tags[i],
+        )
+        for i in range(size)
+    ]
+
+
+def insert_batch(spec: FakeDataSpec, index: int) -> int:
+    """Generate and insert one batch with its tag rows; returns its size"""
+    solves = generate_batch(spec, index)
+    with transaction.atomic():
+        Solve.objects.bulk_create(solves, batch_size=spec.batch_size)
+        tagging.sync_solves([solve for solve in solves if solve.tags], replace=False)
+    return len(solves)
+
+
+def rebuild_derived_data() -> None:
+    """Bring everything maintained on the write path up to date in one pass"""
+    for scope in stats_store.known_scopes():
+        stats_store.rebuild(scope)
+    aggregates.rebuild_all()
+    personal_bests.rebuild_all()
+    columnar.rebuild()
+    invalidate_solve_caches()
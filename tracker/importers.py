@@ -0,0 +1,260 @@
+"""
+Bulk solve import.
+
+Rows arrive as dicts (from a JSON array or a streamed CSV) and are handled
+in batches: each batch is validated in one pass - times as a NumPy array,
+scrambles by checking the batch's distinct moves against ``VALID_MOVES`` -
+then written with a single ``bulk_create``. Everything runs in one
+transaction, so a strict import that hits a bad row leaves no trace.
+"""
+
+import codecs
+import csv
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import VALID_MOVES, CubeType, Session, Solve
+from .tagging import normalize_tags
+
+logger = logging.getLogger(__name__)
+
+MAX_TIME = 3600
+MAX_REPORTED_ERRORS = 1000
+
+
+def iter_csv_rows(stream: Iterable[bytes]) -> Iterator[Dict[str, str]]:
+    """Decode a binary line stream as CSV rows without reading it all first"""
+    lines = codecs.iterdecode(stream, "utf-8-sig")
+    for row in csv.DictReader(lines):
+        yield {key.strip(): value for key, value in row.items() if key}
+
+
+def _chunks(
+    rows: Iterable[Dict[str, Any]], size: int
+) -> Iterator[List[Dict[str, Any]]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class SolveImporter:
+    batch_size = 1000
+
+    def __init__(self, batch_size: Optional[int] = None) -> None:
+        if batch_size:
+            self.batch_size = batch_size
+        self.cube_type_ids = set(CubeType.objects.values_list("id", flat=True))
+        self.session_ids = set(Session.objects.values_list("id", flat=True))
+        self.session_names: Dict[str, int] = {}
+        self.created = 0
+        self.error_count = 0
+        self.errors: List[Dict[str, Any]] = []
+
+    session_name_length = Session._meta.get_field("name").max_length
+
+    def session_id_for(self, name: str) -> int:
+        """Resolve a session name once per import (see ``Session.named``)"""
+        if name not in self.session_names:
+            self.session_names[name] = Session.named(name).pk
+            self.session_ids.add(self.session_names[name])
+        return self.session_names[name]
+
+    def resolve_session_names(
+        self, solves: List[Solve], session_names: Dict[int, str]
+    ) -> None:
+        """Point solves at the sessions they name, just before they are saved"""
+        for index, name in session_names.items():
+            solves[index].session_id = self.session_id_for(name)
+
+    def _add_error(
+        self,
+        row_number: int,
+        field: str,
+        message: str,
+        row_errors: Dict[int, Dict[str, str]],
+    ) -> None:
+        row_errors.setdefault(row_number, {})[field] = message
+
+    def validate_batch(
+        self, rows: List[Dict[str, Any]], first_row: int
+    ) -> Tuple[List[Solve], Dict[int, str], Dict[int, Dict[str, str]]]:
+        """
+        Validate a batch. Returns the unsaved solves, the session names some
+        of them give (by index, resolved by ``resolve_session_names``) and the
+        errors keyed by row number.
+        """
+        row_errors: Dict[int, Dict[str, str]] = {}
+        session_names: Dict[int, str] = {}
+        now = timezone.now()
+
+        # Times: one vectorised range check for the whole batch
+        times = np.array(
+            [_to_float(row.get("time_taken")) for row in rows], dtype=float
+        )
+        bad_times = ~np.isfinite(times) | (times <= 0) | (times > MAX_TIME)
+        for offset in np.flatnonzero(bad_times):
+            self._add_error(
+                first_row + int(offset),
+                "time_taken",
+                f"Must be a number between 0 and {MAX_TIME} seconds",
+                row_errors,
+            )
+
+        # Scrambles: compare the batch's distinct moves with VALID_MOVES once;
+        # only rows containing one of the offending moves are inspected
+        moves_per_row = [(row.get("scramble") or "").split() for row in rows]
+        invalid_moves = set().union(*moves_per_row) - VALID_MOVES
+        if invalid_moves:
+            for offset, moves in enumerate(moves_per_row):
+                bad = [move for move in moves if move in invalid_moves]
+                if bad:
+                    self._add_error(
+                        first_row + offset,
+                        "scramble",
+                        f"Invalid scramble notation. Invalid moves: {', '.join(bad)}",
+                        row_errors,
+                    )
+
+        solves = []
+        for offset, row in enumerate(rows):
+            row_number = first_row + offset
+            scramble = " ".join(moves_per_row[offset]) or None
+            note = row.get("note") or ""
+            tags = normalize_tags(row.get("tags") or "")
+            for field, value, limit in (
+                ("scramble", scramble or "", 200),
+                ("note", note, 500),
+                ("tags", tags, 255),
+            ):
+                if len(value) > limit:
+                    self._add_error(
+                        row_number,
+                        field,
+                        f"Cannot exceed {limit} characters",
+                        row_errors,
+                    )
+
+            created_at = row.get("created_at") or now
+            if not isinstance(created_at, datetime):
+                created_at = parse_datetime(str(created_at))
+                if created_at is None:
+                    self._add_error(
+                        row_number, "created_at", "Invalid datetime", row_errors
+                    )
+            if isinstance(created_at, datetime) and timezone.is_naive(created_at):
+                created_at = timezone.make_aware(created_at)
+
+            cube_type_id = row.get("cube_type") or None
+            if cube_type_id is not None:
+                try:
+                    cube_type_id = int(cube_type_id)
+                except (TypeError, ValueError):
+                    cube_type_id = -1
+                if cube_type_id not in self.cube_type_ids:
+                    self._add_error(
+                        row_number, "cube_type", "Unknown cube type", row_errors
+                    )
+
+            session_id = row.get("session") or None
+            session_name = None
+            if isinstance(session_id, str) and not session_id.strip().isdigit():
+                # A name, as exports from before sessions were a model have
+                session_name, session_id = session_id.strip(), None
+                if not session_name:
+                    self._add_error(
+                        row_number,
+                        "session",
+                        "Session name may not be blank",
+                        row_errors,
+                    )
+                elif len(session_name) > self.session_name_length:
+                    self._add_error(
+                        row_number, "session", "Session name is too long", row_errors
+                    )
+            elif session_id is not None:
+                try:
+                    session_id = int(session_id)
+                except (TypeError, ValueError):
+                    session_id = -1
+                if session_id not in self.session_ids:
+                    self._add_error(
+                        row_number, "session", "Unknown session", row_errors
+                    )
+
+            if row_number in row_errors:
+                continue
+            if session_name:
+                session_names[len(solves)] = session_name
+            solves.append(
+                Solve(
+                    time_taken=float(times[offset]),
+                    scramble=scramble,
+                    created_at=created_at,
+                    note=note,
+                    cube_type_id=cube_type_id,
+                    tags=tags,
+                    session_id=session_id,
+                )
+            )
+        return solves, session_names, row_errors
+
+    def run(
+        self, rows: Iterable[Dict[str, Any]], partial: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Import rows in batches inside one transaction.
+
+        With ``partial`` valid rows are kept and invalid ones reported;
+        otherwise any invalid row rolls the whole import back.
+        """
+        from .signals import solves_bulk_created
+
+        with transaction.atomic():
+            first_row = 1
+            for batch in _chunks(rows, self.batch_size):
+                solves, session_names, row_errors = self.validate_batch(
+                    batch, first_row
+                )
+                first_row += len(batch)
+
+                self.error_count += len(row_errors)
+                for row_number, errors in row_errors.items():
+                    if len(self.errors) < MAX_REPORTED_ERRORS:
+                        self.errors.append({"row": row_number, "errors": errors})
+
+                # In strict mode there is no point writing once a row failed
+                if solves and (partial or not self.error_count):
+                    self.resolve_session_names(solves, session_names)
+                    solves_bulk_created(Solve.objects.bulk_create(solves))
+                    self.created += len(solves)
+
+            if self.error_count and not partial:
+                transaction.set_rollback(True)
+                self.created = 0
+
+        logger.info(
+            f"Imported {self.created} solves ({self.error_count} rows with errors)"
+        )
+        return {
+            "created": self.created,
+            "error_count": self.error_count,
+            "errors": self.errors,
+        }
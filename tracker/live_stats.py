@@ -0,0 +1,63 @@
+"""
+Push stat deltas to subscribed dashboards.
+
+After a solve write commits, a small delta - what happened, whether it set a
+personal best, and the headline numbers from the stats store - is sent to
+the ``solve_stats`` channel group. ``SolveStatsConsumer`` relays it to every
+connected websocket, so dashboards no longer need to poll the stats endpoint.
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+from . import stats_store
+from .models import Solve, SolveStatistics
+
+logger = logging.getLogger(__name__)
+
+STATS_GROUP = "solve_stats"
+
+SOLVE_CREATED = "solve_created"
+SOLVE_DELETED = "solve_deleted"
+SOLVES_IMPORTED = "solves_imported"
+
+
+def stats_summary(record: SolveStatistics) -> Dict[str, Any]:
+    """The subset of the stats payload that changes on every solve"""
+    data = stats_store.build_stats_data(record)
+    keys = ("total_solves", "best_time", "average_time", "ao5", "ao12", "ao100")
+    return {key: data[key] for key in keys}
+
+
+def build_delta(
+    event: str, solve: Optional[Solve] = None, count: int = 1
+) -> Dict[str, Any]:
+    record = stats_store.get_statistics(stats_store.GLOBAL_SCOPE)
+    delta: Dict[str, Any] = {"event": event, "stats": stats_summary(record)}
+    if solve is not None:
+        delta["solve"] = {
+            "id": solve.pk,
+            "time_taken": solve.time_taken,
+            "created_at": solve.created_at.isoformat(),
+        }
+        delta["new_pb"] = event == SOLVE_CREATED and solve.is_pb
+    else:
+        delta["count"] = count
+    return delta
+
+
+def broadcast(event: str, solve: Optional[Solve] = None, count: int = 1) -> None:
+    """Send a stats delta to every subscriber; never fails the write path"""
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    try:
+        delta = build_delta(event, solve, count)
+        async_to_sync(channel_layer.group_send)(
+            STATS_GROUP, {"type": "stats.delta", "delta": delta}
+        )
+    except Exception as e:
+        logger.warning(f"Could not broadcast stats delta: {str(e)}")
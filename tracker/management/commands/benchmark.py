@@ -0,0 +1,131 @@
+import json
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from tracker import benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the solves API, stats and scanner on seeded datasets in a "
+        "throwaway test database, optionally failing on regressions"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--datasets",
+            nargs="+",
+            choices=list(benchmarks.DATASETS),
+            default=["1k", "100k"],
+            help="Dataset sizes to seed and run (default: 1k 100k)",
+        )
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            help="Scenario to run (repeatable, default: all)",
+        )
+        parser.add_argument(
+            "--trials",
+            type=int,
+            default=50,
+            help="Timed requests per scenario (default: 50)",
+        )
+        parser.add_argument(
+            "--warmup",
+            type=int,
+            default=5,
+            help="Untimed requests before the trials (default: 5)",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Data seed")
+        parser.add_argument("--output", help="Write the results to this JSON file")
+        parser.add_argument(
+            "--baseline",
+            help="Compare against the results in this JSON file",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.25,
+            help="Allowed p95 slowdown against the baseline (default: 0.25)",
+        )
+        parser.add_argument(
+            "--keepdb",
+            action="store_true",
+            help="Keep the seeded test database for the next run",
+        )
+
+    def handle(self, *args, **options):
+        datasets = {name: benchmarks.DATASETS[name] for name in options["datasets"]}
+        # Same cache backend, but keys and snapshot files kept apart from the
+        # real ones
+        caches = {
+            alias: {**config, "KEY_PREFIX": "benchmark"}
+            for alias, config in settings.CACHES.items()
+        }
+        snapshot_dir = tempfile.mkdtemp(prefix="rubiklog_benchmark_")
+        # Lets the test client through ALLOWED_HOSTS, as under the test runner
+        try:
+            setup_test_environment()
+            own_environment = True
+        except RuntimeError:
+            # Already set up, e.g. when called from a test
+            own_environment = False
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False, keepdb=options["keepdb"]
+        )
+        try:
+            with override_settings(
+                CACHES=caches, SOLVE_SNAPSHOT_DIR=snapshot_dir
+            ), benchmarks.unthrottled():
+                results = benchmarks.run_suite(
+                    datasets,
+                    trials=options["trials"],
+                    warmup=options["warmup"],
+                    scenarios=options["scenario"],
+                    seed=options["seed"],
+                )
+        except benchmarks.BenchmarkError as e:
+            raise CommandError(str(e))
+        finally:
+            connection.creation.destroy_test_db(
+                old_name, verbosity=0, keepdb=options["keepdb"]
+            )
+            if own_environment:
+                teardown_test_environment()
+            shutil.rmtree(snapshot_dir, ignore_errors=True)
+
+        for name, dataset in results["datasets"].items():
+            self.stdout.write(f'{name} ({dataset["solves"]} solves)')
+            for scenario, summary in dataset["scenarios"].items():
+                self.stdout.write(
+                    f'  {scenario:<18} p50 {summary["p50_ms"]:>9.2f}ms  '
+                    f'p95 {summary["p95_ms"]:>9.2f}ms  '
+                    f'p99 {summary["p99_ms"]:>9.2f}ms  '
+                    f'queries {summary["queries_max"]}'
+                )
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(f'Wrote results to {options["output"]}')
+
+        if options["baseline"]:
+            with open(options["baseline"]) as f:
+                baseline = json.load(f)
+            regressions = benchmarks.compare(
+                results, baseline, tolerance=options["tolerance"]
+            )
+            if regressions:
+                raise CommandError(
+                    "Regressions against the baseline:\n" + "\n".join(regressions)
+                )
+            self.stdout.write(self.style.SUCCESS("No regressions against the baseline"))
@@ -1,8 +1,17 @@
-from django.core.management.base import BaseCommand
-from tracker.models import Solve
-from faker import Faker
-import random
-from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, time, timezone as dt_timezone
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from tracker import fake_data
+from tracker.models import CubeType, Session
+
+CUBE_TYPE_NAMES = (
+    '3x3', '2x2', '4x4', '5x5', 'Pyraminx', 'Megaminx', 'Skewb', 'Square-1'
+)
 
 
 class Command(BaseCommand):
@@ -21,67 +30,126 @@ class Command(BaseCommand):
             default=30,
             help='Generate solves from how many days back (default: 30)',
         )
+        parser.add_argument(
+            '--end',
+            help='Date (YYYY-MM-DD) the generated solves end on (default: today); '
+            'together with --seed this makes a run reproducible',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Random seed; the same seed and options give the same solves',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=fake_data.BATCH_SIZE,
+            help=(
+                'Solves generated and inserted at once '
+                f'(default: {fake_data.BATCH_SIZE})'
+            ),
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=0,
+            help='Processes inserting batches in parallel; 0 inserts in this '
+            'process (SQLite always does)',
+        )
+        parser.add_argument(
+            '--cube-types',
+            type=int,
+            default=0,
+            help='Spread solves over this many cube types, creating missing '
+            'ones (default: 0, no cube type)',
+        )
+        parser.add_argument(
+            '--sessions',
+            type=int,
+            default=0,
+            help='Create this many sessions and spread solves over them',
+        )
+        parser.add_argument(
+            '--tag-rate',
+            type=float,
+            default=0.2,
+            help='Share of solves that get tags (default: 0.2)',
+        )
 
-    def handle(self, *args, **options):
-        fake = Faker()
-        count = options['count']
-        days_back = options['days_back']
-
-        # Realistic time ranges for different skill levels
-        time_ranges = [
-            (8, 15, 0.4),    # Expert: 8-15 seconds (40% chance)
-            (15, 25, 0.4),   # Advanced: 15-25 seconds (40% chance)  
-            (25, 45, 0.15),  # Intermediate: 25-45 seconds (15% chance)
-            (45, 120, 0.05), # Beginner: 45-120 seconds (5% chance)
-        ]
-
-        scrambles = [
-            "R U R' U' R' F R2 U' R' U' R U R' F'",
-            "F R U' R' U' R U R' F' R U R' U' R' F R F'",
-            "R U2 R' U' R U' R' F R F' U F R U R' U' F'",
-            "R U R' F' R U R' U' R' F R2 U' R'",
-            "F R U R' U' F' U F R U R' U' F'",
-            "R U R' U R U2 R' U",
-            "L' U' L U' L' U2 L U'",
-            "F U R U' R' F' U' F R U R' U' F'",
-            "R' U' R U' R' U2 R",
-            "L U L' U L U2 L'",
-        ]
+    def cube_type_ids(self, count):
+        if count <= 0:
+            return (None,)
+        if count > len(CUBE_TYPE_NAMES):
+            raise CommandError(
+                f'At most {len(CUBE_TYPE_NAMES)} cube types are supported'
+            )
+        ids = []
+        for name in CUBE_TYPE_NAMES[:count]:
+            cube_type = CubeType.objects.filter(name=name).order_by('id').first()
+            if cube_type is None:
+                cube_type = CubeType.objects.create(name=name)
+            ids.append(cube_type.pk)
+        return tuple(ids)
 
-        created_solves = 0
-        start_date = datetime.now() - timedelta(days=days_back)
+    def session_ids(self, count):
+        if count <= 0:
+            return (None,)
+        sessions = Session.objects.bulk_create(
+            [Session(name=f'Fake session {i + 1}') for i in range(count)]
+        )
+        return tuple(session.pk for session in sessions)
 
-        self.stdout.write(f'Generating {count} fake solves...')
+    def handle(self, *args, **options):
+        end_date = timezone.localdate()
+        if options['end']:
+            end_date = parse_date(options['end'])
+        if end_date is None:
+            raise CommandError('--end must be a date in YYYY-MM-DD form')
 
-        for i in range(count):
-            # Choose time based on weighted probability
-            rand = random.random()
-            cumulative = 0
-            for min_time, max_time, probability in time_ranges:
-                cumulative += probability
-                if rand <= cumulative:
-                    time_taken = round(random.uniform(min_time, max_time), 2)
-                    break
+        spec = fake_data.FakeDataSpec(
+            count=options['count'],
+            end=datetime.combine(end_date, time.max, tzinfo=dt_timezone.utc),
+            seed=options['seed'],
+            days_back=options['days_back'],
+            batch_size=max(options['batch_size'], 1),
+            cube_type_ids=self.cube_type_ids(options['cube_types']),
+            session_ids=self.session_ids(options['sessions']),
+            tag_rate=options['tag_rate'],
+        )
 
-            # Random date within the range
-            random_date = fake.date_time_between(
-                start_date=start_date,
-                end_date='now'
-            )
+        workers = options['workers']
+        if workers > 0 and connection.vendor == 'sqlite':
+            self.stdout.write('SQLite allows one writer at a time; inserting inline')
+            workers = 0
 
-            solve = Solve.objects.create(
-                time_taken=time_taken,
-                scramble=random.choice(scrambles),
-                created_at=random_date,
-                note=fake.sentence() if random.random() < 0.2 else ""  # 20% chance of note
-            )
-            created_solves += 1
+        self.stdout.write(
+            f'Generating {spec.count} fake solves in {spec.batches} batch(es)...'
+        )
+        created = 0
+        if workers > 0:
+            # Children open their own connections
+            connections.close_all()
+            # Spawned (non-fork) children start without a configured Django
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=django.setup
+            ) as executor:
+                sizes = executor.map(
+                    fake_data.insert_batch, [spec] * spec.batches, range(spec.batches)
+                )
+                for size in sizes:
+                    created += size
+                    self.stdout.write(f'Created {created}/{spec.count} solves...')
+        else:
+            for index in range(spec.batches):
+                created += fake_data.insert_batch(spec, index)
+                self.stdout.write(f'Created {created}/{spec.count} solves...')
 
-            if (i + 1) % 10 == 0:
-                self.stdout.write(f'Created {i + 1}/{count} solves...')
+        self.stdout.write('Rebuilding stats, rollups, PBs and the snapshot...')
+        fake_data.rebuild_derived_data()
 
         self.stdout.write(
             self.style.SUCCESS(
-                f'Successfully created {created_solves} fake solves'
+                f'Successfully created {created} fake solves'
             )
         )
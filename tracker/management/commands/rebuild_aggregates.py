@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from tracker import aggregates
+
+
+class Command(BaseCommand):
+    help = "Recompute the daily and weekly solve rollups from the solve table"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows per bulk insert (default: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        created = aggregates.rebuild_all(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {created} solve aggregate(s)"))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from tracker import personal_bests
+
+
+class Command(BaseCommand):
+    help = "Recompute the personal best flags (is_pb, is_session_pb) of every solve"
+
+    def handle(self, *args, **options):
+        total = personal_bests.rebuild_all()
+        self.stdout.write(self.style.SUCCESS(f"Flagged {total} personal best(s)"))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from tracker import columnar
+
+
+class Command(BaseCommand):
+    help = "Rewrite the columnar solve snapshot used by analytics from the solve table"
+
+    def handle(self, *args, **options):
+        manifest = columnar.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Wrote {manifest["rows"]} solve(s) to {columnar.snapshot_dir()}'
+            )
+        )
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from tracker import stats_store
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the incrementally maintained solve statistics from the solve table"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scope",
+            action="append",
+            help="Scope to rebuild (repeatable, default: every known scope)",
+        )
+
+    def handle(self, *args, **options):
+        scopes = options["scope"] or stats_store.known_scopes()
+
+        for scope in scopes:
+            record = stats_store.rebuild(scope)
+            self.stdout.write(f"{scope}: {record.count} solves")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt statistics for {len(scopes)} scope(s)")
+        )
@@ -0,0 +1,107 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import timedelta
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from tracker.ml_service import scan_image
+from tracker.tasks import (
+    claim_jobs,
+    complete_job,
+    fail_job,
+    purge_finished_jobs,
+    requeue_stale_jobs,
+)
+
+
+class Command(BaseCommand):
+    help = "Process queued cube image scans"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=getattr(settings, "SCAN_WORKER_PROCESSES", 2),
+            help="Size of the scan process pool; 0 scans in this process",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait when the queue is empty (default: 1.0)",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the queue is empty instead of polling",
+        )
+        parser.add_argument(
+            "--max-attempts",
+            type=int,
+            default=3,
+            help="Attempts before a job abandoned by a dead worker is failed",
+        )
+        parser.add_argument(
+            "--stale-after",
+            type=int,
+            default=300,
+            help="Seconds after which a running job is considered abandoned",
+        )
+        parser.add_argument(
+            "--keep-hours",
+            type=int,
+            default=24,
+            help="Hours to keep finished jobs before purging them",
+        )
+
+    def handle(self, *args, **options):
+        processes = options["processes"]
+        executor = None
+        if processes > 0:
+            # Children only scan bytes; make sure they don't inherit sockets
+            connections.close_all()
+            executor = ProcessPoolExecutor(max_workers=processes)
+
+        self.stdout.write(f'Scan worker started ({processes or "inline"} processes)')
+        processed = 0
+        try:
+            while True:
+                requeue_stale_jobs(
+                    timedelta(seconds=options["stale_after"]), options["max_attempts"]
+                )
+                jobs = claim_jobs(limit=max(processes, 1))
+                if not jobs:
+                    purge_finished_jobs(timedelta(hours=options["keep_hours"]))
+                    if options["once"]:
+                        break
+                    time.sleep(options["poll_interval"])
+                    continue
+
+                processed += self.process(jobs, executor)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} scan jobs"))
+
+    def process(self, jobs, executor):
+        if executor is None:
+            for job in jobs:
+                try:
+                    complete_job(job, scan_image(bytes(job.image)))
+                except Exception as e:
+                    fail_job(job, str(e))
+            return len(jobs)
+
+        futures = {executor.submit(scan_image, bytes(job.image)): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                complete_job(job, future.result())
+            except Exception as e:
+                fail_job(job, str(e))
+        return len(jobs)
@@ -1,11 +1,24 @@
 from django.core.management.base import BaseCommand
 from django.db import connection
 from tracker.models import Solve
+from tracker.profiling import query_plan_profiler
 import time
 
 class Command(BaseCommand):
     help = 'Test database connection and query performance'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--view',
+            help='Only report plans collected for this view (e.g. api:solve-list)',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=10,
+            help='Number of most recent plans to report (default: 10)',
+        )
+
     def handle(self, *args, **options):
         self.stdout.write('Testing database connection...')
         
@@ -33,13 +46,26 @@ class Command(BaseCommand):
             end_time = time.time()
             self.stdout.write(f'Query execution time: {end_time - start_time:.2f} seconds')
             
-            # Show query plan
-            with connection.cursor() as cursor:
-                cursor.execute("EXPLAIN ANALYZE SELECT * FROM tracker_solve ORDER BY created_at DESC LIMIT 10")
-                plan = cursor.fetchall()
-                self.stdout.write('\nQuery plan:')
-                for row in plan:
-                    self.stdout.write(row[0])
-            
+            # Show the plans collected by the sampling profiler
+            samples = query_plan_profiler.samples()
+            if options['view']:
+                samples = [s for s in samples if s['view'] == options['view']]
+            if samples:
+                self.stdout.write(f'\nCollected query plans ({len(samples)}):')
+                for sample in samples[-options['limit']:]:
+                    self.stdout.write(
+                        f"\n[{sample['recorded_at']}] {sample['view']} "
+                        f"({sample['duration_ms']:.2f} ms)"
+                    )
+                    self.stdout.write(sample['sql'])
+                    self.stdout.write(sample['plan'])
+            else:
+                # Nothing sampled yet: explain the default list query once
+                self.stdout.write('\nNo sampled query plans; default list query plan:')
+                sample = query_plan_profiler.profile(
+                    'test_db', Solve.objects.order_by('-created_at')[:10]
+                )
+                self.stdout.write(sample['plan'])
+
         except Exception as e:
             self.stdout.write(self.style.ERROR(f'Database test failed: {str(e)}')) 
\ No newline at end of file
@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from tracker import training
+
+
+class Command(BaseCommand):
+    help = "Train the solve time predictor on every solve and save it for the API"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--epochs",
+            type=int,
+            default=3,
+            help="Passes over the solves (default: 3)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=training.BATCH_SIZE,
+            help=f"Training windows per step (default: {training.BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=training.CHUNK_SIZE,
+            help=f"Solves held in memory at once (default: {training.CHUNK_SIZE})",
+        )
+        parser.add_argument(
+            "--output",
+            default=str(settings.SOLVE_PREDICTOR_DIR),
+            help="Directory the versioned model is saved under "
+            "(default: SOLVE_PREDICTOR_DIR)",
+        )
+        parser.add_argument(
+            "--model-version",
+            help="Version name (default: the current UTC timestamp)",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Shuffle seed")
+
+    def handle(self, *args, **options):
+        training.use_cpu_only()
+        try:
+            result = training.train(
+                output_dir=options["output"],
+                epochs=options["epochs"],
+                batch_size=options["batch_size"],
+                chunk_size=options["chunk_size"],
+                seed=options["seed"],
+                version=options["model_version"],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Trained on {result.windows} window(s) from {result.solves} "
+                f"solve(s), loss {result.loss:.4f}; saved to {result.directory}"
+            )
+        )
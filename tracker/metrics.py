@@ -0,0 +1,194 @@
+"""
+Per-request performance metrics.
+
+``PerformanceMiddleware`` opens a ``RequestMetrics`` for each request in a
+context variable. While it is open, the database wrapper installed on every
+connection counts and times queries, the cache backends in
+``tracker.cache_backends`` count hits and misses, and the middleware times
+response rendering (serialization). Context variables follow a request into
+``sync_to_async`` threads, so async views are measured too.
+
+Each request's numbers go out as a ``Server-Timing`` header. They are also
+folded into a process-wide registry, which ``/api/v1/metrics/`` renders in
+the Prometheus text format for staff users.
+"""
+
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class RequestMetrics:
+    started: float = field(default_factory=time.perf_counter)
+    db_queries: int = 0
+    db_time: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    serialization_time: float = 0.0
+
+    def server_timing(self, total: float) -> str:
+        """Header value; durations in milliseconds"""
+        return ", ".join(
+            [
+                f"total;dur={total * 1000:.2f}",
+                f'db;dur={self.db_time * 1000:.2f};desc="{self.db_queries} queries"',
+                f'cache;desc="{self.cache_hits} hits, {self.cache_misses} misses"',
+                f"serialize;dur={self.serialization_time * 1000:.2f}",
+            ]
+        )
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar(
+    "request_metrics", default=None
+)
+
+
+def current() -> Optional[RequestMetrics]:
+    """Metrics of the request being handled, if any"""
+    return _current.get()
+
+
+def start() -> Any:
+    """Open metrics for a request; returns the token ``finish`` needs"""
+    return _current.set(RequestMetrics())
+
+
+def finish(token: Any) -> None:
+    _current.reset(token)
+
+
+def record_cache(hit: bool) -> None:
+    metrics = _current.get()
+    if metrics is None:
+        return
+    if hit:
+        metrics.cache_hits += 1
+    else:
+        metrics.cache_misses += 1
+
+
+def record_query(
+    execute: Callable, sql: str, params: Any, many: bool, context: Dict
+) -> Any:
+    """Database execute wrapper timing every query of a measured request"""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_queries += 1
+        metrics.db_time += time.perf_counter() - started
+
+
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs) -> None:
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@dataclass
+class _ViewStats:
+    buckets: List[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS))
+    count: int = 0
+    latency: float = 0.0
+    db_queries: int = 0
+    db_time: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    serialization_time: float = 0.0
+
+
+class MetricsRegistry:
+    """Process-wide totals per (view, method, status class)"""
+
+    def __init__(self) -> None:
+        self._views: Dict[Tuple[str, str, str], _ViewStats] = {}
+        self._lock = threading.Lock()
+
+    def observe(
+        self, view: str, method: str, status: int, total: float, metrics: RequestMetrics
+    ) -> None:
+        key = (view, method, f"{status // 100}xx")
+        with self._lock:
+            stats = self._views.setdefault(key, _ViewStats())
+            for index, bound in enumerate(LATENCY_BUCKETS):
+                if total <= bound:
+                    stats.buckets[index] += 1
+            stats.count += 1
+            stats.latency += total
+            stats.db_queries += metrics.db_queries
+            stats.db_time += metrics.db_time
+            stats.cache_hits += metrics.cache_hits
+            stats.cache_misses += metrics.cache_misses
+            stats.serialization_time += metrics.serialization_time
+
+    def reset(self) -> None:
+        with self._lock:
+            self._views.clear()
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            views = sorted(self._views.items())
+
+        def sample(name: str, key: Tuple[str, str, str], value: Any, **extra) -> str:
+            pairs = dict(zip(("view", "method", "status"), key), **extra)
+            labels = ",".join(f'{label}="{text}"' for label, text in pairs.items())
+            return f"rubiklog_{name}{{{labels}}} {value}"
+
+        duration = "request_duration_seconds"
+        lines = [
+            f"# HELP rubiklog_{duration} Request latency by view",
+            f"# TYPE rubiklog_{duration} histogram",
+        ]
+        for key, stats in views:
+            for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+                lines.append(sample(f"{duration}_bucket", key, count, le=str(bound)))
+            lines += [
+                sample(f"{duration}_bucket", key, stats.count, le="+Inf"),
+                sample(f"{duration}_sum", key, stats.latency),
+                sample(f"{duration}_count", key, stats.count),
+            ]
+
+        counters = (
+            ("db_queries_total", "Database queries by view", "db_queries"),
+            ("db_duration_seconds_total", "Time spent in database queries", "db_time"),
+            (
+                "serialization_seconds_total",
+                "Time spent rendering responses",
+                "serialization_time",
+            ),
+        )
+        for name, help_text, attribute in counters:
+            lines += [
+                f"# HELP rubiklog_{name} {help_text}",
+                f"# TYPE rubiklog_{name} counter",
+            ]
+            lines += [
+                sample(name, key, getattr(stats, attribute)) for key, stats in views
+            ]
+
+        lines += [
+            "# HELP rubiklog_cache_requests_total Cache lookups by view and result",
+            "# TYPE rubiklog_cache_requests_total counter",
+        ]
+        for key, stats in views:
+            lines += [
+                sample("cache_requests_total", key, stats.cache_hits, result="hit"),
+                sample("cache_requests_total", key, stats.cache_misses, result="miss"),
+            ]
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
@@ -1,22 +1,40 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django.http import JsonResponse
 from django.core.exceptions import ValidationError, ObjectDoesNotExist
 import logging
+import time
 import traceback
 from django.conf import settings
 
+from asgiref.sync import sync_to_async
+
+from . import metrics
+from .profiling import query_plan_profiler
+
 class ErrorHandlingMiddleware:
     """
     Middleware to catch unhandled exceptions and return a consistent JSON error response.
     In DEBUG mode, includes traceback for 500 errors. Logs all unhandled exceptions.
+    Works in both sync and async chains so ASGI requests are not pushed onto a thread.
     """
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
         self.logger = logging.getLogger(__name__)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
         response = self.get_response(request)
         return response
 
+    async def __acall__(self, request):
+        return await self.get_response(request)
+
     def process_exception(self, request, exception):
         if isinstance(exception, ValidationError):
             return JsonResponse({
@@ -37,4 +55,106 @@ class ErrorHandlingMiddleware:
         if settings.DEBUG:
             error_response['exception_type'] = type(exception).__name__
             error_response['traceback'] = traceback.format_exc()
-        return JsonResponse(error_response, status=500)
\ No newline at end of file
+        return JsonResponse(error_response, status=500)
+
+
+class PerformanceMiddleware:
+    """
+    Measure every request (latency, queries, cache lookups, rendering) and
+    report it in a Server-Timing header and the /metrics/ registry.
+    Should come first so its latency covers the rest of the chain.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = metrics.start()
+        try:
+            response = self.get_response(request)
+            self.report(request, response)
+        finally:
+            metrics.finish(token)
+        return response
+
+    async def __acall__(self, request):
+        token = metrics.start()
+        try:
+            response = await self.get_response(request)
+            self.report(request, response)
+        finally:
+            metrics.finish(token)
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses render after the view returns; time that step
+        current = metrics.current()
+        if current is not None:
+            started = time.perf_counter()
+
+            def rendered(response):
+                current.serialization_time += time.perf_counter() - started
+
+            response.add_post_render_callback(rendered)
+        return response
+
+    def report(self, request, response):
+        current = metrics.current()
+        total = time.perf_counter() - current.started
+        response['Server-Timing'] = current.server_timing(total)
+        metrics.registry.observe(
+            view_name(request), request.method, response.status_code, total, current
+        )
+
+
+def view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match else 'unmatched'
+
+
+class QueryPlanMiddleware:
+    """
+    Explain the slowest query of sampled (or slow) requests, for any view;
+    see tracker.profiling. Goes above PerformanceMiddleware so the EXPLAIN
+    is not counted in the request's own timings.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = query_plan_profiler.begin(request)
+        if token is None:
+            return self.get_response(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            capture = query_plan_profiler.end(token)
+        query_plan_profiler.profile_capture(capture, view_name(request))
+        return response
+
+    async def __acall__(self, request):
+        token = query_plan_profiler.begin(request)
+        if token is None:
+            return await self.get_response(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            capture = query_plan_profiler.end(token)
+        # On the thread the async ORM used, so it sees the same connection
+        await sync_to_async(query_plan_profiler.profile_capture)(
+            capture, view_name(request)
+        )
+        return response
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 15:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0006_alter_solve_cube_type'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='solve',
+            index=models.Index(fields=['created_at', 'id'], name='tracker_sol_created_643a90_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='solve',
+            index=models.Index(fields=['time_taken', 'id'], name='tracker_sol_time_ta_91c70b_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 15:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0007_solve_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SolveStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=100, unique=True)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('total_time', models.FloatField(default=0.0)),
+                ('total_time_squared', models.FloatField(default=0.0)),
+                ('best_time', models.FloatField(blank=True, null=True)),
+                ('worst_time', models.FloatField(blank=True, null=True)),
+                ('first_solve_at', models.DateTimeField(blank=True, null=True)),
+                ('recent_solves', models.JSONField(blank=True, default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'solve statistics',
+            },
+        ),
+    ]
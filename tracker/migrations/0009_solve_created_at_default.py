@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 15:46
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0008_solvestatistics'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='solve',
+            name='created_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, help_text='When this solve was recorded'),
+        ),
+    ]
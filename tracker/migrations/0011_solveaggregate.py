@@ -0,0 +1,108 @@
+# Generated by Django 5.2.18 on 2026-10-17 15:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, DateField, F, Max, Min, Sum
+from django.db.models.functions import TruncDay, TruncWeek
+
+
+def backfill_aggregates(apps, schema_editor):
+    Solve = apps.get_model("tracker", "Solve")
+    SolveAggregate = apps.get_model("tracker", "SolveAggregate")
+    for period, trunc in (("day", TruncDay), ("week", TruncWeek)):
+        rows = (
+            Solve.objects.order_by()
+            .annotate(bucket=trunc("created_at", output_field=DateField()))
+            .values("bucket", "cube_type_id", "session")
+            .annotate(
+                count=Count("id"),
+                total=Sum("time_taken"),
+                total_squared=Sum(F("time_taken") * F("time_taken")),
+                best=Min("time_taken"),
+                worst=Max("time_taken"),
+            )
+        )
+        SolveAggregate.objects.bulk_create(
+            [
+                SolveAggregate(
+                    period=period,
+                    period_start=row["bucket"],
+                    cube_type_id=row["cube_type_id"],
+                    session=row["session"],
+                    count=row["count"],
+                    total_time=row["total"],
+                    total_time_squared=row["total_squared"],
+                    best_time=row["best"],
+                    worst_time=row["worst"],
+                )
+                for row in rows.iterator()
+            ],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0010_scanjob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SolveAggregate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "period",
+                    models.CharField(
+                        choices=[("day", "Day"), ("week", "Week")], max_length=4
+                    ),
+                ),
+                ("period_start", models.DateField()),
+                ("session", models.CharField(blank=True, max_length=100)),
+                ("count", models.PositiveIntegerField(default=0)),
+                ("total_time", models.FloatField(default=0.0)),
+                ("total_time_squared", models.FloatField(default=0.0)),
+                ("best_time", models.FloatField(blank=True, null=True)),
+                ("worst_time", models.FloatField(blank=True, null=True)),
+                (
+                    "cube_type",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="aggregates",
+                        to="tracker.cubetype",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["period", "period_start"],
+                        name="tracker_sol_period_5078f8_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("period", "period_start", "cube_type", "session"),
+                        name="unique_solve_aggregate_bucket",
+                    ),
+                    models.UniqueConstraint(
+                        condition=models.Q(("cube_type__isnull", True)),
+                        fields=("period", "period_start", "session"),
+                        name="unique_solve_aggregate_bucket_no_cube",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_aggregates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:20
+
+from django.db import migrations, models
+
+
+def flag_personal_bests(apps, schema_editor):
+    Solve = apps.get_model("tracker", "Solve")
+    # Nothing set is_pb before, so any existing flags came from clients
+    Solve.objects.filter(is_pb=True).update(is_pb=False)
+    best_by_cube_type = {}
+    pb_ids = []
+    rows = Solve.objects.order_by("created_at", "id").values_list(
+        "id", "cube_type_id", "time_taken"
+    )
+    for pk, cube_type_id, time_taken in rows.iterator():
+        best = best_by_cube_type.get(cube_type_id)
+        if best is None or time_taken < best:
+            best_by_cube_type[cube_type_id] = time_taken
+            pb_ids.append(pk)
+    for start in range(0, len(pb_ids), 1000):
+        Solve.objects.filter(id__in=pb_ids[start : start + 1000]).update(is_pb=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0011_solveaggregate"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="solve",
+            index=models.Index(
+                condition=models.Q(("is_pb", True)),
+                fields=["cube_type", "created_at", "id"],
+                name="solve_pb_history_idx",
+            ),
+        ),
+        migrations.RunPython(flag_personal_bests, migrations.RunPython.noop),
+    ]
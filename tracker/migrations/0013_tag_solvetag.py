@@ -0,0 +1,99 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def split_tag_strings(apps, schema_editor):
+    Solve = apps.get_model("tracker", "Solve")
+    Tag = apps.get_model("tracker", "Tag")
+    SolveTag = apps.get_model("tracker", "SolveTag")
+
+    names_by_solve = {}
+    for pk, tags in Solve.objects.exclude(tags="").values_list("id", "tags").iterator():
+        names = (name.strip() for name in tags.split(","))
+        names = list(dict.fromkeys(name for name in names if name))
+        names_by_solve[pk] = names
+        normalized = ",".join(names)
+        if normalized != tags:
+            Solve.objects.filter(pk=pk).update(tags=normalized)
+
+    all_names = {name for names in names_by_solve.values() for name in names}
+    Tag.objects.bulk_create([Tag(name=name) for name in all_names])
+    ids = dict(Tag.objects.values_list("name", "id"))
+    SolveTag.objects.bulk_create(
+        [
+            SolveTag(solve_id=solve_id, tag_id=ids[name])
+            for solve_id, names in names_by_solve.items()
+            for name in names
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0012_solve_pb_history_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Tag",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=255, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="SolveTag",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "solve",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="tag_links",
+                        to="tracker.solve",
+                    ),
+                ),
+                (
+                    "tag",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="solve_links",
+                        to="tracker.tag",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["tag", "solve"], name="tracker_sol_tag_id_54a741_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("solve", "tag"), name="unique_solve_tag"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(split_tag_strings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:05
+
+from django.db import migrations
+from django.db.models import Min
+
+
+def sessions_from_names(apps, schema_editor):
+    Session = apps.get_model("tracker", "Session")
+    Solve = apps.get_model("tracker", "Solve")
+    SolveAggregate = apps.get_model("tracker", "SolveAggregate")
+
+    # One session per distinct name, dated by its first solve
+    rows = (
+        Solve.objects.exclude(session="")
+        .values("session")
+        .annotate(first=Min("created_at"))
+        .order_by("first")
+    )
+    for row in rows:
+        session = Session.objects.create(name=row["session"], created_at=row["first"])
+        Solve.objects.filter(session=row["session"]).update(session_ref=session)
+        SolveAggregate.objects.filter(session=row["session"]).update(
+            session_ref=session
+        )
+    # Rollups for names with no solves left cannot be mapped
+    SolveAggregate.objects.exclude(session="").filter(
+        session_ref__isnull=True
+    ).delete()
+
+
+class Migration(migrations.Migration):
+    # Its own migration (and transaction), so the deferred foreign key checks
+    # of these updates have run before 0016 alters the same tables
+
+    dependencies = [
+        ("tracker", "0014_session"),
+    ]
+
+    operations = [
+        migrations.RunPython(sessions_from_names, migrations.RunPython.noop),
+    ]
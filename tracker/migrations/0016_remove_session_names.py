@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:05
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0015_backfill_sessions"),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="solveaggregate",
+            name="unique_solve_aggregate_bucket",
+        ),
+        migrations.RemoveConstraint(
+            model_name="solveaggregate",
+            name="unique_solve_aggregate_bucket_no_cube",
+        ),
+        migrations.RemoveField(
+            model_name="solve",
+            name="session",
+        ),
+        migrations.RemoveField(
+            model_name="solveaggregate",
+            name="session",
+        ),
+        migrations.RenameField(
+            model_name="solve",
+            old_name="session_ref",
+            new_name="session",
+        ),
+        migrations.RenameField(
+            model_name="solveaggregate",
+            old_name="session_ref",
+            new_name="session",
+        ),
+        migrations.AddConstraint(
+            model_name="solveaggregate",
+            constraint=models.UniqueConstraint(
+                models.F("period"),
+                models.F("period_start"),
+                django.db.models.functions.comparison.Coalesce(
+                    "cube_type", 0, output_field=models.BigIntegerField()
+                ),
+                django.db.models.functions.comparison.Coalesce(
+                    "session", 0, output_field=models.BigIntegerField()
+                ),
+                name="unique_solve_aggregate_bucket",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="solve",
+            index=models.Index(
+                fields=["session", "created_at", "id"],
+                name="tracker_sol_session_f56522_idx",
+            ),
+        ),
+    ]
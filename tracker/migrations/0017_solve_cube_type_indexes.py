@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0016_remove_session_names"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="solve",
+            index=models.Index(
+                fields=["cube_type", "created_at", "id"],
+                name="tracker_sol_cube_ty_292d9f_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="solve",
+            index=models.Index(
+                fields=["cube_type", "time_taken", "id"],
+                name="tracker_sol_cube_ty_e6d92f_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:40
+
+from django.db import migrations, models
+
+
+def flag_session_bests(apps, schema_editor):
+    Solve = apps.get_model("tracker", "Solve")
+    best_by_session = {}
+    pb_ids = []
+    rows = (
+        Solve.objects.filter(session__isnull=False)
+        .order_by("created_at", "id")
+        .values_list("id", "session_id", "time_taken")
+    )
+    for pk, session_id, time_taken in rows.iterator():
+        best = best_by_session.get(session_id)
+        if best is None or time_taken < best:
+            best_by_session[session_id] = time_taken
+            pb_ids.append(pk)
+    for start in range(0, len(pb_ids), 1000):
+        Solve.objects.filter(id__in=pb_ids[start : start + 1000]).update(
+            is_session_pb=True
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0017_solve_cube_type_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="solve",
+            name="is_session_pb",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name="solve",
+            index=models.Index(
+                condition=models.Q(("is_session_pb", True)),
+                fields=["session", "created_at", "id"],
+                name="solve_session_pb_history_idx",
+            ),
+        ),
+        migrations.RunPython(flag_session_bests, migrations.RunPython.noop),
+    ]
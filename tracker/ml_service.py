@@ -4,51 +4,307 @@ from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import Dense, LSTM
 import cv2
 import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
 from tensorflow.keras import models
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 
 class CubeSolvePredictor:
-    def __init__(self) -> None:
-        self.model = Sequential(
+    # Solves of history a prediction is based on, and the fewest accepted
+    HISTORY_LENGTH = 20
+    MIN_HISTORY = 5
+    FEATURE_COUNT = 5
+
+    MODEL_FILE = "model.keras"
+    SCALER_FILE = "scaler.npz"
+    LATEST_FILE = "LATEST"
+
+    def __init__(
+        self, model: Any = None, scaler: Optional[StandardScaler] = None
+    ) -> None:
+        self.model = model if model is not None else self.build_model()
+        self.scaler = scaler if scaler is not None else StandardScaler()
+
+    @classmethod
+    def build_model(cls) -> Any:
+        """A fresh, untrained network"""
+        model = Sequential(
             [
-                LSTM(64, input_shape=(None, 5), return_sequences=True),
+                LSTM(64, input_shape=(None, cls.FEATURE_COUNT), return_sequences=True),
                 LSTM(32),
                 Dense(16, activation="relu"),
                 Dense(1),
             ]
         )
-        self.model.compile(optimizer="adam", loss="mse")
-        self.scaler = StandardScaler()
+        model.compile(optimizer="adam", loss="mse")
+        return model
+
+    def fit_scaler(self, features: np.ndarray) -> None:
+        """Fit the feature scaler on training rows (one row per solve)"""
+        rows = np.asarray(features, dtype=float).reshape(-1, self.FEATURE_COUNT)
+        self.scaler.fit(rows)
+
+    def save(self, directory: str) -> None:
+        """Write the model and the fitted scaler to a directory"""
+        os.makedirs(directory, exist_ok=True)
+        self.model.save(os.path.join(directory, self.MODEL_FILE))
+        # Fitted parameters only, so loading never unpickles anything
+        np.savez(
+            os.path.join(directory, self.SCALER_FILE),
+            mean=self.scaler.mean_,
+            scale=self.scaler.scale_,
+            var=self.scaler.var_,
+            n_samples_seen=self.scaler.n_samples_seen_,
+        )
+
+    def save_version(self, base_dir: str, version: str) -> str:
+        """
+        Save as a new version under ``base_dir`` and make it the latest.
+
+        The pointer file is replaced last, so loaders see either the previous
+        version or the complete new one.
+        """
+        directory = os.path.join(base_dir, version)
+        self.save(directory)
+        pointer = os.path.join(base_dir, self.LATEST_FILE)
+        with open(pointer + ".tmp", "w") as f:
+            f.write(version)
+        os.replace(pointer + ".tmp", pointer)
+        return directory
+
+    @classmethod
+    def resolve(cls, directory: str) -> str:
+        """The latest version saved under ``directory``, else the directory itself"""
+        try:
+            with open(os.path.join(directory, cls.LATEST_FILE)) as f:
+                return os.path.join(directory, f.read().strip())
+        except OSError:
+            return directory
+
+    @classmethod
+    def is_saved(cls, directory: str) -> bool:
+        directory = cls.resolve(directory)
+        return all(
+            os.path.exists(os.path.join(directory, name))
+            for name in (cls.MODEL_FILE, cls.SCALER_FILE)
+        )
+
+    @classmethod
+    def load(cls, directory: str) -> "CubeSolvePredictor":
+        """Load a predictor written by ``save`` (or its latest ``save_version``)"""
+        directory = cls.resolve(directory)
+        model = models.load_model(os.path.join(directory, cls.MODEL_FILE))
+        scaler = StandardScaler()
+        with np.load(os.path.join(directory, cls.SCALER_FILE)) as params:
+            scaler.mean_ = params["mean"]
+            scaler.scale_ = params["scale"]
+            scaler.var_ = params["var"]
+            scaler.n_samples_seen_ = params["n_samples_seen"]
+        scaler.n_features_in_ = len(scaler.mean_)
+        return cls(model=model, scaler=scaler)
+
+    @staticmethod
+    def build_features(
+        time_taken: np.ndarray, scramble_length: np.ndarray, created_at: np.ndarray
+    ) -> np.ndarray:
+        """
+        Feature matrix from solve columns (``created_at`` as UTC epoch seconds):
+        time, scramble length, hour, minute and weekday.
+        """
+        seconds = np.floor(created_at).astype(np.int64)
+        return np.column_stack(
+            [
+                time_taken,
+                scramble_length,
+                seconds // 3600 % 24,
+                seconds // 60 % 60,
+                # 1970-01-01 was a Thursday (weekday 3)
+                (seconds // 86400 + 3) % 7,
+            ]
+        ).astype(float)
 
     def preprocess_data(self, solves: List[Any]) -> np.ndarray:
         """Preprocess solve data for prediction"""
-        features = []
-        for solve in solves:
-            features.append(
-                [
-                    solve.time_taken,
-                    len(solve.scramble) if solve.scramble else 0,
-                    solve.created_at.hour,
-                    solve.created_at.minute,
-                    solve.created_at.weekday(),
-                ]
-            )
-        return np.array(features)
+        return self.build_features(
+            np.array([solve.time_taken for solve in solves], dtype=float),
+            np.array([len(solve.scramble or "") for solve in solves]),
+            np.array([solve.created_at.timestamp() for solve in solves]),
+        )
+
+    def preprocess_columns(self, columns: Any) -> np.ndarray:
+        """Preprocess a ``tracker.columnar.SolveColumns`` snapshot"""
+        return self.build_features(
+            columns.time_taken, columns.scramble_length, columns.created_at
+        )
 
     def predict_next_solve(self, recent_solves: List[Any]) -> Optional[float]:
         """Predict next solve time based on recent solves"""
         if len(recent_solves) < 5:
             return None
 
-        features = self.preprocess_data(recent_solves)
-        features = self.scaler.transform(features)
-        features = np.array(features).reshape(1, -1, 5)
+        return self.predict_batch([self.preprocess_data(recent_solves)])[0]
+
+    def predict_batch(self, sequences: List[np.ndarray]) -> List[float]:
+        """
+        Predict the next time for several solve histories (feature matrices).
+
+        Histories of the same length go through the model as one batch, so a
+        batch of full-length histories is a single ``predict`` call.
+        """
+        results: List[float] = [0.0] * len(sequences)
+        by_length: Dict[int, List[int]] = {}
+        for index, sequence in enumerate(sequences):
+            by_length.setdefault(len(sequence), []).append(index)
+
+        for indexes in by_length.values():
+            batch = np.stack([sequences[index] for index in indexes]).astype(float)
+            scaled = self.scaler.transform(batch.reshape(-1, self.FEATURE_COUNT))
+            scaled = np.array(scaled).reshape(len(indexes), -1, self.FEATURE_COUNT)
+            predictions = self.model.predict(scaled, verbose=0)
+            for index, prediction in zip(indexes, predictions):
+                results[index] = float(prediction[0])
+        return results
+
+
+class PredictionBatcher:
+    """
+    Micro-batches concurrent solve predictions into shared ``predict`` calls.
+
+    Callers block on their own result while a single background thread
+    gathers whatever requests arrive within ``max_wait`` seconds (up to
+    ``max_batch_size``) and runs them through the model together. The model
+    is only ever used from that thread.
+    """
+
+    def __init__(
+        self, predictor: Any, max_batch_size: int = 32, max_wait: float = 0.005
+    ) -> None:
+        self.predictor = predictor
+        self.max_batch_size = max(max_batch_size, 1)
+        self.max_wait = max_wait
+        self._requests: "queue.Queue[Tuple[np.ndarray, Future]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(
+                        target=self._run, name="solve-prediction-batcher", daemon=True
+                    )
+                    self._worker.start()
+
+    def predict(self, features: np.ndarray, timeout: Optional[float] = None) -> float:
+        """Queue one history's features and wait for its prediction"""
+        future: Future = Future()
+        self._requests.put((features, future))
+        self._ensure_worker()
+        return future.result(timeout=timeout)
+
+    def _collect(self) -> List[Tuple[np.ndarray, Future]]:
+        batch = [self._requests.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._requests.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            try:
+                results = self.predictor.predict_batch([item[0] for item in batch])
+            except Exception as e:
+                logger.error(f"Solve prediction batch failed: {str(e)}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+
+class SolvePredictionService:
+    """
+    Process-wide solve time prediction.
+
+    The trained model and its scaler are loaded from ``model_dir`` once per
+    process (optionally up front via ``warm_up``); requests then share it
+    through a ``PredictionBatcher``.
+    """
+
+    def __init__(
+        self,
+        model_dir: str,
+        max_batch_size: int = 32,
+        max_wait: float = 0.005,
+        timeout: float = 5.0,
+    ) -> None:
+        self.model_dir = model_dir
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.timeout = timeout
+        self._batcher: Optional[PredictionBatcher] = None
+        self._lock = threading.Lock()
+
+    def is_available(self) -> bool:
+        """Whether a trained model has been saved for this service"""
+        return self._batcher is not None or CubeSolvePredictor.is_saved(self.model_dir)
+
+    def _get_batcher(self) -> PredictionBatcher:
+        if self._batcher is None:
+            with self._lock:
+                if self._batcher is None:
+                    predictor = CubeSolvePredictor.load(self.model_dir)
+                    self._batcher = PredictionBatcher(
+                        predictor, self.max_batch_size, self.max_wait
+                    )
+                    logger.info(f"Loaded solve predictor from {self.model_dir}")
+        return self._batcher
+
+    def warm_up(self) -> None:
+        """Load the model now rather than on the first request"""
+        if self.is_available():
+            self._get_batcher()
+
+    def predict(self, features: np.ndarray) -> Optional[float]:
+        """Predict the next solve time from a history's features (oldest first)"""
+        if len(features) < CubeSolvePredictor.MIN_HISTORY:
+            return None
+        features = features[-CubeSolvePredictor.HISTORY_LENGTH :]
+        return self._get_batcher().predict(features, timeout=self.timeout)
 
-        prediction = self.model.predict(features)
-        return float(prediction[0][0])
+
+_prediction_service: Optional[SolvePredictionService] = None
+_prediction_service_lock = threading.Lock()
+
+
+def get_prediction_service() -> SolvePredictionService:
+    """Return this process's prediction service, configured from settings"""
+    global _prediction_service
+    if _prediction_service is None:
+        with _prediction_service_lock:
+            if _prediction_service is None:
+                from django.conf import settings
+
+                _prediction_service = SolvePredictionService(
+                    model_dir=str(settings.SOLVE_PREDICTOR_DIR),
+                    max_batch_size=settings.SOLVE_PREDICTOR_BATCH_SIZE,
+                    max_wait=settings.SOLVE_PREDICTOR_BATCH_WAIT_MS / 1000,
+                )
+    return _prediction_service
 
 
 class CubeScanner:
@@ -62,6 +318,7 @@ class CubeScanner:
         self.sample_size = 20
         self.frame_skip = 2  # Process every nth frame
         self.frame_count = 0
+        self._cell_id_cache: Dict[str, Any] = {}
 
     def _initialize(self) -> None:
         """Lazy initialization of TensorFlow and model"""
@@ -95,6 +352,23 @@ class CubeScanner:
             "blue": ([100, 150, 150], [130, 255, 255]),
             "green": ([45, 150, 150], [75, 255, 255]),
         }
+        # Per-channel bitmask lookup tables: bit k of table[v] for channel c
+        # is set when value v lies inside color k's range on that channel.
+        # AND-ing the three lookups gives every color's inRange result for a
+        # pixel at once (up to 8 colors fit in the uint8 pattern).
+        self.color_names = list(self.color_ranges)
+        self._channel_lut = np.zeros((1, 256, 3), dtype=np.uint8)
+        for bit, (lower, upper) in enumerate(self.color_ranges.values()):
+            for channel in range(3):
+                self._channel_lut[0, lower[channel] : upper[channel] + 1, channel] |= (
+                    1 << bit
+                )
+        # (bit pattern, color) membership used to turn pattern counts into
+        # per-color pixel counts
+        patterns = np.arange(256)[:, None]
+        self._pattern_colors = (
+            (patterns >> np.arange(len(self.color_names))) & 1
+        ).astype(np.int64)
 
     def process_frame(self, image_bytes: bytes) -> Optional[Dict[str, Any]]:
         """Process a frame and return cube colors"""
@@ -110,22 +384,8 @@ class CubeScanner:
             # Process image
             hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
 
-            # Get image dimensions
-            h, w = image.shape[:2]
-            cell_height = h // self.grid_size
-            cell_width = w // self.grid_size
-
-            # Detect colors in grid
-            colors = []
-            confidences = []
-
-            for i in range(self.grid_size):
-                for j in range(self.grid_size):
-                    color, confidence = self._process_cell(
-                        hsv, i, j, cell_height, cell_width
-                    )
-                    colors.append(color)
-                    confidences.append(confidence)
+            # Classify every cell of the grid in one batched pass
+            colors, confidences = self._classify_grid(hsv)
 
             # Validate the detected colors
             is_valid = self._validate_colors(colors)
@@ -136,6 +396,93 @@ class CubeScanner:
             logger.error(f"Error processing frame: {str(e)}")
             return None
 
+    def _sample_grid(self, hsv: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Cut the sample window around every cell centre out of the image as one
+        compact block. Returns the block and a matching array with each
+        pixel's cell index; pixels of windows that overrun the image edge get
+        the out-of-range index ``grid_size ** 2`` and are ignored.
+        """
+        h, w = hsv.shape[:2]
+        size, half = self.grid_size, self.sample_size
+        cells = np.arange(size)
+        top = (2 * cells + 1) * (h // size) // 2 - half
+        left = (2 * cells + 1) * (w // size) // 2 - half
+        window = 2 * half
+
+        fits = top.min() >= 0 and left.min() >= 0
+        fits = fits and top.max() + window <= h and left.max() + window <= w
+        if fits:
+            # Common case: every window is inside the image, so plain slices
+            # (views) can be stitched together without any gather
+            block = np.concatenate(
+                [
+                    np.concatenate(
+                        [hsv[y : y + window, x : x + window] for x in left], axis=1
+                    )
+                    for y in top
+                ]
+            )
+            return block, self._cell_ids(window)
+
+        offsets = np.arange(window)
+        rows = (top[:, None] + offsets).ravel()
+        cols = (left[:, None] + offsets).ravel()
+        block = hsv[rows.clip(0, h - 1)[:, None], cols.clip(0, w - 1)[None, :]]
+        cell_ids = self._cell_ids(window).copy()
+        row_inside = (rows >= 0) & (rows < h)
+        col_inside = (cols >= 0) & (cols < w)
+        inside = row_inside[:, None] & col_inside[None, :]
+        cell_ids[~inside] = size * size
+        return block, cell_ids
+
+    def _cell_ids(self, window: int) -> np.ndarray:
+        """Cell index of every pixel of a stitched block (cached per layout)"""
+        key = (self.grid_size, window)
+        if self._cell_id_cache.get("key") != key:
+            cell = np.repeat(np.arange(self.grid_size), window)
+            self._cell_id_cache = {
+                "key": key,
+                "ids": cell[:, None] * self.grid_size + cell[None, :],
+            }
+        return self._cell_id_cache["ids"]
+
+    def _classify_samples(
+        self, block: np.ndarray, cell_ids: np.ndarray, cell_count: int
+    ) -> Tuple[List[str], List[float]]:
+        """
+        Classify HSV pixels against every color range at once, grouping them
+        into cells by ``cell_ids``. Same rule as cv2.inRange per color: the
+        best color wins if more than 40% of the cell's pixels fall in its range.
+        """
+        hue, saturation, value = cv2.split(cv2.LUT(block, self._channel_lut))
+        color_bits = cv2.bitwise_and(cv2.bitwise_and(hue, saturation), value)
+
+        # Histogram of (cell, bit pattern), then patterns -> per-color counts
+        histogram = np.bincount(
+            (cell_ids * 256 + color_bits).ravel(),
+            minlength=(cell_count + 1) * 256,
+        ).reshape(cell_count + 1, 256)[:cell_count]
+        counts = histogram @ self._pattern_colors
+        totals = np.maximum(histogram.sum(axis=1), 1)
+        confidence_matrix = counts / totals[:, None]
+
+        best = confidence_matrix.argmax(axis=1)
+        best_confidence = confidence_matrix[np.arange(len(best)), best]
+        accepted = best_confidence > 0.4  # 40% threshold
+
+        colors = [
+            self.color_names[index] if ok else "unknown"
+            for index, ok in zip(best, accepted)
+        ]
+        confidences = np.where(accepted, best_confidence, 0.0).tolist()
+        return colors, confidences
+
+    def _classify_grid(self, hsv: np.ndarray) -> Tuple[List[str], List[float]]:
+        """Detect the color of every grid cell of an HSV face image"""
+        block, cell_ids = self._sample_grid(hsv)
+        return self._classify_samples(block, cell_ids, self.grid_size**2)
+
     def _process_cell(self, hsv: np.ndarray, i: int, j: int, cell_height: int, cell_width: int) -> Tuple[str, float]:
         """Process individual cell with confidence score"""
         center_y = (i * cell_height + (i + 1) * cell_height) // 2
@@ -156,25 +503,11 @@ class CubeScanner:
         if section is None or section.size == 0:
             return ("unknown", 0.0)
 
-        max_confidence = 0.0
-        dominant_color = "unknown"
-
-        for color_name, (lower, upper) in self.color_ranges.items():
-            # Convert bounds to numpy arrays
-            lower = np.array(lower)
-            upper = np.array(upper)
-
-            # Create mask for this color range
-            mask = cv2.inRange(section, lower, upper)
-
-            # Calculate percentage of pixels that match this color
-            confidence = np.count_nonzero(mask) / mask.size
-
-            if confidence > max_confidence and confidence > 0.4:  # 40% threshold
-                max_confidence = confidence
-                dominant_color = color_name
-
-        return (dominant_color, max_confidence)
+        cell_ids = np.zeros(section.shape[:2], dtype=np.int64)
+        colors, confidences = self._classify_samples(
+            np.ascontiguousarray(section), cell_ids, 1
+        )
+        return (colors[0], confidences[0])
 
     def _draw_alignment_guides(self, image: np.ndarray) -> None:
         """Draw alignment guides for better cube positioning"""
@@ -225,7 +558,8 @@ class CubeScanner:
         Validate detected colors for a cube face
         Returns: bool indicating if the detected colors form a valid cube face
         """
-        if len(colors) != 9:
+        cell_count = self.grid_size * self.grid_size
+        if len(colors) != cell_count:
             return False
 
         # Count occurrences of each color
@@ -235,71 +569,95 @@ class CubeScanner:
                 return False
             color_counts[color] = color_counts.get(color, 0) + 1
 
-        # Center piece should have at least 4 matching colors
-        center_color = colors[4]  # Center piece
-        if color_counts.get(center_color, 0) < 4:
-            return False
+        # On odd grids the center piece should have at least 4 matching colors
+        if self.grid_size % 2:
+            center_color = colors[cell_count // 2]  # Center piece
+            if color_counts.get(center_color, 0) < 4:
+                return False
 
-        # Maximum 9 squares of the same color allowed
+        # Maximum one face worth of squares of the same color allowed
         for count in color_counts.values():
-            if count > 9:
+            if count > cell_count:
                 return False
 
         return True
 
 
-import unittest
-import numpy as np
-from unittest.mock import Mock, patch, MagicMock
-from tracker.ml_service import CubeSolvePredictor, CubeScanner
-from tracker.models import Solve
-from django.test import TestCase
-from django.utils import timezone
-
-
-class CubeSolvePredictorTests(TestCase):
-    def setUp(self):
-        self.predictor = CubeSolvePredictor()
-
-    def test_preprocess_data(self):
-        # Create test solves
-        solves = []
-        for i in range(5):
-            solve = Solve.objects.create(
-                time_taken=10.0 + i, scramble="R U R' U'", created_at=timezone.now()
-            )
-            solves.append(solve)
+class CubeScannerPool:
+    """
+    Process-wide pool of ready CubeScanner instances.
+
+    Scanners are built once per worker (optionally up front via ``warm_up``)
+    and lent out one request at a time, so a scan only pays for image work.
+    A scanner is never shared by two threads at once.
+    """
+
+    def __init__(self, size: int = 1, load_model: bool = False) -> None:
+        self.size = max(size, 1)
+        self.load_model = load_model
+        self._idle: "queue.LifoQueue[CubeScanner]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _create(self) -> CubeScanner:
+        scanner = CubeScanner()
+        if self.load_model:
+            scanner._initialize()
+        return scanner
+
+    def warm_up(self) -> None:
+        """Build every scanner now rather than on the first requests"""
+        with self._lock:
+            while self._created < self.size:
+                self._idle.put(self._create())
+                self._created += 1
+        logger.info(f"Cube scanner pool warmed up with {self.size} scanner(s)")
+
+    @contextmanager
+    def scanner(self, timeout: Optional[float] = None) -> Iterator[CubeScanner]:
+        """Borrow a scanner, creating one if the pool is not full yet"""
+        try:
+            scanner = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+            if can_create:
+                try:
+                    scanner = self._create()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                scanner = self._idle.get(timeout=timeout)
+        try:
+            yield scanner
+        finally:
+            self._idle.put(scanner)
 
-        features = self.predictor.preprocess_data(solves)
-        self.assertEqual(features.shape[0], 5)
-        self.assertEqual(features.shape[1], 5)  # 5 features per solve
 
-    def test_predict_insufficient_data(self):
-        # Test with fewer than 5 solves
-        solves = [
-            Solve.objects.create(time_taken=10.0, scramble="R U R' U'")
-            for _ in range(3)
-        ]
+_scanner_pool: Optional[CubeScannerPool] = None
+_scanner_pool_lock = threading.Lock()
 
-        result = self.predictor.predict_next_solve(solves)
-        self.assertIsNone(result)
 
-    def test_predict_with_sufficient_data(self):
-        # Create test solves
-        solves = [
-            Solve.objects.create(
-                time_taken=10.0 + i, scramble="R U R' U'", created_at=timezone.now()
-            )
-            for i in range(5)
-        ]
+def get_scanner_pool() -> CubeScannerPool:
+    """Return this process's scanner pool, sized from settings"""
+    global _scanner_pool
+    if _scanner_pool is None:
+        with _scanner_pool_lock:
+            if _scanner_pool is None:
+                from django.conf import settings
 
-        # Mock the model and scaler directly on the instance
-        self.predictor.model = MagicMock()
-        self.predictor.scaler = MagicMock()
+                _scanner_pool = CubeScannerPool(
+                    size=getattr(settings, "CUBE_SCANNER_POOL_SIZE", 1),
+                    load_model=getattr(settings, "CUBE_SCANNER_LOAD_MODEL", False),
+                )
+    return _scanner_pool
 
-        # Set up mock returns
-        self.predictor.scaler.transform.return_value = np.random.rand(1, 5)
-        self.predictor.model.predict.return_value = np.array([[12.5]])
 
-        result = self.predictor.predict_next_solve(solves)
-        self.assertEqual(result, 12.5)
+def scan_image(image_bytes: bytes) -> Optional[Dict[str, Any]]:
+    """Scan one encoded image with this process's scanner pool"""
+    with get_scanner_pool().scanner() as scanner:
+        return scanner.process_frame(image_bytes)
@@ -1,8 +1,10 @@
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 import sys
 import os
+import uuid
 
 
 # Valid Rubik's cube moves for validation
@@ -56,6 +58,29 @@ class CubeType(models.Model):
         return self.name
 
 
+class Session(models.Model):
+    """A named practice session; its running stats live in ``tracker.stats_store``"""
+
+    name = models.CharField(max_length=100)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self) -> str:
+        return self.name
+
+    @classmethod
+    def named(cls, name: str) -> "Session":
+        """
+        The oldest session with this name, created on first use. Clients from
+        before sessions were a model send a name; this maps it the way the
+        0015 migration mapped stored names.
+        """
+        session = cls.objects.filter(name=name).order_by("created_at", "id").first()
+        return session or cls.objects.create(name=name)
+
+
 class Solve(models.Model):
     time_taken = models.FloatField(
         db_index=True, help_text="Time taken to solve the cube in seconds"
@@ -66,8 +91,9 @@ class Solve(models.Model):
         blank=True,
         help_text="Scramble sequence used for this solve",
     )
+    # A default rather than auto_now_add so imported solves keep their times
     created_at = models.DateTimeField(
-        auto_now_add=True, db_index=True, help_text="When this solve was recorded"
+        default=timezone.now, db_index=True, help_text="When this solve was recorded"
     )
     note = models.TextField(
         blank=True, max_length=500, help_text="Optional notes about this solve"
@@ -76,8 +102,13 @@ class Solve(models.Model):
         CubeType, on_delete=models.CASCADE, related_name="solves", null=True, blank=True
     )
     is_pb = models.BooleanField(default=False)
-    tags = models.CharField(max_length=255, blank=True)  # Comma-separated tags
-    session = models.CharField(max_length=100, blank=True)
+    # PB of its session (is_pb is per cube type); see tracker.personal_bests
+    is_session_pb = models.BooleanField(default=False)
+    # Comma-separated tags; mirrored into SolveTag rows for filtering
+    tags = models.CharField(max_length=255, blank=True)
+    session = models.ForeignKey(
+        Session, on_delete=models.CASCADE, related_name="solves", null=True, blank=True
+    )
 
     class Meta:
         indexes = [
@@ -86,6 +117,26 @@ class Solve(models.Model):
             models.Index(
                 fields=["created_at", "time_taken"]
             ),  # Composite index for ordering
+            # Keyset pagination walks (sort field, id) in either direction
+            models.Index(fields=["created_at", "id"]),
+            models.Index(fields=["time_taken", "id"]),
+            # A session's solves, newest first
+            models.Index(fields=["session", "created_at", "id"]),
+            # Per-cube-type lists in either sort order, keyset-paginated
+            models.Index(fields=["cube_type", "created_at", "id"]),
+            models.Index(fields=["cube_type", "time_taken", "id"]),
+            # PB history and the current best per cube type (see
+            # tracker.personal_bests); only the few flagged rows are indexed
+            models.Index(
+                fields=["cube_type", "created_at", "id"],
+                condition=models.Q(is_pb=True),
+                name="solve_pb_history_idx",
+            ),
+            models.Index(
+                fields=["session", "created_at", "id"],
+                condition=models.Q(is_session_pb=True),
+                name="solve_session_pb_history_idx",
+            ),
         ]
         ordering = ["-created_at"]
 
@@ -132,3 +183,146 @@ class Solve(models.Model):
             minutes = int((self.time_taken % 3600) // 60)
             seconds = self.time_taken % 60
             return f"{hours}:{minutes:02d}:{seconds:05.2f}"
+
+
+class Tag(models.Model):
+    name = models.CharField(max_length=255, unique=True)
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class SolveTag(models.Model):
+    """One tag on one solve (see ``tracker.tagging``)"""
+
+    solve = models.ForeignKey(Solve, on_delete=models.CASCADE, related_name="tag_links")
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name="solve_links")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["solve", "tag"], name="unique_solve_tag"),
+        ]
+        # Tag filters look up solves by tag
+        indexes = [models.Index(fields=["tag", "solve"])]
+
+    def __str__(self) -> str:
+        return f"{self.solve_id}: {self.tag_id}"
+
+
+class SolveStatistics(models.Model):
+    """
+    Running aggregates for one scope of solves (see ``tracker.stats_store``).
+
+    Updated on every solve insert and delete so the stats endpoint never has
+    to scan the solve table.
+    """
+
+    scope = models.CharField(max_length=100, unique=True)
+    count = models.PositiveIntegerField(default=0)
+    total_time = models.FloatField(default=0.0)
+    total_time_squared = models.FloatField(default=0.0)
+    best_time = models.FloatField(null=True, blank=True)
+    worst_time = models.FloatField(null=True, blank=True)
+    first_solve_at = models.DateTimeField(null=True, blank=True)
+    # [[id, time_taken, created_at epoch], ...] newest first, capped at the
+    # largest rolling average we report (Ao100)
+    recent_solves = models.JSONField(default=list, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "solve statistics"
+
+    def __str__(self) -> str:
+        return f"{self.scope}: {self.count} solves"
+
+    @property
+    def recent_times(self) -> list:
+        return [entry[1] for entry in self.recent_solves]
+
+
+class SolveAggregate(models.Model):
+    """
+    Daily or weekly rollup of solves for one cube type and session
+    (see ``tracker.aggregates``).
+
+    Time-series reads sum a few of these rows per period instead of
+    grouping the solve table.
+    """
+
+    DAY = "day"
+    WEEK = "week"
+    PERIOD_CHOICES = [(DAY, "Day"), (WEEK, "Week")]
+
+    period = models.CharField(max_length=4, choices=PERIOD_CHOICES)
+    # The day itself, or the Monday starting the week, in TIME_ZONE
+    period_start = models.DateField()
+    cube_type = models.ForeignKey(
+        CubeType,
+        on_delete=models.CASCADE,
+        related_name="aggregates",
+        null=True,
+        blank=True,
+    )
+    session = models.ForeignKey(
+        Session,
+        on_delete=models.CASCADE,
+        related_name="aggregates",
+        null=True,
+        blank=True,
+    )
+    count = models.PositiveIntegerField(default=0)
+    total_time = models.FloatField(default=0.0)
+    total_time_squared = models.FloatField(default=0.0)
+    best_time = models.FloatField(null=True, blank=True)
+    worst_time = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            # NULLs never collide in a unique index, so missing cube types
+            # and sessions are folded to 0
+            models.UniqueConstraint(
+                "period",
+                "period_start",
+                Coalesce("cube_type", 0, output_field=models.BigIntegerField()),
+                Coalesce("session", 0, output_field=models.BigIntegerField()),
+                name="unique_solve_aggregate_bucket",
+            ),
+        ]
+        indexes = [models.Index(fields=["period", "period_start"])]
+
+    def __str__(self) -> str:
+        return f"{self.period} {self.period_start}: {self.count} solves"
+
+
+class ScanJob(models.Model):
+    """A queued cube image scan, processed by the run_scan_worker command"""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    image = models.BinaryField(help_text="Encoded image bytes to scan")
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Workers pick the oldest pending job
+            models.Index(fields=["status", "created_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.id} ({self.status})"
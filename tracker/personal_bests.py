@@ -0,0 +1,256 @@
+"""
+Personal-best tracking.
+
+A solve is a personal best when it is faster than every earlier solve of the
+same chain. Every solve is in its cube type's chain (solves without a cube
+type form one of their own), flagged by ``is_pb``, and solves logged in a
+session are also in that session's chain, flagged by ``is_session_pb``.
+Chains are named like the ``tracker.stats_store`` scopes they mirror.
+
+The flagged solves of a chain have times that only go down, and the newest
+link is the current best. Partial indexes over the flagged rows make that
+link a single probe, so new solves are checked on write and the PB history
+is one indexed query.
+
+Most writes append to the end of a chain. Back-dated imports, deletes of a PB
+and edits rewrite only the part of the chain they affect.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Q, QuerySet
+
+from . import stats_store
+from .models import CubeType, Session, Solve
+
+logger = logging.getLogger(__name__)
+
+UPDATE_BATCH_SIZE = 1000
+
+# The chain of solves without a cube type; stats_store has no such scope
+NO_CUBE_CHAIN = f"{stats_store.CUBE_SCOPE_PREFIX}none"
+
+# Chain prefix -> the flag marking its PBs
+FLAG_FIELDS = {
+    stats_store.CUBE_SCOPE_PREFIX: "is_pb",
+    stats_store.SESSION_SCOPE_PREFIX: "is_session_pb",
+}
+
+
+def cube_chain(cube_type_id: Optional[int]) -> str:
+    if cube_type_id is None:
+        return NO_CUBE_CHAIN
+    return stats_store.cube_scope(cube_type_id)
+
+
+def chains_for(solve: Solve) -> List[str]:
+    """Return the chains a solve competes in: its cube type's and its session's"""
+    # The global stats scope has no PB chain of its own
+    sessions = [
+        scope
+        for scope in stats_store.scopes_for(solve)
+        if scope.startswith(stats_store.SESSION_SCOPE_PREFIX)
+    ]
+    return [cube_chain(solve.cube_type_id)] + sessions
+
+
+def flag_field(chain: str) -> str:
+    for prefix, field in FLAG_FIELDS.items():
+        if chain.startswith(prefix):
+            return field
+    raise ValueError(f"Unknown personal best chain: {chain}")
+
+
+def scope_queryset(chain: str) -> QuerySet:
+    """Return the solves that compete for the same PB"""
+    if chain == NO_CUBE_CHAIN:
+        return Solve.objects.filter(cube_type__isnull=True)
+    return stats_store.scope_queryset(chain)
+
+
+def _before(solve: Solve) -> Q:
+    return Q(created_at__lt=solve.created_at) | Q(
+        created_at=solve.created_at, id__lt=solve.pk
+    )
+
+
+def _after(solve: Solve) -> Q:
+    return Q(created_at__gt=solve.created_at) | Q(
+        created_at=solve.created_at, id__gt=solve.pk
+    )
+
+
+def _key(solve: Solve) -> Tuple:
+    return (solve.created_at, solve.pk)
+
+
+def current_best(chain: str) -> Optional[Solve]:
+    """Return the newest PB of a chain, i.e. its best solve so far"""
+    return (
+        scope_queryset(chain)
+        .filter(**{flag_field(chain): True})
+        .order_by("-created_at", "-id")
+        .first()
+    )
+
+
+def _set_flags(field: str, pb_ids: List[int], cleared_ids: List[int]) -> None:
+    for ids, value in ((pb_ids, True), (cleared_ids, False)):
+        for start in range(0, len(ids), UPDATE_BATCH_SIZE):
+            Solve.objects.filter(id__in=ids[start : start + UPDATE_BATCH_SIZE]).update(
+                **{field: value}
+            )
+
+
+def _walk(queryset: QuerySet, field: str, best: Optional[float]) -> None:
+    """Re-flag solves in chronological order, starting from a known best"""
+    pb_ids, cleared_ids = [], []
+    rows = queryset.order_by("created_at", "id").values_list("id", "time_taken", field)
+    for pk, time_taken, is_pb in rows.iterator():
+        new_pb = best is None or time_taken < best
+        if new_pb:
+            best = time_taken
+        if new_pb and not is_pb:
+            pb_ids.append(pk)
+        elif is_pb and not new_pb:
+            cleared_ids.append(pk)
+    _set_flags(field, pb_ids, cleared_ids)
+
+
+def rebuild(chain: str, since: Optional[Solve] = None) -> int:
+    """
+    Re-flag a chain's solves from ``since`` onwards (or from the start).
+
+    Returns the number of PBs in the rebuilt range.
+    """
+    field = flag_field(chain)
+    queryset = scope_queryset(chain)
+    best = None
+    if since is not None:
+        previous = (
+            queryset.filter(_before(since), **{field: True})
+            .order_by("-created_at", "-id")
+            .first()
+        )
+        best = previous.time_taken if previous else None
+        queryset = queryset.filter(Q(pk=since.pk) | _after(since))
+    with transaction.atomic():
+        _walk(queryset, field, best)
+    return queryset.filter(**{field: True}).count()
+
+
+def all_chains() -> List[str]:
+    chains = [NO_CUBE_CHAIN]
+    chains += [
+        stats_store.cube_scope(pk)
+        for pk in CubeType.objects.values_list("id", flat=True)
+    ]
+    chains += [
+        stats_store.session_scope(pk)
+        for pk in Session.objects.values_list("id", flat=True)
+    ]
+    return chains
+
+
+def rebuild_all() -> int:
+    """Re-flag every chain from scratch; returns the number of PBs"""
+    total = sum(rebuild(chain) for chain in all_chains())
+    logger.info(f"Rebuilt personal bests: {total} PBs")
+    return total
+
+
+def record_solves(solves: Iterable[Solve]) -> None:
+    """Flag newly created solves that set a PB"""
+    by_chain: Dict[str, List[Solve]] = {}
+    for solve in solves:
+        for chain in chains_for(solve):
+            by_chain.setdefault(chain, []).append(solve)
+
+    for chain, new_solves in by_chain.items():
+        field = flag_field(chain)
+        new_solves.sort(key=_key)
+        latest = current_best(chain)
+        if latest is not None and _key(new_solves[0]) < _key(latest):
+            # Back-dated: later PBs may no longer be PBs
+            rebuild(chain, since=new_solves[0])
+            flagged = set(
+                scope_queryset(chain)
+                .filter(pk__in=[solve.pk for solve in new_solves], **{field: True})
+                .values_list("id", flat=True)
+            )
+            for solve in new_solves:
+                setattr(solve, field, solve.pk in flagged)
+            continue
+
+        # Appending to the chain: only the current best matters
+        best = latest.time_taken if latest else None
+        for solve in new_solves:
+            setattr(solve, field, best is None or solve.time_taken < best)
+            if getattr(solve, field):
+                best = solve.time_taken
+        _set_flags(
+            field, [solve.pk for solve in new_solves if getattr(solve, field)], []
+        )
+
+
+def forget_solve(solve: Solve) -> None:
+    """Promote the solves a deleted PB was hiding"""
+    for chain in chains_for(solve):
+        field = flag_field(chain)
+        if not getattr(solve, field):
+            # Every later solve was already measured against a best at least
+            # as fast as this one
+            continue
+        queryset = scope_queryset(chain)
+        previous = (
+            queryset.filter(_before(solve), **{field: True})
+            .order_by("-created_at", "-id")
+            .first()
+        )
+        following = (
+            queryset.filter(_after(solve), **{field: True})
+            .order_by("created_at", "id")
+            .first()
+        )
+
+        # Only solves between the neighbouring PBs that beat the previous one
+        # can move up; the next PB is faster than all of them and stays
+        candidates = queryset.filter(_after(solve))
+        if following is not None:
+            candidates = candidates.filter(_before(following))
+        if previous is not None:
+            candidates = candidates.filter(time_taken__lt=previous.time_taken)
+        _walk(candidates, field, previous.time_taken if previous else None)
+
+
+def solve_edited(solve: Solve, previous: Optional[Solve]) -> None:
+    """Re-flag the chains an edited solve was and is part of"""
+    chains = set(chains_for(solve))
+    if previous is not None:
+        chains.update(chains_for(previous))
+    # Rebuild from the earliest point either version of the solve touched
+    earliest = min([solve] + ([previous] if previous else []), key=_key)
+    for chain in sorted(chains):
+        rebuild(chain, since=earliest)
+    solve.is_pb, solve.is_session_pb = (
+        Solve.objects.filter(pk=solve.pk).values_list("is_pb", "is_session_pb").get()
+    )
+
+
+def pb_history(
+    cube_type_id: Optional[int] = None, session_id: Optional[int] = None
+) -> QuerySet:
+    """
+    PB solves, oldest first: a session's chain when one is given, otherwise
+    the cube type chains (all of them unless one is given)
+    """
+    if session_id is not None:
+        return Solve.objects.filter(session_id=session_id, is_session_pb=True).order_by(
+            "created_at", "id"
+        )
+    queryset = Solve.objects.filter(is_pb=True)
+    if cube_type_id is not None:
+        queryset = queryset.filter(cube_type_id=cube_type_id)
+    return queryset.order_by("created_at", "id")
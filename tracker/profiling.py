@@ -0,0 +1,209 @@
+"""
+Sampled query-plan profiling.
+
+Running EXPLAIN ANALYZE executes a query a second time, so it must never be
+on every request. ``QueryPlanMiddleware`` asks ``query_plan_profiler`` whether
+a request is sampled: 1 in ``QUERY_PLAN_SAMPLE_RATE`` requests are, as are
+requests sending the ``X-Query-Plan`` header when ``QUERY_PLAN_HEADER_ENABLED``
+is on. While a sampled request runs, the database wrapper installed on every
+connection times its SELECTs; afterwards the slowest one is explained. With
+``QUERY_PLAN_SLOW_MS`` set, every request is timed this way and a query at
+least that slow is explained whether or not the request was sampled.
+
+Samples go into a bounded ring buffer in the shared cache so every worker
+writes to it and ops can read it back (``/api/v1/query-plans/`` or
+``manage.py test_db``). Each slot is its own key, claimed with ``incr`` on a
+counter, so concurrent writers do not overwrite each other's samples.
+"""
+
+import itertools
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+from django.db.models.query import QuerySet
+from django.dispatch import receiver
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+QUERY_PLAN_HEADER = "X-Query-Plan"
+
+
+@dataclass
+class QueryCapture:
+    """SELECTs of one profiled request: (seconds, sql, params, db alias)"""
+
+    sampled: bool
+    queries: List[Tuple[float, str, Sequence[Any], str]] = field(default_factory=list)
+
+    def slowest(self) -> Optional[Tuple[float, str, Sequence[Any], str]]:
+        return max(self.queries, key=lambda query: query[0], default=None)
+
+
+_capture: ContextVar[Optional[QueryCapture]] = ContextVar(
+    "query_plan_capture", default=None
+)
+
+
+def capture_query(
+    execute: Callable, sql: str, params: Any, many: bool, context: Dict
+) -> Any:
+    """Database execute wrapper timing the SELECTs of a profiled request"""
+    capture = _capture.get()
+    if capture is None or many or not sql.lstrip()[:6].upper() == "SELECT":
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        capture.queries.append(
+            (
+                time.perf_counter() - started,
+                sql,
+                tuple(params or ()),
+                context["connection"].alias,
+            )
+        )
+
+
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs) -> None:
+    if capture_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(capture_query)
+
+
+class QueryPlanProfiler:
+    # Kept out of TwoTierCache's local tier (see LOCAL_EXCLUDE_PREFIXES)
+    counter_key = "query_plan_counter"
+
+    def __init__(self) -> None:
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @property
+    def buffer_size(self) -> int:
+        return getattr(settings, "QUERY_PLAN_BUFFER_SIZE", 50)
+
+    @property
+    def slow_ms(self) -> float:
+        return getattr(settings, "QUERY_PLAN_SLOW_MS", 0)
+
+    def slot_key(self, slot: int) -> str:
+        return f"query_plan_sample_{slot}"
+
+    def should_sample(self, request: Any) -> bool:
+        """Decide whether this request's slowest query gets explained"""
+        if getattr(settings, "QUERY_PLAN_HEADER_ENABLED", False):
+            if request.headers.get(QUERY_PLAN_HEADER) == "1":
+                return True
+
+        rate = getattr(settings, "QUERY_PLAN_SAMPLE_RATE", 0)
+        if rate <= 0:
+            return False
+        with self._lock:
+            return next(self._counter) % rate == 0
+
+    def begin(self, request: Any) -> Any:
+        """Start timing a request's queries; None when it is not profiled"""
+        sampled = self.should_sample(request)
+        if not sampled and self.slow_ms <= 0:
+            return None
+        return _capture.set(QueryCapture(sampled))
+
+    def end(self, token: Any) -> QueryCapture:
+        capture = _capture.get()
+        _capture.reset(token)
+        return capture
+
+    def explain(
+        self, sql: str, params: Sequence[Any], using: str = DEFAULT_DB_ALIAS
+    ) -> str:
+        connection = connections[using]
+        # ANALYZE is only understood by PostgreSQL; elsewhere take the plain plan
+        options = {"analyze": True} if connection.vendor == "postgresql" else {}
+        prefix = connection.ops.explain_query_prefix(**options)
+        with connection.cursor() as cursor:
+            cursor.execute(f"{prefix} {sql}", params)
+            rows = cursor.fetchall()
+        return "\n".join(" ".join(str(column) for column in row) for row in rows)
+
+    def profile_sql(
+        self,
+        view_name: str,
+        sql: str,
+        params: Sequence[Any],
+        using: str = DEFAULT_DB_ALIAS,
+        query_ms: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Explain a statement and record the plan with its timing"""
+        start_time = time.perf_counter()
+        plan = self.explain(sql, params, using)
+        duration_ms = (time.perf_counter() - start_time) * 1000
+
+        sample = {
+            "view": view_name,
+            "vendor": connections[using].vendor,
+            "sql": sql,
+            "params": [str(param) for param in params],
+            "plan": plan,
+            "query_ms": None if query_ms is None else round(query_ms, 3),
+            "duration_ms": round(duration_ms, 3),
+            "recorded_at": timezone.now().isoformat(),
+        }
+        self.record(sample)
+        logger.debug(f"Recorded query plan for {view_name} ({duration_ms:.2f} ms)")
+        return sample
+
+    def profile(self, view_name: str, queryset: QuerySet) -> Dict[str, Any]:
+        """Explain a queryset and record the plan with its timing"""
+        sql, params = queryset.query.sql_with_params()
+        return self.profile_sql(view_name, sql, params, queryset.db)
+
+    def profile_capture(self, capture: Optional[QueryCapture], view_name: str) -> None:
+        """Explain the slowest query of a finished request; never fails it"""
+        slowest = capture.slowest() if capture is not None else None
+        if slowest is None:
+            return
+        seconds, sql, params, using = slowest
+        if not capture.sampled and seconds * 1000 < self.slow_ms:
+            return
+        try:
+            self.profile_sql(view_name, sql, params, using, query_ms=seconds * 1000)
+        except Exception as e:
+            logger.warning(f"Query plan profiling failed for {view_name}: {str(e)}")
+
+    def _next_sequence(self) -> int:
+        cache.add(self.counter_key, 0, timeout=None)
+        try:
+            return cache.incr(self.counter_key)
+        except ValueError:
+            # Evicted between add and incr
+            cache.set(self.counter_key, 1, timeout=None)
+            return 1
+
+    def record(self, sample: Dict[str, Any]) -> None:
+        # incr is atomic on LocMem, Redis and Memcached; the file cache may
+        # still hand two racing writers the same slot
+        sample["sequence"] = self._next_sequence()
+        slot = sample["sequence"] % self.buffer_size
+        cache.set(self.slot_key(slot), sample, timeout=None)
+
+    def samples(self) -> List[Dict[str, Any]]:
+        """Return recorded samples, oldest first"""
+        found = cache.get_many([self.slot_key(i) for i in range(self.buffer_size)])
+        return sorted(found.values(), key=lambda sample: sample["sequence"])
+
+    def clear(self) -> None:
+        # Only the profiler's own keys; the rest of the cache is left alone
+        cache.delete_many([self.slot_key(i) for i in range(self.buffer_size)])
+
+
+query_plan_profiler = QueryPlanProfiler()
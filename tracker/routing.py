@@ -0,0 +1,7 @@
+from django.urls import path
+
+from .consumers import SolveStatsConsumer
+
+websocket_urlpatterns = [
+    path("ws/solves/stats/", SolveStatsConsumer.as_asgi()),
+]
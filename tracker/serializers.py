@@ -1,11 +1,41 @@
 from rest_framework import serializers
-from .models import Solve, VALID_MOVES
+from .models import Session, Solve, VALID_MOVES
+from .tagging import normalize_tags
 import sys
 import os
 
 
+class SessionName(str):
+    """A session given by name, resolved to a ``Session`` only on save"""
+
+
+class SessionField(serializers.PrimaryKeyRelatedField):
+    """
+    A session id. A session name (what the API took before sessions were a
+    model) is still accepted on write: it is validated here and resolved
+    with ``Session.named`` when the solve is saved, so a rejected solve never
+    creates a session. Reads always return the id.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) and not data.strip().isdigit():
+            name = data.strip()
+            if not name:
+                raise serializers.ValidationError("Session name may not be blank")
+            if len(name) > Session._meta.get_field("name").max_length:
+                raise serializers.ValidationError("Session name is too long")
+            return SessionName(name)
+        return super().to_internal_value(data)
+
+
 class SolveSerializer(serializers.ModelSerializer):
     formatted_time = serializers.ReadOnlyField()
+    session = SessionField(
+        queryset=Session.objects.all(),
+        required=False,
+        allow_null=True,
+        help_text="Session id; a session name is also accepted on write",
+    )
 
     class Meta:
         model = Solve
@@ -18,10 +48,23 @@ class SolveSerializer(serializers.ModelSerializer):
             "formatted_time",
             "cube_type",
             "is_pb",
+            "is_session_pb",
             "tags",
             "session",
         ]
-        read_only_fields = ["created_at", "formatted_time"]
+        # PB flags are set by the write path (see tracker.personal_bests)
+        read_only_fields = ["created_at", "formatted_time", "is_pb", "is_session_pb"]
+
+    def _resolve_session(self, validated_data: dict) -> dict:
+        if isinstance(validated_data.get("session"), SessionName):
+            validated_data["session"] = Session.named(validated_data["session"])
+        return validated_data
+
+    def create(self, validated_data: dict) -> Solve:
+        return super().create(self._resolve_session(validated_data))
+
+    def update(self, instance: Solve, validated_data: dict) -> Solve:
+        return super().update(instance, self._resolve_session(validated_data))
 
     def validate_time_taken(self, value: float) -> float:
         if value <= 0:
@@ -48,21 +91,37 @@ class SolveSerializer(serializers.ModelSerializer):
             )
         return value
 
+    def validate_tags(self, value: str) -> str:
+        # Stored as "a,b"; the tag rows are written from this string
+        return normalize_tags(value)
+
     def validate_note(self, value: str) -> str:
         if value and len(value) > 500:
             raise serializers.ValidationError("Note cannot exceed 500 characters")
         return value
 
 
+class SessionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Session
+        fields = ["id", "name", "created_at"]
+        read_only_fields = ["created_at"]
+
+
 class SolveStatsSerializer(serializers.Serializer):
     """Serializer for solve statistics"""
 
     total_solves = serializers.IntegerField()
-    best_time = serializers.FloatField()
-    worst_time = serializers.FloatField()
-    average_time = serializers.FloatField()
+    best_time = serializers.FloatField(allow_null=True)
+    worst_time = serializers.FloatField(allow_null=True)
+    average_time = serializers.FloatField(allow_null=True)
     total_solving_time = serializers.FloatField()
     ao5 = serializers.FloatField(allow_null=True)  # Average of 5
     ao12 = serializers.FloatField(allow_null=True)  # Average of 12
+    ao50 = serializers.FloatField(allow_null=True)  # Average of 50
+    ao100 = serializers.FloatField(allow_null=True)  # Average of 100
     recent_average = serializers.FloatField(allow_null=True)
+    std_deviation = serializers.FloatField(allow_null=True)
+    session_start = serializers.DateTimeField(allow_null=True)
+    solve_count_today = serializers.IntegerField()
     improvement_trend = serializers.CharField(max_length=20)
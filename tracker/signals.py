@@ -0,0 +1,120 @@
+"""
+Write-path hooks for solves.
+
+Derived data (running statistics, daily/weekly rollups, personal-best flags,
+tag rows, the columnar snapshot, cached responses, live stat pushes) is kept
+in step with the solve table here so every write path - API, admin, shell -
+updates it the same way.
+Bulk inserts bypass these signals and must call ``solves_bulk_created``
+instead.
+"""
+
+from typing import List
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import (
+    aggregates,
+    columnar,
+    live_stats,
+    personal_bests,
+    stats_store,
+    tagging,
+)
+from .caching import invalidate_solve_caches
+from .models import CubeType, Session, Solve, SolveStatistics
+
+
+@receiver(pre_save, sender=Solve)
+def solve_saving(sender, instance: Solve, raw: bool = False, **kwargs) -> None:
+    if raw:
+        return
+    instance.tags = tagging.normalize_tags(instance.tags)
+    if instance._state.adding:
+        # PB flags are derived; the post_save hook sets them
+        instance.is_pb = instance.is_session_pb = False
+        return
+    # Edits can move a solve to another bucket; remember where it was
+    if instance.pk is None:
+        return
+    instance._previous_state = Solve.objects.filter(pk=instance.pk).first()
+
+
+@receiver(post_save, sender=Solve)
+def solve_saved(
+    sender, instance: Solve, created: bool, raw: bool = False, **kwargs
+) -> None:
+    if raw:
+        return
+    if created:
+        stats_store.record_solve(instance)
+        aggregates.record_solves([instance])
+        personal_bests.record_solves([instance])
+        tagging.sync_solves([instance], replace=False)
+        # Files can't roll back, so the snapshot only sees committed rows
+        transaction.on_commit(lambda: columnar.append([instance]))
+        transaction.on_commit(
+            lambda: live_stats.broadcast(live_stats.SOLVE_CREATED, instance)
+        )
+    else:
+        # Edits are rare (admin only); the old values are gone, so rebuild
+        # every scope the solve was or is part of
+        previous = getattr(instance, "_previous_state", None)
+        scopes = set(stats_store.scopes_for(instance))
+        if previous is not None:
+            scopes.update(stats_store.scopes_for(previous))
+        for scope in sorted(scopes):
+            stats_store.rebuild(scope)
+        aggregates.rebuild_buckets([instance] + ([previous] if previous else []))
+        personal_bests.solve_edited(instance, previous)
+        if previous is None or previous.tags != instance.tags:
+            tagging.sync_solves([instance])
+        transaction.on_commit(lambda: columnar.replace(instance))
+    # Bump after commit so a concurrent read can't cache pre-write rows
+    # under the new version
+    transaction.on_commit(invalidate_solve_caches)
+
+
+@receiver(post_delete, sender=Solve)
+def solve_deleted(sender, instance: Solve, **kwargs) -> None:
+    stats_store.forget_solve(instance)
+    aggregates.rebuild_buckets([instance])
+    personal_bests.forget_solve(instance)
+    # The instance's pk is cleared once the delete finishes
+    pk = instance.pk
+    transaction.on_commit(lambda: columnar.remove([pk]))
+    transaction.on_commit(invalidate_solve_caches)
+    transaction.on_commit(
+        lambda: live_stats.broadcast(live_stats.SOLVE_DELETED, instance)
+    )
+
+
+@receiver(post_delete, sender=Session)
+def session_deleted(sender, instance: Session, **kwargs) -> None:
+    # Its solves are gone by now; drop the emptied statistics row too
+    SolveStatistics.objects.filter(
+        scope=stats_store.session_scope(instance.pk)
+    ).delete()
+
+
+@receiver(post_delete, sender=CubeType)
+def cube_type_deleted(sender, instance: CubeType, **kwargs) -> None:
+    SolveStatistics.objects.filter(scope=stats_store.cube_scope(instance.pk)).delete()
+
+
+def solves_bulk_created(solves: List[Solve]) -> None:
+    """Apply a batch written with bulk_create to the derived data"""
+    if not solves:
+        return
+    stats_store.record_solves(solves)
+    aggregates.record_solves(solves)
+    personal_bests.record_solves(solves)
+    tagging.sync_solves(solves, replace=False)
+    transaction.on_commit(lambda: columnar.append(solves))
+    transaction.on_commit(invalidate_solve_caches)
+    count = len(solves)
+    transaction.on_commit(
+        lambda: live_stats.broadcast(live_stats.SOLVES_IMPORTED, count=count)
+    )
@@ -0,0 +1,321 @@
+"""
+Incrementally maintained solve statistics.
+
+Every solve belongs to one or more *scopes*: ``"all"``, plus
+``"cube:<id>"`` and ``"session:<id>"`` when it has a cube type or session.
+Each scope
+has a ``SolveStatistics`` row holding count, sum, sum of squares, best,
+worst and a buffer of the most recent ``ROLLING_WINDOW`` solves. Inserts and
+deletes adjust that row in place, so reading stats is a single-row lookup
+instead of a scan and sort of the whole history.
+"""
+
+import logging
+import math
+from statistics import mean
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, QuerySet, Sum
+
+from .models import CubeType, Session, Solve, SolveStatistics
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_SCOPE = "all"
+CUBE_SCOPE_PREFIX = "cube:"
+SESSION_SCOPE_PREFIX = "session:"
+
+# Scope prefix -> the Solve field it filters on
+SCOPE_FIELDS = {CUBE_SCOPE_PREFIX: "cube_type_id", SESSION_SCOPE_PREFIX: "session_id"}
+
+# Largest AoN we report; the recent-solves buffer never grows past this
+ROLLING_WINDOW = 100
+AVERAGE_SIZES = (5, 12, 50, 100)
+
+SIGNIFICANT_IMPROVEMENT = 5  # percent
+
+
+def cube_scope(cube_type_id: int) -> str:
+    return f"{CUBE_SCOPE_PREFIX}{cube_type_id}"
+
+
+def session_scope(session_id: int) -> str:
+    return f"{SESSION_SCOPE_PREFIX}{session_id}"
+
+
+def stats_scope(cube_type_id: Optional[int] = None) -> str:
+    """The scope behind the stats endpoints: every solve, or one cube type"""
+    return GLOBAL_SCOPE if cube_type_id is None else cube_scope(cube_type_id)
+
+
+def scopes_for(solve: Solve) -> List[str]:
+    """Return every scope a solve contributes to"""
+    scopes = [GLOBAL_SCOPE]
+    if solve.cube_type_id is not None:
+        scopes.append(cube_scope(solve.cube_type_id))
+    if solve.session_id is not None:
+        scopes.append(session_scope(solve.session_id))
+    return scopes
+
+
+def scope_queryset(scope: str) -> QuerySet:
+    """Return the solves that make up a scope"""
+    if scope == GLOBAL_SCOPE:
+        return Solve.objects.all()
+    for prefix, field in SCOPE_FIELDS.items():
+        if scope.startswith(prefix):
+            try:
+                value = int(scope[len(prefix) :])
+            except ValueError:
+                break
+            # Walks the (cube_type|session, created_at, id) index
+            return Solve.objects.filter(**{field: value})
+    raise ValueError(f"Unknown statistics scope: {scope}")
+
+
+def _buffer_entry(solve: Solve) -> list:
+    return [solve.pk, solve.time_taken, solve.created_at.timestamp()]
+
+
+def _load_recent_solves(scope: str) -> list:
+    """Fetch the newest ROLLING_WINDOW solves of a scope via the created_at index"""
+    rows = (
+        scope_queryset(scope)
+        .order_by("-created_at", "-id")
+        .values_list("id", "time_taken", "created_at")[:ROLLING_WINDOW]
+    )
+    return [
+        [pk, time_taken, created_at.timestamp()] for pk, time_taken, created_at in rows
+    ]
+
+
+def known_scopes() -> List[str]:
+    """Every scope with a stats row, cube type or session"""
+    scopes = set(SolveStatistics.objects.values_list("scope", flat=True))
+    scopes.add(GLOBAL_SCOPE)
+    scopes.update(
+        cube_scope(pk) for pk in CubeType.objects.values_list("id", flat=True)
+    )
+    scopes.update(
+        session_scope(pk) for pk in Session.objects.values_list("id", flat=True)
+    )
+    return sorted(scopes)
+
+
+def rebuild(scope: str = GLOBAL_SCOPE) -> SolveStatistics:
+    """Recompute a scope from the solve table (on first use and by rebuild_stats)"""
+    with transaction.atomic():
+        record, _ = SolveStatistics.objects.select_for_update().get_or_create(
+            scope=scope
+        )
+        aggregates = scope_queryset(scope).aggregate(
+            count=Count("id"),
+            total=Sum("time_taken"),
+            total_squared=Sum(F("time_taken") * F("time_taken")),
+            best=Min("time_taken"),
+            worst=Max("time_taken"),
+            first=Min("created_at"),
+        )
+        record.count = aggregates["count"]
+        record.total_time = aggregates["total"] or 0.0
+        record.total_time_squared = aggregates["total_squared"] or 0.0
+        record.best_time = aggregates["best"]
+        record.worst_time = aggregates["worst"]
+        record.first_solve_at = aggregates["first"]
+        record.recent_solves = _load_recent_solves(scope)
+        record.save()
+    logger.info(f"Rebuilt solve statistics for scope {scope}")
+    return record
+
+
+def get_statistics(scope: str = GLOBAL_SCOPE) -> SolveStatistics:
+    """Return the statistics record for a scope, building it on first use"""
+    record = SolveStatistics.objects.filter(scope=scope).first()
+    if record is None:
+        record = rebuild(scope)
+    return record
+
+
+async def aget_statistics(scope: str = GLOBAL_SCOPE) -> SolveStatistics:
+    """Async ``get_statistics``; only a missing record falls back to a thread"""
+    record = await SolveStatistics.objects.filter(scope=scope).afirst()
+    if record is None:
+        record = await sync_to_async(rebuild)(scope)
+    return record
+
+
+def _add(scope: str, solves: List[Solve]) -> None:
+    with transaction.atomic():
+        record, created = SolveStatistics.objects.select_for_update().get_or_create(
+            scope=scope
+        )
+        if created:
+            # No running totals yet: seed them from the table, which already
+            # includes these solves
+            rebuild(scope)
+            return
+
+        times = np.array([solve.time_taken for solve in solves], dtype=float)
+        record.count += len(solves)
+        record.total_time += float(times.sum())
+        record.total_time_squared += float(np.dot(times, times))
+        best, worst = float(times.min()), float(times.max())
+        if record.best_time is None or best < record.best_time:
+            record.best_time = best
+        if record.worst_time is None or worst > record.worst_time:
+            record.worst_time = worst
+        first = min(solve.created_at for solve in solves)
+        if record.first_solve_at is None or first < record.first_solve_at:
+            record.first_solve_at = first
+
+        # The buffer holds the newest ROLLING_WINDOW solves of the scope (or
+        # all of them), so merging in the new ones keeps it exact even for
+        # back-dated imports
+        merged = record.recent_solves + [_buffer_entry(solve) for solve in solves]
+        merged.sort(key=lambda entry: (entry[2], entry[0]), reverse=True)
+        record.recent_solves = merged[:ROLLING_WINDOW]
+        record.save()
+
+
+def _remove(scope: str, solve: Solve) -> None:
+    with transaction.atomic():
+        record = SolveStatistics.objects.select_for_update().filter(scope=scope).first()
+        if record is None:
+            rebuild(scope)
+            return
+
+        record.count = max(record.count - 1, 0)
+        if record.count == 0:
+            record.total_time = record.total_time_squared = 0.0
+            record.best_time = record.worst_time = record.first_solve_at = None
+            record.recent_solves = []
+            record.save()
+            return
+
+        time_taken = solve.time_taken
+        record.total_time -= time_taken
+        record.total_time_squared -= time_taken * time_taken
+
+        # Extremes only need a fresh lookup when the removed solve was one;
+        # both are single index probes on time_taken / created_at
+        queryset = scope_queryset(scope)
+        if time_taken == record.best_time:
+            record.best_time = queryset.aggregate(best=Min("time_taken"))["best"]
+        if time_taken == record.worst_time:
+            record.worst_time = queryset.aggregate(worst=Max("time_taken"))["worst"]
+        if solve.created_at == record.first_solve_at:
+            record.first_solve_at = queryset.aggregate(first=Min("created_at"))["first"]
+        if any(entry[0] == solve.pk for entry in record.recent_solves):
+            record.recent_solves = _load_recent_solves(scope)
+        record.save()
+
+
+def record_solve(solve: Solve) -> None:
+    """Fold a newly created solve into every scope it belongs to"""
+    record_solves([solve])
+
+
+def record_solves(solves: List[Solve]) -> None:
+    """Fold a batch of newly created solves into their scopes"""
+    by_scope: Dict[str, List[Solve]] = {}
+    for solve in solves:
+        for scope in scopes_for(solve):
+            by_scope.setdefault(scope, []).append(solve)
+    for scope, scope_solves in by_scope.items():
+        _add(scope, scope_solves)
+
+
+def forget_solve(solve: Solve) -> None:
+    """Remove a deleted solve from every scope it belonged to"""
+    for scope in scopes_for(solve):
+        _remove(scope, solve)
+
+
+def average_of_n(times: List[float], n: int) -> Optional[float]:
+    """Average of the first n times (newest first), dropping best and worst"""
+    if len(times) < n:
+        return None
+
+    times_to_avg = sorted(times[:n])
+    if n >= 3:
+        times_to_avg = times_to_avg[1:-1]
+
+    return mean(times_to_avg)
+
+
+def rolling_averages(times: np.ndarray, n: int) -> np.ndarray:
+    """
+    ``average_of_n`` for every window of n consecutive times, oldest first.
+
+    Element i covers ``times[i:i + n]``. Window sums come from one cumulative
+    sum; the best and worst of each window are reduced over a strided view,
+    so nothing is copied or sorted per window.
+    """
+    times = np.asarray(times, dtype=float)
+    if n < 1 or len(times) < n:
+        return np.empty(0)
+    cumulative = np.concatenate(([0.0], np.cumsum(times)))
+    sums = cumulative[n:] - cumulative[:-n]
+    if n < 3:
+        return sums / n
+    windows = sliding_window_view(times, n)
+    return (sums - windows.min(axis=1) - windows.max(axis=1)) / (n - 2)
+
+
+def improvement_trend(times: List[float]) -> str:
+    """Compare the newer and older halves of the given times (newest first)"""
+    if len(times) < 6:
+        return "insufficient_data"
+
+    recent_array = np.array(times)
+    mid = len(recent_array) // 2
+
+    first_half_avg = np.mean(recent_array[:mid])
+    second_half_avg = np.mean(recent_array[mid:])
+
+    improvement = (first_half_avg - second_half_avg) / first_half_avg * 100
+
+    if improvement > SIGNIFICANT_IMPROVEMENT:
+        return "improving"
+    elif improvement < -SIGNIFICANT_IMPROVEMENT:
+        return "declining"
+    else:
+        return "stable"
+
+
+def build_stats_data(record: SolveStatistics) -> Dict[str, Any]:
+    """Turn a statistics record into the payload served by the stats endpoint"""
+    count = record.count
+    recent_times = record.recent_times
+
+    stats_data: Dict[str, Any] = {
+        "total_solves": count,
+        "best_time": record.best_time,
+        "worst_time": record.worst_time,
+        "average_time": record.total_time / count if count else None,
+        "total_solving_time": record.total_time,
+    }
+    for n in AVERAGE_SIZES:
+        stats_data[f"ao{n}"] = average_of_n(recent_times, n)
+
+    stats_data["recent_average"] = (
+        mean(recent_times[:10]) if len(recent_times) >= 10 else None
+    )
+    stats_data["session_start"] = record.first_solve_at
+    # Trend over the rolling window rather than the whole history
+    stats_data["improvement_trend"] = improvement_trend(recent_times)
+
+    # Sample standard deviation from the running sums
+    if count >= 5:
+        variance = (record.total_time_squared - record.total_time**2 / count) / (
+            count - 1
+        )
+        stats_data["std_deviation"] = math.sqrt(max(variance, 0.0))
+    else:
+        stats_data["std_deviation"] = None
+
+    return stats_data
@@ -0,0 +1,77 @@
+"""
+Normalized solve tags.
+
+``Solve.tags`` stays the comma-separated string the API has always exposed,
+but every tag is also stored as a ``SolveTag`` row pointing at a shared
+``Tag``. Tag filters then go through the ``(tag, solve)`` index instead of a
+``LIKE '%tag%'`` scan over the string column. The rows are rewritten
+whenever a solve's tag string changes.
+"""
+
+from typing import Dict, Iterable, List
+
+from django.db.models import Exists, OuterRef, QuerySet
+
+from .models import Solve, SolveTag, Tag
+
+MATCH_ALL = "all"
+MATCH_ANY = "any"
+MATCH_MODES = (MATCH_ALL, MATCH_ANY)
+
+
+def parse_tags(value: str) -> List[str]:
+    """Split a tag string into distinct, trimmed names, keeping their order"""
+    names = (name.strip() for name in (value or "").split(","))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def format_tags(names: Iterable[str]) -> str:
+    """Join tag names back into the stored string form"""
+    return ",".join(names)
+
+
+def normalize_tags(value: str) -> str:
+    return format_tags(parse_tags(value))
+
+
+def tag_ids(names: Iterable[str]) -> Dict[str, int]:
+    """Return ids for the given names, creating missing tags"""
+    names = set(names)
+    if not names:
+        return {}
+    Tag.objects.bulk_create([Tag(name=name) for name in names], ignore_conflicts=True)
+    return dict(Tag.objects.filter(name__in=names).values_list("name", "id"))
+
+
+def sync_solves(solves: Iterable[Solve], replace: bool = True) -> None:
+    """
+    Write the tag rows for the given solves from their tag strings.
+
+    New solves have no rows yet, so ``replace=False`` skips the delete.
+    """
+    names_by_solve = {solve.pk: parse_tags(solve.tags) for solve in solves}
+    if replace:
+        SolveTag.objects.filter(solve_id__in=list(names_by_solve)).delete()
+    ids = tag_ids(name for names in names_by_solve.values() for name in names)
+    SolveTag.objects.bulk_create(
+        [
+            SolveTag(solve_id=solve_id, tag_id=ids[name])
+            for solve_id, names in names_by_solve.items()
+            for name in names
+        ],
+        batch_size=1000,
+    )
+
+
+def filter_by_tags(
+    queryset: QuerySet, names: List[str], match: str = MATCH_ALL
+) -> QuerySet:
+    """Keep solves carrying all (or any) of the given tags"""
+    if not names:
+        return queryset
+    links = SolveTag.objects.filter(solve=OuterRef("pk"))
+    if match == MATCH_ANY:
+        return queryset.filter(Exists(links.filter(tag__name__in=names)))
+    for name in names:
+        queryset = queryset.filter(Exists(links.filter(tag__name=name)))
+    return queryset
@@ -1,30 +1,126 @@
-import logging
+"""
+Background cube scans.
+
+Scan requests are stored as ``ScanJob`` rows and picked up by the
+``run_scan_worker`` management command, which decodes and classifies the
+images in a process pool. Web workers only enqueue and report status, so
+they never block on OpenCV.
+"""
+
 import base64
-from .ml_service import CubeScanner
+import logging
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+from django.db.models import F
+from django.utils import timezone
+
+from .ml_service import scan_image
+from .models import ScanJob
 
 logger = logging.getLogger(__name__)
 
-def process_cube_image_async(image_data):
+
+def read_image_bytes(image_data: Any) -> bytes:
     """
-    Process cube image asynchronously
+    Accept an uploaded file, a base64 string (bare or as a data URL) or raw
+    bytes. Raises ``binascii.Error`` for bad base64 and ``TypeError`` for
+    anything else.
+    """
+    if hasattr(image_data, "read"):
+        # Handle file object
+        return image_data.read()
+    if isinstance(image_data, str):
+        # Handle base64 string, dropping a "data:image/...;base64," prefix
+        encoded = image_data.split(",", 1)[1] if "," in image_data else image_data
+        return base64.b64decode(encoded, validate=True)
+    if isinstance(image_data, (bytes, bytearray, memoryview)):
+        # Handle raw bytes
+        return bytes(image_data)
+    raise TypeError(f"Unsupported image data: {type(image_data).__name__}")
+
+
+def process_cube_image_async(image_data: Any) -> Dict[str, Any]:
+    """
+    Process cube image in the current process
     """
     try:
-        # Convert image data to processable format
-        if hasattr(image_data, 'read'):
-            # Handle file object
-            image_bytes = image_data.read()
-        elif isinstance(image_data, str) and ',' in image_data:
-            # Handle base64 string
-            image_bytes = base64.b64decode(image_data.split(',')[1])
-        else:
-            # Handle raw bytes
-            image_bytes = image_data
-            
-        # Process the image
-        scanner = CubeScanner()
-        result = scanner.process_frame(image_bytes)
-        
+        result = scan_image(read_image_bytes(image_data))
+        if result is None:
+            return {"error": "Failed to process image"}
         return result
     except Exception as e:
         logger.error(f"Error processing cube image: {str(e)}")
-        return {"error": str(e)}
\ No newline at end of file
+        return {"error": str(e)}
+
+
+def enqueue_cube_scan(image_data: Any) -> ScanJob:
+    """Queue an image for the scan worker; decoding happens there"""
+    return ScanJob.objects.create(image=read_image_bytes(image_data))
+
+
+def claim_jobs(limit: int) -> List[ScanJob]:
+    """
+    Atomically move up to ``limit`` pending jobs to running, oldest first.
+    The conditional UPDATE makes concurrent workers skip each other's jobs.
+    """
+    candidates = (
+        ScanJob.objects.filter(status=ScanJob.PENDING)
+        .order_by("created_at")
+        .values_list("id", flat=True)[: limit * 2]
+    )
+
+    claimed = []
+    for job_id in candidates:
+        updated = ScanJob.objects.filter(pk=job_id, status=ScanJob.PENDING).update(
+            status=ScanJob.RUNNING,
+            started_at=timezone.now(),
+            attempts=F("attempts") + 1,
+        )
+        if updated:
+            claimed.append(job_id)
+        if len(claimed) == limit:
+            break
+    return list(ScanJob.objects.filter(pk__in=claimed).order_by("created_at"))
+
+
+def complete_job(job: ScanJob, result: Optional[Dict[str, Any]]) -> None:
+    if result is None:
+        fail_job(job, "Failed to process image")
+        return
+    job.status = ScanJob.DONE
+    job.result = result
+    job.image = b""  # The image is not needed once scanned
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "result", "image", "finished_at"])
+
+
+def fail_job(job: ScanJob, error: str) -> None:
+    logger.error(f"Scan job {job.id} failed: {error}")
+    job.status = ScanJob.FAILED
+    job.error = error
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "error", "finished_at"])
+
+
+def requeue_stale_jobs(stale_after: timedelta, max_attempts: int) -> int:
+    """Recover jobs left running by a worker that died mid-scan"""
+    cutoff = timezone.now() - stale_after
+    stale = ScanJob.objects.filter(status=ScanJob.RUNNING, started_at__lt=cutoff)
+    failed = stale.filter(attempts__gte=max_attempts).update(
+        status=ScanJob.FAILED,
+        error="Worker did not finish the scan",
+        finished_at=timezone.now(),
+    )
+    requeued = stale.update(status=ScanJob.PENDING, started_at=None)
+    if failed or requeued:
+        logger.warning(f"Requeued {requeued} and failed {failed} stale scan jobs")
+    return requeued
+
+
+def purge_finished_jobs(older_than: timedelta) -> int:
+    cutoff = timezone.now() - older_than
+    deleted, _ = ScanJob.objects.filter(
+        status__in=[ScanJob.DONE, ScanJob.FAILED], finished_at__lt=cutoff
+    ).delete()
+    return deleted
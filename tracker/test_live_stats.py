@@ -0,0 +1,41 @@
+from asgiref.sync import sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.test import TransactionTestCase
+
+from tracker import live_stats
+from tracker.models import Solve
+from tracker.routing import websocket_urlpatterns
+
+
+class LiveStatsConsumerTests(TransactionTestCase):
+    async def _connect(self):
+        communicator = WebsocketCommunicator(
+            URLRouter(websocket_urlpatterns), "/ws/solves/stats/"
+        )
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        return communicator
+
+    async def test_snapshot_then_deltas_on_write(self):
+        await sync_to_async(Solve.objects.create)(time_taken=14.0)
+        communicator = await self._connect()
+
+        snapshot = await communicator.receive_json_from()
+        self.assertEqual(snapshot["event"], "snapshot")
+        self.assertEqual(snapshot["stats"]["total_solves"], 1)
+
+        # Outside a test transaction on_commit fires right after the insert
+        solve = await sync_to_async(Solve.objects.create)(time_taken=9.5)
+        delta = await communicator.receive_json_from()
+        self.assertEqual(delta["event"], live_stats.SOLVE_CREATED)
+        self.assertEqual(delta["solve"]["id"], solve.pk)
+        self.assertTrue(delta["new_pb"])
+        self.assertEqual(delta["stats"]["best_time"], 9.5)
+
+        await sync_to_async(solve.delete)()
+        delta = await communicator.receive_json_from()
+        self.assertEqual(delta["event"], live_stats.SOLVE_DELETED)
+        self.assertEqual(delta["stats"]["total_solves"], 1)
+
+        await communicator.disconnect()
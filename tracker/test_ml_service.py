@@ -1,11 +1,29 @@
 import unittest
 import numpy as np
 from unittest.mock import Mock, patch, MagicMock
-from tracker.ml_service import CubeSolvePredictor, CubeScanner
+from tracker.ml_service import (
+    CubeScanner,
+    CubeScannerPool,
+    CubeSolvePredictor,
+    PredictionBatcher,
+    SolvePredictionService,
+    get_scanner_pool,
+)
 from tracker.models import Solve
+from tracker.testing import SnapshotDirMixin
+from django.core.cache import cache
 from django.test import TestCase
+from django.test.utils import override_settings
 from django.utils import timezone
 import os
+import queue
+import tempfile
+import threading
+from io import StringIO
+import cv2
+from django.core.management import call_command
+from django.urls import reverse
+from tracker import training
 
 
 class CubeSolvePredictorTests(TestCase):
@@ -98,3 +116,276 @@ class CubeScannerAdvancedTests(TestCase):
         # Test frame skipping logic
         self.assertEqual(self.scanner.frame_skip, 2)
         self.assertEqual(self.scanner.frame_count, 0)
+
+
+class CubeScannerPoolTests(TestCase):
+    def test_scanners_are_reused(self):
+        pool = CubeScannerPool(size=2)
+        with pool.scanner() as first:
+            pass
+        with pool.scanner() as second:
+            self.assertIs(first, second)
+
+    def test_pool_never_exceeds_size(self):
+        pool = CubeScannerPool(size=1)
+        pool.warm_up()
+        with pool.scanner():
+            with self.assertRaises(queue.Empty):
+                with pool.scanner(timeout=0.01):
+                    pass
+
+    def test_shared_pool_is_process_wide(self):
+        self.assertIs(get_scanner_pool(), get_scanner_pool())
+
+
+class CubeScannerClassificationTests(TestCase):
+    def setUp(self):
+        self.scanner = CubeScanner()
+
+    def _reference(self, hsv):
+        """Per-cell, per-color cv2.inRange classification the batch must match"""
+        h, w = hsv.shape[:2]
+        size = self.scanner.grid_size
+        results = []
+        for i in range(size):
+            for j in range(size):
+                cy = (2 * i + 1) * (h // size) // 2
+                cx = (2 * j + 1) * (w // size) // 2
+                s = self.scanner.sample_size
+                section = hsv[cy - s : cy + s, cx - s : cx + s]
+                best, best_confidence = "unknown", 0.0
+                for name, (lower, upper) in self.scanner.color_ranges.items():
+                    mask = cv2.inRange(section, np.array(lower), np.array(upper))
+                    confidence = np.count_nonzero(mask) / mask.size
+                    if confidence > best_confidence and confidence > 0.4:
+                        best, best_confidence = name, confidence
+                results.append((best, best_confidence))
+        return results
+
+    def _face_image(self, hsv_colors, size=300):
+        """Build an HSV face image with one flat color per cell plus noise"""
+        grid = self.scanner.grid_size
+        rng = np.random.default_rng(0)
+        cell = size // grid
+        hsv = np.zeros((size, size, 3), dtype=np.uint8)
+        for index, color in enumerate(hsv_colors):
+            i, j = divmod(index, grid)
+            hsv[i * cell : (i + 1) * cell, j * cell : (j + 1) * cell] = color
+        noise = rng.integers(-3, 4, hsv.shape)
+        return np.clip(hsv.astype(int) + noise, 0, 255).astype(np.uint8)
+
+    def test_batched_classification_matches_per_cell_masks(self):
+        palette = [
+            [0, 10, 220],
+            [30, 200, 200],
+            [5, 200, 200],
+            [15, 200, 200],
+            [115, 200, 200],
+            [60, 200, 200],
+            [90, 60, 60],
+        ]
+        rng = np.random.default_rng(1)
+        for _ in range(5):
+            cells = [palette[k] for k in rng.integers(0, len(palette), 9)]
+            hsv = self._face_image(cells)
+            colors, confidences = self.scanner._classify_grid(hsv)
+            expected = self._reference(hsv)
+            self.assertEqual(colors, [name for name, _ in expected])
+            np.testing.assert_allclose(confidences, [c for _, c in expected])
+
+    def test_larger_grids(self):
+        self.scanner.grid_size = 5
+        hsv = self._face_image([[115, 200, 200]] * 25, size=500)
+        colors, _ = self.scanner._classify_grid(hsv)
+        self.assertEqual(colors, ["blue"] * 25)
+        self.assertTrue(self.scanner._validate_colors(colors))
+
+    def test_windows_overrunning_small_images_are_clipped(self):
+        hsv = self._face_image([[60, 200, 200]] * 9, size=60)
+        colors, confidences = self.scanner._classify_grid(hsv)
+        self.assertEqual(colors, ["green"] * 9)
+        self.assertTrue(all(0.4 < c <= 1.0 for c in confidences))
+
+
+class SolvePredictionServiceTests(TestCase):
+    def _features(self, count, start=10.0):
+        times = np.arange(count, dtype=float) + start
+        return CubeSolvePredictor.build_features(
+            times, np.full(count, 20), np.arange(count, dtype=float) * 60
+        )
+
+    def test_predict_batch_groups_histories_by_length(self):
+        predictor = CubeSolvePredictor(model=MagicMock())
+        predictor.fit_scaler(self._features(20))
+        predictor.model.predict.side_effect = lambda batch, verbose=0: (
+            batch[:, -1, :1] * 0 + len(batch)
+        )
+
+        results = predictor.predict_batch(
+            [self._features(20), self._features(5), self._features(20)]
+        )
+        self.assertEqual(results, [2.0, 1.0, 2.0])
+        self.assertEqual(predictor.model.predict.call_count, 2)
+
+    def test_scaler_survives_save_and_load(self):
+        predictor = CubeSolvePredictor()
+        predictor.fit_scaler(self._features(40))
+        directory = self.enterContext(tempfile.TemporaryDirectory())
+        predictor.save(directory)
+        self.assertTrue(CubeSolvePredictor.is_saved(directory))
+
+        loaded = CubeSolvePredictor.load(directory)
+        np.testing.assert_allclose(loaded.scaler.mean_, predictor.scaler.mean_)
+        history = self._features(20)
+        self.assertAlmostEqual(
+            loaded.predict_batch([history])[0],
+            predictor.predict_batch([history])[0],
+            places=5,
+        )
+
+    def test_concurrent_requests_share_a_batch(self):
+        predictor = Mock()
+        predictor.predict_batch.side_effect = lambda batch: [
+            float(features[-1, 0]) for features in batch
+        ]
+        batcher = PredictionBatcher(predictor, max_batch_size=8, max_wait=0.5)
+
+        results = {}
+
+        def request(start):
+            results[start] = batcher.predict(self._features(20, start), timeout=5)
+
+        threads = [threading.Thread(target=request, args=(s,)) for s in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, {s: s + 19.0 for s in range(4)})
+        self.assertEqual(predictor.predict_batch.call_count, 1)
+
+    def test_short_histories_are_not_predicted(self):
+        service = SolvePredictionService("/nonexistent")
+        self.assertIsNone(service.predict(self._features(4)))
+        self.assertFalse(service.is_available())
+
+
+class SolvePredictionEndpointTests(SnapshotDirMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        os.environ["SKIP_SCRAMBLE_VALIDATION"] = "True"
+        self.url = reverse("api:solve-predict")
+
+    def test_unavailable_without_trained_model(self):
+        service = SolvePredictionService("/nonexistent")
+        with patch("tracker.views.get_prediction_service", return_value=service):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 503)
+
+    def test_predicts_from_recent_history(self):
+        for i in range(25):
+            Solve.objects.create(time_taken=10.0 + i)
+        service = SolvePredictionService("/nonexistent")
+        with patch.object(service, "is_available", return_value=True), patch.object(
+            service, "predict", return_value=12.5
+        ) as predict, patch(
+            "tracker.views.get_prediction_service", return_value=service
+        ):
+            data = self.client.get(self.url).json()
+
+        self.assertEqual(data["predicted_time"], 12.5)
+        self.assertEqual(data["based_on"], CubeSolvePredictor.HISTORY_LENGTH)
+        features = predict.call_args[0][0]
+        self.assertEqual(features[-1, 0], 34.0)
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "test-solve-prediction",
+            }
+        }
+    )
+    def test_prediction_is_cached_until_the_next_solve(self):
+        cache.clear()
+        for i in range(5):
+            Solve.objects.create(time_taken=10.0 + i)
+        service = SolvePredictionService("/nonexistent")
+        with patch.object(service, "is_available", return_value=True), patch.object(
+            service, "predict", return_value=12.5
+        ) as predict, patch(
+            "tracker.views.get_prediction_service", return_value=service
+        ):
+            self.client.get(self.url)
+            self.client.get(self.url)
+            self.assertEqual(predict.call_count, 1)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                Solve.objects.create(time_taken=9.0)
+            self.assertEqual(self.client.get(self.url).json()["based_on"], 6)
+        self.assertEqual(predict.call_count, 2)
+
+
+class PredictorTrainingTests(TestCase):
+    def _identity_scaler(self):
+        scaler = Mock()
+        scaler.transform.side_effect = lambda features: features
+        return scaler
+
+    def test_windows_follow_chunks_but_not_cube_types(self):
+        history = 3
+        first = np.arange(20, dtype=float).reshape(4, 5)
+        second = np.arange(20, 35, dtype=float).reshape(3, 5)
+        other = np.arange(100, 125, dtype=float).reshape(5, 5)
+        chunks = [(1, first), (1, second), (2, other)]
+
+        windows, targets = zip(
+            *training.iter_windows(iter(chunks), history, self._identity_scaler())
+        )
+        solves = np.concatenate([first, second])
+        expected = [
+            (solves[i : i + history], solves[i + history, 0])
+            for i in range(len(solves) - history)
+        ] + [(other[i : i + history], other[i + history, 0]) for i in range(2)]
+
+        windows, targets = np.concatenate(windows), np.concatenate(targets)
+        self.assertEqual(len(windows), len(expected))
+        for window, target, (expected_window, expected_target) in zip(
+            windows, targets, expected
+        ):
+            np.testing.assert_array_equal(window, expected_window)
+            self.assertEqual(target, expected_target)
+
+    def test_feature_chunks_match_preprocess_data(self):
+        os.environ["SKIP_SCRAMBLE_VALIDATION"] = "True"
+        solves = [
+            Solve.objects.create(time_taken=10.0 + i, scramble="R U R' U'")
+            for i in range(7)
+        ]
+        chunks = list(training.iter_feature_chunks(chunk_size=3))
+        self.assertEqual([len(features) for _, features in chunks], [3, 3, 1])
+        np.testing.assert_allclose(
+            np.concatenate([features for _, features in chunks]),
+            CubeSolvePredictor().preprocess_data(solves),
+        )
+
+    def test_command_saves_a_loadable_version(self):
+        os.environ["SKIP_SCRAMBLE_VALIDATION"] = "True"
+        for i in range(30):
+            Solve.objects.create(time_taken=10.0 + i % 7, scramble="R U R' U'")
+        output = self.enterContext(tempfile.TemporaryDirectory())
+
+        call_command(
+            "train_predictor",
+            output=output,
+            epochs=1,
+            chunk_size=8,
+            model_version="v1",
+            stdout=StringIO(),
+        )
+
+        self.assertEqual(CubeSolvePredictor.resolve(output), os.path.join(output, "v1"))
+        service = SolvePredictionService(output)
+        self.assertTrue(service.is_available())
+        history = CubeSolvePredictor().preprocess_data(list(Solve.objects.all()))
+        self.assertIsInstance(service.predict(history), float)
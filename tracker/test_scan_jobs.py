@@ -0,0 +1,90 @@
+import base64
+import io
+
+import cv2
+import numpy as np
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from tracker.models import ScanJob
+from tracker.tasks import claim_jobs
+
+
+def face_image_bytes(hsv_color=(60, 200, 200), size=300):
+    """Encode a single-color face as PNG"""
+    hsv = np.zeros((size, size, 3), dtype=np.uint8)
+    hsv[:] = hsv_color
+    ok, encoded = cv2.imencode(".png", cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR))
+    return encoded.tobytes()
+
+
+class ScanJobQueueTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse("api:scan-cube-async")
+
+    def _run_worker(self):
+        call_command("run_scan_worker", processes=0, once=True, stdout=io.StringIO())
+
+    def test_upload_is_queued_and_processed(self):
+        upload = io.BytesIO(face_image_bytes())
+        upload.name = "face.png"
+        response = self.client.post(self.url, {"image": upload}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        task_id = response.json()["task_id"]
+
+        status_url = reverse("api:scan-job", kwargs={"task_id": task_id})
+        self.assertEqual(self.client.get(status_url).json()["status"], ScanJob.PENDING)
+
+        self._run_worker()
+
+        data = self.client.get(status_url).json()
+        self.assertEqual(data["status"], ScanJob.DONE)
+        self.assertEqual(data["result"]["colors"], ["green"] * 9)
+
+    def test_base64_payload_and_undecodable_image(self):
+        encoded = base64.b64encode(b"not an image").decode()
+        response = self.client.post(
+            self.url, {"image": f"data:image/png;base64,{encoded}"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+        self._run_worker()
+
+        job = ScanJob.objects.get()
+        self.assertEqual(job.status, ScanJob.FAILED)
+        self.assertTrue(job.error)
+
+    def test_bare_base64_is_queued_and_bad_payloads_rejected(self):
+        encoded = base64.b64encode(face_image_bytes()).decode()
+        response = self.client.post(self.url, {"image": encoded}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(bytes(ScanJob.objects.get().image), face_image_bytes())
+
+        for image in ("not base64!", "data:image/png;base64,@@@", 123, ["aGk="]):
+            response = self.client.post(self.url, {"image": image}, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, image)
+        self.assertEqual(ScanJob.objects.count(), 1)
+
+    def test_claimed_jobs_are_not_handed_out_twice(self):
+        ScanJob.objects.create(image=b"a")
+        ScanJob.objects.create(image=b"b")
+        first = claim_jobs(limit=1)
+        second = claim_jobs(limit=5)
+        self.assertEqual(len(first), 1)
+        self.assertEqual(len(second), 1)
+        self.assertNotEqual(first[0].pk, second[0].pk)
+        self.assertEqual(claim_jobs(limit=5), [])
+
+    def test_missing_image_and_unknown_job(self):
+        self.assertEqual(self.client.post(self.url, {}, format="json").status_code, 400)
+        response = self.client.get(
+            reverse(
+                "api:scan-job",
+                kwargs={"task_id": "00000000-0000-0000-0000-000000000000"},
+            )
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,22 @@
+"""
+Helpers shared by the test modules.
+"""
+
+import tempfile
+
+from django.test.utils import override_settings
+
+
+class SnapshotDirMixin:
+    """
+    Give each test its own columnar snapshot directory (``SOLVE_SNAPSHOT_DIR``),
+    removed again when the test finishes.
+    """
+
+    def setUp(self):
+        super().setUp()
+        snapshot_dir = tempfile.TemporaryDirectory(prefix="rubiklog_snapshot_")
+        self.addCleanup(snapshot_dir.cleanup)
+        settings_override = override_settings(SOLVE_SNAPSHOT_DIR=snapshot_dir.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
@@ -0,0 +1,170 @@
+"""
+Offline training for the solve time predictor.
+
+Solves are streamed from the database in chunks of plain value tuples (never
+model instances) and turned into the ``CubeSolvePredictor`` feature layout.
+Each chunk is then cut into (history window, next time) training pairs with
+a strided view. Only one chunk of windows is in memory at a time, so memory
+stays flat however many solves there are.
+
+Windows never span cube types. Solves are read in the order of the
+``(cube_type, created_at, id)`` index, and the tail of each chunk is carried
+into the next one, so no window is lost at a chunk boundary.
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Iterator, List, Optional, Tuple
+
+import numpy as np
+from django.db.models import Value
+from django.db.models.functions import Coalesce, Length
+from django.utils import timezone
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .ml_service import CubeSolvePredictor
+from .models import Solve
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 50_000
+BATCH_SIZE = 256
+
+_NO_CHUNK = object()
+
+
+@dataclass
+class TrainingResult:
+    solves: int
+    windows: int
+    loss: Optional[float]
+    directory: str
+
+
+def use_cpu_only() -> None:
+    """Hide GPUs from TensorFlow; must run before it creates any device"""
+    os.environ["CUDA_VISIBLE_DEVICES"] = "-1"
+    import tensorflow as tf
+
+    try:
+        tf.config.set_visible_devices([], "GPU")
+    except RuntimeError as e:
+        logger.warning(f"Could not hide GPUs from TensorFlow: {str(e)}")
+
+
+def _features(rows: List[tuple]) -> np.ndarray:
+    """(cube_type_id, time_taken, scramble_length, created_at) rows -> features"""
+    return CubeSolvePredictor.build_features(
+        np.fromiter((row[1] for row in rows), float, len(rows)),
+        np.fromiter((row[2] for row in rows), float, len(rows)),
+        np.fromiter((row[3].timestamp() for row in rows), float, len(rows)),
+    )
+
+
+def iter_feature_chunks(
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[Tuple[Any, np.ndarray]]:
+    """
+    Yield ``(cube_type_id, features)`` for consecutive runs of solves.
+
+    A run holds at most ``chunk_size`` solves of one cube type, oldest first.
+    """
+    rows = (
+        Solve.objects.order_by("cube_type", "created_at", "id")
+        # Only the length is needed, so the scrambles never leave the database
+        .annotate(scramble_length=Coalesce(Length("scramble"), Value(0))).values_list(
+            "cube_type_id", "time_taken", "scramble_length", "created_at"
+        )
+    )
+    chunk: List[tuple] = []
+    cube_type_id: Any = _NO_CHUNK
+    for row in rows.iterator(chunk_size=min(chunk_size, 10_000)):
+        if chunk and (row[0] != cube_type_id or len(chunk) == chunk_size):
+            yield cube_type_id, _features(chunk)
+            chunk = []
+        cube_type_id = row[0]
+        chunk.append(row)
+    if chunk:
+        yield cube_type_id, _features(chunk)
+
+
+def iter_windows(
+    chunks: Iterator[Tuple[Any, np.ndarray]], history: int, scaler: Any
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Yield ``(windows, targets)`` per chunk.
+
+    ``windows[i]`` holds the scaled features of ``history`` consecutive solves
+    and ``targets[i]`` the raw time of the solve right after them. The
+    windows are a strided view, so nothing is copied until a batch is taken.
+    """
+    carry: Optional[np.ndarray] = None
+    carry_key: Any = _NO_CHUNK
+    for key, features in chunks:
+        if key == carry_key and carry is not None:
+            features = np.concatenate([carry, features])
+        carry, carry_key = features[-history:], key
+        if len(features) <= history:
+            continue
+        scaled = scaler.transform(features)
+        # (solves - history + 1, features, history) -> (windows, history, features)
+        windows = sliding_window_view(scaled, history, axis=0).transpose(0, 2, 1)
+        yield windows[:-1], features[history:, 0]
+
+
+def fit_scaler(predictor: CubeSolvePredictor, chunk_size: int = CHUNK_SIZE) -> int:
+    """Fit the predictor's scaler one chunk at a time; returns the solve count"""
+    solves = 0
+    for _, features in iter_feature_chunks(chunk_size):
+        predictor.scaler.partial_fit(features)
+        solves += len(features)
+    return solves
+
+
+def train(
+    output_dir: str,
+    epochs: int = 3,
+    batch_size: int = BATCH_SIZE,
+    chunk_size: int = CHUNK_SIZE,
+    seed: int = 0,
+    version: Optional[str] = None,
+    predictor: Optional[CubeSolvePredictor] = None,
+) -> TrainingResult:
+    """
+    Train a predictor on every solve and save it as the latest version.
+
+    Each epoch streams the solves again; windows are shuffled within a chunk.
+    """
+    predictor = predictor or CubeSolvePredictor()
+    history = CubeSolvePredictor.HISTORY_LENGTH
+    solves = fit_scaler(predictor, chunk_size)
+
+    rng = np.random.default_rng(seed)
+    window_count, loss = 0, None
+    for epoch in range(epochs):
+        losses: List[float] = []
+        window_count = 0
+        chunks = iter_feature_chunks(chunk_size)
+        for windows, targets in iter_windows(chunks, history, predictor.scaler):
+            order = rng.permutation(len(targets))
+            for start in range(0, len(order), batch_size):
+                batch = order[start : start + batch_size]
+                batch_loss = predictor.model.train_on_batch(
+                    windows[batch], targets[batch]
+                )
+                losses.append(float(np.mean(batch_loss)))
+            window_count += len(targets)
+        if not window_count:
+            raise ValueError(
+                f"Need more than {history} solves of one cube type to train on"
+            )
+        loss = float(np.mean(losses))
+        logger.info(f"Epoch {epoch + 1}/{epochs}: loss {loss:.4f}")
+
+    version = version or timezone.now().strftime("%Y%m%d%H%M%S")
+    directory = predictor.save_version(output_dir, version)
+    logger.info(f"Saved solve predictor trained on {solves} solves to {directory}")
+    return TrainingResult(
+        solves=solves, windows=window_count, loss=loss, directory=directory
+    )
@@ -1,9 +1,43 @@
 from django.urls import path
-from .views import SolveList, SolveDetail, CubeScanView, SolveStats
+from .async_views import AsyncSolveDetail, AsyncSolveList, AsyncSolveStats
+from .views import (
+    SolveList,
+    SolveDetail,
+    CubeScanView,
+    SolveStats,
+    SolveTrends,
+    PersonalBestHistory,
+    RollingAverageSeries,
+    SolvePrediction,
+    SessionList,
+    SessionStats,
+    QueryPlanList,
+    SolveImport,
+    SolveExport,
+    ScanJobStatus,
+    scan_cube,
+)
 
 urlpatterns = [
     path("solves/", SolveList.as_view(), name="solve-list"),
+    path("solves/import/", SolveImport.as_view(), name="solve-import"),
+    path("solves/export/", SolveExport.as_view(), name="solve-export"),
     path("solves/<int:pk>/", SolveDetail.as_view(), name="solve-detail"),
     path("solves/stats/", SolveStats.as_view(), name="solve-stats"),
+    path("solves/trends/", SolveTrends.as_view(), name="solve-trends"),
+    path("solves/pbs/", PersonalBestHistory.as_view(), name="solve-pbs"),
+    path("solves/averages/", RollingAverageSeries.as_view(), name="solve-averages"),
+    path("solves/predict/", SolvePrediction.as_view(), name="solve-predict"),
+    path("sessions/", SessionList.as_view(), name="session-list"),
+    path("sessions/<int:pk>/stats/", SessionStats.as_view(), name="session-stats"),
+    # Async read-only variants, for deployments served by an ASGI worker
+    path("async/solves/", AsyncSolveList.as_view(), name="async-solve-list"),
+    path(
+        "async/solves/<int:pk>/", AsyncSolveDetail.as_view(), name="async-solve-detail"
+    ),
+    path("async/solves/stats/", AsyncSolveStats.as_view(), name="async-solve-stats"),
     path("scan-cube/", CubeScanView.as_view(), name="scan-cube"),
+    path("scan-cube/async/", scan_cube, name="scan-cube-async"),
+    path("scan-cube/jobs/<uuid:task_id>/", ScanJobStatus.as_view(), name="scan-job"),
+    path("query-plans/", QueryPlanList.as_view(), name="query-plans"),
 ]
@@ -5,11 +5,14 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.pagination import PageNumberPagination
-from rest_framework.decorators import api_view
-from rest_framework.exceptions import NotFound
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.utils.urls import replace_query_param
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views import View
 from django.db import connection
 from django.core.cache import cache
 from django.conf import settings
@@ -19,21 +22,49 @@ from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
 from django.core.cache import cache
 import base64
+import binascii
+import csv
+import json
 import numpy as np
 import cv2
 import time
 import logging
 from django.utils.http import urlencode
-from .tasks import process_cube_image_async
+from django.urls import reverse
+from .tasks import enqueue_cube_scan
 from statistics import mean, stdev
 import math
 from django.utils import timezone
-from typing import Any
+from datetime import timedelta
+from django.utils.dateparse import parse_datetime
+from django.db.models import Q
+from typing import Any, Optional
 from rest_framework.request import Request
 
-from .models import Solve
-from .serializers import SolveSerializer, SolveStatsSerializer
-from .ml_service import CubeScanner
+from .models import CubeType, ScanJob, Session, Solve
+from .serializers import SessionSerializer, SolveSerializer, SolveStatsSerializer
+from .ml_service import (
+    CubeSolvePredictor,
+    SolvePredictionService,
+    get_prediction_service,
+    get_scanner_pool,
+)
+from . import (
+    aggregates,
+    columnar,
+    exporters,
+    metrics,
+    personal_bests,
+    stats_store,
+    tagging,
+)
+from .profiling import query_plan_profiler
+from .importers import SolveImporter, iter_csv_rows
+from .caching import (
+    SOLVE_STATS_NAMESPACE,
+    SOLVES_LIST_NAMESPACE,
+    cached_compute,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +75,136 @@ class SolvePagination(PageNumberPagination):
     max_page_size = 200
 
 
+class SolveKeysetPagination:
+    """
+    Keyset (cursor) pagination over ``(sort field, id)``.
+
+    Each page is fetched with a ``WHERE`` on the last key seen instead of an
+    OFFSET, so page N costs the same as page 1 and no COUNT(*) is issued.
+    """
+
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    cursor_query_param = "cursor"
+    sort_fields = ("created_at", "time_taken")
+
+    def get_query_params(self, request: Any) -> Any:
+        # DRF requests expose query_params; plain (async) Django views only GET
+        return getattr(request, "query_params", request.GET)
+
+    def get_page_size(self, request: Any) -> int:
+        try:
+            params = self.get_query_params(request)
+            page_size = int(params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def encode_cursor(self, value: Any, pk: int, reverse: bool) -> str:
+        if hasattr(value, "isoformat"):
+            value = value.isoformat()
+        payload = json.dumps({"v": value, "id": pk, "r": int(reverse)})
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, cursor: str) -> tuple:
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            value, pk, reverse = payload["v"], int(payload["id"]), bool(payload["r"])
+            if self.field == "created_at":
+                value = parse_datetime(value)
+                if value is None:
+                    raise ValueError("invalid timestamp")
+            else:
+                value = float(value)
+        except (TypeError, ValueError, KeyError, AttributeError):
+            raise ValidationError({"cursor": "Invalid cursor"})
+        return value, pk, reverse
+
+    def get_page_queryset(
+        self, queryset: QuerySet, request: Any, sort_by: str
+    ) -> QuerySet:
+        """Build the query for one page (plus one row to detect a next page)"""
+        self.request = request
+        self.descending = sort_by.startswith("-")
+        self.field = sort_by.lstrip("-")
+        if self.field not in self.sort_fields:
+            supported = ", ".join(self.sort_fields)
+            raise ValidationError(
+                {"sort_by": f"Cursor pagination supports: {supported}"}
+            )
+        self.page_size_value = self.get_page_size(request)
+
+        self.cursor = self.get_query_params(request).get(self.cursor_query_param)
+        value, pk, self.reverse = (
+            self.decode_cursor(self.cursor) if self.cursor else (None, None, False)
+        )
+
+        # Walking backwards flips both the comparison and the ordering; the
+        # rows are put back in display order once fetched.
+        descending = self.descending != self.reverse
+        prefix = "-" if descending else ""
+        queryset = queryset.order_by(f"{prefix}{self.field}", f"{prefix}id")
+        if value is not None:
+            op = "lt" if descending else "gt"
+            inclusive = "lte" if descending else "gte"
+            # The leading range on the sort field lets the (field, id) index
+            # bound the scan; the OR only breaks ties within equal values.
+            queryset = queryset.filter(
+                Q(**{f"{self.field}__{inclusive}": value}),
+                Q(**{f"{self.field}__{op}": value}) | Q(**{f"id__{op}": pk}),
+            )
+
+        self.page_queryset = queryset[: self.page_size_value + 1]
+        return self.page_queryset
+
+    def paginate_rows(self, rows: list) -> list:
+        """Trim the fetched rows to a page and work out the neighbouring cursors"""
+        page_size, reverse = self.page_size_value, self.reverse
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        self.next_cursor = self.previous_cursor = None
+        if rows:
+            first, last = rows[0], rows[-1]
+            if has_more or reverse:
+                self.next_cursor = self.encode_cursor(
+                    getattr(last, self.field), last.pk, False
+                )
+            if (has_more and reverse) or (self.cursor and not reverse):
+                self.previous_cursor = self.encode_cursor(
+                    getattr(first, self.field), first.pk, True
+                )
+        return rows
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, sort_by: str
+    ) -> list:
+        page_queryset = self.get_page_queryset(queryset, request, sort_by)
+        return self.paginate_rows(log_query(page_queryset))
+
+    def get_link(self, cursor: Optional[str]) -> Optional[str]:
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, "pagination", "cursor")
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_data(self, data: list) -> dict:
+        return {
+            "next": self.get_link(self.next_cursor),
+            "previous": self.get_link(self.previous_cursor),
+            "results": data,
+        }
+
+    def get_paginated_response(self, data: list) -> Response:
+        return Response(self.get_paginated_data(data))
+
+
 def log_query(query):
     """Log the SQL query and its execution time"""
     start_time = time.time()
@@ -58,15 +219,76 @@ def log_query(query):
         raise
 
 
-def get_cache_key(request):
-    query_dict = request.query_params.copy()
-    sorted_query = urlencode(sorted(query_dict.items()))
-    return f"solves_list_{sorted_query}"
+def solve_list_cache_suffix(query_params) -> str:
+    return urlencode(sorted(query_params.copy().items()))
+
+
+def parse_cube_type(query_params) -> Optional[int]:
+    """Read the optional ?cube_type=<id> filter"""
+    cube_type = query_params.get("cube_type")
+    if not cube_type:
+        return None
+    try:
+        return int(cube_type)
+    except ValueError:
+        raise ValidationError({"cube_type": "Must be a cube type id"})
+
+
+def parse_session(query_params) -> Optional[int]:
+    """Read the optional ?session=<id> filter"""
+    session = query_params.get("session")
+    if not session:
+        return None
+    try:
+        return int(session)
+    except ValueError:
+        raise ValidationError({"session": "Must be a session id"})
+
+
+def stats_cache_suffix(user_id: Any, cube_type_id: Optional[int]) -> str:
+    if cube_type_id is None:
+        return str(user_id)
+    return f"{user_id}_cube_{cube_type_id}"
+
+
+def filter_solves(query_params) -> tuple:
+    """Apply the list filters from the query string; returns (queryset, sort_by)"""
+    filters = {}
+    if "min_time" in query_params:
+        filters["time_taken__gte"] = float(query_params["min_time"])
+    if "max_time" in query_params:
+        filters["time_taken__lte"] = float(query_params["max_time"])
+
+    cube_type_id = parse_cube_type(query_params)
+    if cube_type_id is not None:
+        # Served by the (cube_type, sort field, id) indexes
+        filters["cube_type_id"] = cube_type_id
+    session_id = parse_session(query_params)
+    if session_id is not None:
+        filters["session_id"] = session_id
+    solves = Solve.objects.filter(**filters)
+
+    # ?tags=OH,BLD matches solves with every tag; tag_match=any for either
+    tag_match = query_params.get("tag_match", tagging.MATCH_ALL)
+    if tag_match not in tagging.MATCH_MODES:
+        raise ValidationError(
+            {"tag_match": f"Must be one of: {', '.join(tagging.MATCH_MODES)}"}
+        )
+    tags = tagging.parse_tags(query_params.get("tags", ""))
+    solves = tagging.filter_by_tags(solves, tags, tag_match)
+
+    sort_by = query_params.get("sort_by", "-created_at")
+    return solves.order_by(sort_by), sort_by
+
+
+def use_cursor_pagination(query_params) -> bool:
+    return query_params.get("pagination") == "cursor" or "cursor" in query_params
 
 
 # Create your views here.
 class SolveList(APIView):
     pagination_class = SolvePagination
+    cursor_pagination_class = SolveKeysetPagination
 
     @swagger_auto_schema(
         operation_description="List all solves with optional filtering",
@@ -74,6 +296,29 @@ class SolveList(APIView):
             openapi.Parameter("min_time", openapi.IN_QUERY, type=openapi.TYPE_NUMBER),
             openapi.Parameter("max_time", openapi.IN_QUERY, type=openapi.TYPE_NUMBER),
             openapi.Parameter("sort_by", openapi.IN_QUERY, type=openapi.TYPE_STRING),
+            openapi.Parameter("cube_type", openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+            openapi.Parameter("session", openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+            openapi.Parameter(
+                "tags",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description="Comma-separated tags, e.g. OH,BLD",
+            ),
+            openapi.Parameter(
+                "tag_match",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                enum=list(tagging.MATCH_MODES),
+                description="Require all of the tags (default) or any of them",
+            ),
+            openapi.Parameter(
+                "pagination",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                enum=["page", "cursor"],
+                description="Use 'cursor' for keyset pagination over large histories",
+            ),
+            openapi.Parameter("cursor", openapi.IN_QUERY, type=openapi.TYPE_STRING),
         ],
         responses={200: SolveSerializer(many=True)},
     )
@@ -82,50 +327,18 @@ class SolveList(APIView):
         logger.info("Starting SolveList.get request")
 
         try:
-            # Generate cache key based on query parameters
-            cache_key = get_cache_key(request)
-
-            # Try to get from cache first
-            cached_response = cache.get(cache_key)
-            if cached_response:
-                logger.info(f"Cache hit for {cache_key}")
-                return Response(cached_response)
-
-            # Add filtering and sorting options
-            filters = {}
-            if "min_time" in request.query_params:
-                filters["time_taken__gte"] = float(request.query_params["min_time"])
-            if "max_time" in request.query_params:
-                filters["time_taken__lte"] = float(request.query_params["max_time"])
-
-            sort_by = request.query_params.get("sort_by", "-created_at")
-
-            # Query optimization - removed invalid prefetch_related("tags")
-            solves = Solve.objects.filter(**filters).order_by(sort_by)
-
-            # Log the query plan - only for PostgreSQL
-            if connection.vendor == "postgresql":
-                with connection.cursor() as cursor:
-                    cursor.execute(f"EXPLAIN ANALYZE {solves.query}")
-                    query_plan = cursor.fetchall()
-                    logger.debug("Query plan:")
-                    for row in query_plan:
-                        logger.debug(row[0])
-
-            # Execute query with logging - but don't convert to list yet
-            solves_list = log_query(solves)
-
-            # Simplified pagination implementation
-            paginator = self.pagination_class()
-            page = paginator.paginate_queryset(solves_list, request)
-
-            serializer = SolveSerializer(page, many=True)
-            response = paginator.get_paginated_response(serializer.data)
-
-            # Cache the response
-            cache.set(cache_key, response.data, timeout=60)
-            return response
+            # Identical concurrent queries share one computation; an expired
+            # page is served stale while one request rebuilds it
+            data = cached_compute(
+                SOLVES_LIST_NAMESPACE,
+                solve_list_cache_suffix(request.query_params),
+                lambda: self.list_page(request),
+                timeout=60,
+            )
+            return Response(data)
 
+        except ValidationError as e:
+            return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             logger.error(f"Error in SolveList.get: {str(e)}", exc_info=True)
             return Response(
@@ -133,14 +346,29 @@ class SolveList(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
+    def list_page(self, request: Request) -> dict:
+        # Add filtering and sorting options
+        solves, sort_by = filter_solves(request.query_params)
+
+        if use_cursor_pagination(request.query_params):
+            paginator = self.cursor_pagination_class()
+            page = paginator.paginate_queryset(solves, request, sort_by)
+        else:
+            # Let the paginator slice the queryset so only one page is
+            # loaded instead of the whole filtered table
+            paginator = self.pagination_class()
+            page = paginator.paginate_queryset(solves, request)
+
+        serializer = SolveSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data).data
+
     def post(self, request: Request) -> Response:
         logger.info("Starting SolveList.post request")
         try:
             serializer = SolveSerializer(data=request.data)
             if serializer.is_valid():
+                # Cached lists and stats are invalidated by the post_save hook
                 serializer.save()
-                # Clear the cache when new data is added
-                cache.clear()
                 return Response(serializer.data, status=status.HTTP_201_CREATED)
             logger.warning(f"Validation errors: {serializer.errors}")
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -152,6 +380,97 @@ class SolveList(APIView):
             )
 
 
+class SolveImport(APIView):
+    """
+    Bulk import solves from another timer.
+
+    Accepts a JSON array of solve objects, a ``text/csv`` request body, or a
+    multipart upload in the ``file`` field. CSV input is read as a stream.
+    By default any invalid row aborts the import; pass ``?partial=true`` to
+    keep the valid rows.
+    """
+
+    @swagger_auto_schema(
+        operation_description="Bulk import solves from JSON or CSV",
+        manual_parameters=[
+            openapi.Parameter("partial", openapi.IN_QUERY, type=openapi.TYPE_BOOLEAN),
+        ],
+    )
+    def post(self, request: Request) -> Response:
+        logger.info("Starting SolveImport.post request")
+        partial = request.query_params.get("partial", "").lower() in ("1", "true")
+
+        if request.content_type.startswith("text/csv"):
+            # Read the body line by line rather than through request.data
+            rows = iter_csv_rows(iter(request.stream.readline, b""))
+        elif "file" in request.FILES:
+            rows = iter_csv_rows(request.FILES["file"])
+        elif isinstance(request.data, list):
+            rows = request.data
+        else:
+            return Response(
+                {"error": "Expected a JSON array of solves or a CSV file"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            result = SolveImporter().run(rows, partial=partial)
+        except (UnicodeDecodeError, csv.Error) as e:
+            return Response(
+                {"error": f"Could not read CSV: {str(e)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if result["error_count"] and not partial:
+            return Response(result, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result, status=status.HTTP_201_CREATED)
+
+
+class SolveExport(View):
+    """
+    Stream every solve matching the list filters as CSV or NDJSON.
+
+    A plain Django view because DRF reserves ``?format=`` for its own
+    renderers. Rows are encoded as they are read, so the response size
+    does not affect memory.
+    """
+
+    http_method_names = ["get"]
+    sort_fields = ("created_at", "time_taken")
+
+    def get(self, request) -> StreamingHttpResponse:
+        export_format = request.GET.get("format", exporters.CSV)
+        if export_format not in exporters.FORMATS:
+            return JsonResponse(
+                {"format": f"Must be one of: {', '.join(exporters.FORMATS)}"},
+                status=400,
+            )
+        # Oldest first by default, the order an import would replay them in
+        sort_by = request.GET.get("sort_by", "created_at")
+        if sort_by.lstrip("-") not in self.sort_fields:
+            # Checked before filter_solves, whose order_by rejects unknown
+            # fields with a FieldError
+            return JsonResponse(
+                {"sort_by": f"Must be one of: {', '.join(self.sort_fields)}"},
+                status=400,
+            )
+        try:
+            solves, _ = filter_solves(request.GET)
+        except (ValidationError, ValueError) as e:
+            detail = getattr(e, "detail", {"error": str(e)})
+            return JsonResponse(detail, status=400)
+        prefix = "-" if sort_by.startswith("-") else ""
+        solves = solves.order_by(sort_by, f"{prefix}id")
+
+        response = StreamingHttpResponse(
+            exporters.stream(solves, export_format),
+            content_type=exporters.FORMATS[export_format],
+        )
+        filename = f"solves-{timezone.localdate():%Y%m%d}.{export_format}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
 class SolveDetail(APIView):
     def get_object(self, pk: int) -> Solve:
         return get_object_or_404(Solve, pk=pk)
@@ -163,111 +482,334 @@ class SolveDetail(APIView):
 
     def delete(self, request: Request, pk: int) -> Response:
         solve = self.get_object(pk)
+        # post_delete invalidates the cached lists and stats
         solve.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-# Cache the whole view for 5 minutes
-@method_decorator(cache_page(60 * 5), name="dispatch")
 class SolveStats(APIView):
     """Enhanced statistics with additional metrics"""
 
-    # For more granular caching:
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter(
+                "cube_type",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                description="Only this cube type's solves (default: every solve)",
+            ),
+        ],
+        responses={200: SolveStatsSerializer},
+    )
     def get(self, request: Request) -> Response:
-        cache_key = f"solve_stats_{request.user.id}"
-        cached_stats = cache.get(cache_key)
-
-        if cached_stats:
-            return Response(cached_stats)
-
-        # Continue with calculation if no cache
         try:
-            # Get all solve times in descending order of creation date
-            solves = Solve.objects.order_by("-created_at")
-            recent_times = list(solves.values_list("time_taken", flat=True))
-
-            # Calculate statistics
-            stats_data = {}
-
-            # Basic stats
-            stats_data["total_solves"] = len(recent_times)
-            stats_data["best_time"] = min(recent_times) if recent_times else None
-            stats_data["average_time"] = mean(recent_times) if recent_times else None
-
-            # AO5 and AO12
-            stats_data["ao5"] = self._calculate_average_of_n(recent_times, 5)
-            stats_data["ao12"] = self._calculate_average_of_n(recent_times, 12)
-            stats_data["ao50"] = self._calculate_average_of_n(recent_times, 50)
-            stats_data["ao100"] = self._calculate_average_of_n(recent_times, 100)
-
-            # Recent average (last 10 solves)
-            stats_data["recent_average"] = (
-                mean(recent_times[:10]) if len(recent_times) >= 10 else None
+            cube_type_id = parse_cube_type(request.query_params)
+        except ValidationError as e:
+            return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            data = cached_compute(
+                SOLVE_STATS_NAMESPACE,
+                stats_cache_suffix(request.user.id, cube_type_id),
+                lambda: self.compute_stats(cube_type_id),
+                timeout=60 * 5,  # Cache for 5 minutes
+                refresh_ahead=settings.STATS_CACHE_REFRESH_AHEAD,
+            )
+            return Response(data)
+        except NotFound as e:
+            return Response(e.detail, status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            logger.error(f"Error calculating stats: {str(e)}")
+            return Response(
+                {"error": "Could not calculate statistics"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-            # Session stats
-            last_solve = solves.last()
-            stats_data["session_start"] = last_solve.created_at if last_solve else None
-            stats_data["solve_count_today"] = solves.filter(
-                created_at__date=timezone.now().date()
-            ).count()
+    def compute_stats(self, cube_type_id: Optional[int]) -> dict:
+        # Unknown ids would otherwise get an empty statistics row of their own
+        if (
+            cube_type_id is not None
+            and not CubeType.objects.filter(pk=cube_type_id).exists()
+        ):
+            raise NotFound({"cube_type": "Unknown cube type"})
+
+        # Running totals are maintained on every write, so this is a
+        # single-row read rather than a scan of every solve
+        scope = stats_store.stats_scope(cube_type_id)
+        record = stats_store.get_statistics(scope)
+        stats_data = stats_store.build_stats_data(record)
+
+        # Today's daily rollups rather than a created_at__date scan
+        stats_data["solve_count_today"] = aggregates.solve_count_on(
+            timezone.localdate(), cube_type_id=cube_type_id
+        )
+        return SolveStatsSerializer(stats_data).data
+
 
-            # Improvement trend
-            stats_data["improvement_trend"] = self._calculate_trend(recent_times)
+class SessionList(APIView):
+    def get(self, request: Request) -> Response:
+        sessions = Session.objects.all()
+        return Response(SessionSerializer(sessions, many=True).data)
+
+    @swagger_auto_schema(request_body=SessionSerializer)
+    def post(self, request: Request) -> Response:
+        serializer = SessionSerializer(data=request.data)
+        if serializer.is_valid():
+            serializer.save()
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class SessionStats(APIView):
+    """The stats payload of SolveStats, for one session's solves"""
+
+    def compute_stats(self, session_id: int) -> dict:
+        # The session's own running totals: one row, kept current on write
+        record = stats_store.get_statistics(stats_store.session_scope(session_id))
+        stats_data = stats_store.build_stats_data(record)
+        stats_data["solve_count_today"] = aggregates.solve_count_on(
+            timezone.localdate(), session_id=session_id
+        )
+        return SolveStatsSerializer(stats_data).data
 
-            # Standard deviation (consistency metric)
-            stats_data["std_deviation"] = (
-                stdev(recent_times) if len(recent_times) >= 5 else None
+    def get(self, request: Request, pk: int) -> Response:
+        session = get_object_or_404(Session, pk=pk)
+        data = cached_compute(
+            SOLVE_STATS_NAMESPACE,
+            f"session_{session.pk}",
+            lambda: self.compute_stats(session.pk),
+            timeout=60 * 5,
+            refresh_ahead=settings.STATS_CACHE_REFRESH_AHEAD,
+        )
+        return Response(data)
+
+
+class SolveTrends(APIView):
+    """Per-day or per-week solve trends, read from the rollup table"""
+
+    default_days = {aggregates.DAY: 30, aggregates.WEEK: 365}
+
+    @swagger_auto_schema(
+        operation_description="Solve count and times per day or week",
+        manual_parameters=[
+            openapi.Parameter(
+                "period",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                enum=list(aggregates.PERIODS),
+            ),
+            openapi.Parameter(
+                "days",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                description="How far back to go (default 30 for day, 365 for week)",
+            ),
+            openapi.Parameter("cube_type", openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+            openapi.Parameter("session", openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+        ],
+    )
+    def get(self, request: Request) -> Response:
+        period = request.query_params.get("period", aggregates.DAY)
+        if period not in aggregates.PERIODS:
+            return Response(
+                {"period": f"Must be one of: {', '.join(aggregates.PERIODS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
             )
+        try:
+            days = int(request.query_params.get("days", self.default_days[period]))
+        except ValueError:
+            return Response(
+                {"days": "Must be an integer"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            cube_type_id = parse_cube_type(request.query_params)
+            session_id = parse_session(request.query_params)
+        except ValidationError as e:
+            return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+
+        since = timezone.localdate() - timedelta(days=max(days, 1) - 1)
+        results = aggregates.trend_series(
+            period,
+            since=since,
+            cube_type_id=cube_type_id,
+            session_id=session_id,
+        )
+        return Response({"period": period, "since": since, "results": results})
+
+
+class RollingAverageSeries(APIView):
+    """Every AoN window in solve order, plus the best one ever"""
+
+    max_n = 1000
+
+    def compute_series(
+        self, n: int, cube_type_id: Optional[int], include_series: bool
+    ) -> dict:
+        snapshot = columnar.load()
+        if cube_type_id is not None:
+            snapshot = snapshot.for_cube_type(cube_type_id)
+        snapshot = snapshot.chronological()
+        averages = stats_store.rolling_averages(snapshot.time_taken, n)
+
+        data: dict = {"n": n, "count": len(averages), "best": None, "current": None}
+        if len(averages):
+            # Window i ends at solve i + n - 1
+            best = int(np.argmin(averages))
+            data["best"] = {
+                "average": float(averages[best]),
+                "solve_id": int(snapshot.id[best + n - 1]),
+            }
+            data["current"] = float(averages[-1])
+        if include_series:
+            data["series"] = {
+                "solve_ids": snapshot.id[n - 1 :].tolist() if len(averages) else [],
+                "averages": averages.tolist(),
+            }
+        return data
 
-            cache.set(cache_key, stats_data, 60 * 5)  # Cache for 5 minutes
-            serializer = SolveStatsSerializer(stats_data)
-            return Response(serializer.data)
-        except Exception as e:
-            logger.error(f"Error calculating stats: {str(e)}")
+    @swagger_auto_schema(
+        operation_description="AoN series and best AoN ever",
+        manual_parameters=[
+            openapi.Parameter(
+                "n",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                description="Window size (default 5)",
+            ),
+            openapi.Parameter("cube_type", openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+            openapi.Parameter(
+                "series",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_BOOLEAN,
+                description="Include the full series (default true)",
+            ),
+        ],
+    )
+    def get(self, request: Request) -> Response:
+        try:
+            n = int(request.query_params.get("n", 5))
+            cube_type_id = parse_cube_type(request.query_params)
+        except ValueError:
             return Response(
-                {"error": "Could not calculate statistics"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                {"n": "Must be an integer"}, status=status.HTTP_400_BAD_REQUEST
             )
+        except ValidationError as e:
+            return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+        if not 1 <= n <= self.max_n:
+            return Response(
+                {"n": f"Must be between 1 and {self.max_n}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        include_series = request.query_params.get("series", "true").lower() not in (
+            "0",
+            "false",
+        )
 
-    def _calculate_average_of_n(self, times, n):
-        """Calculate average of N times, removing best and worst"""
-        if len(times) < n:
-            return None
+        data = cached_compute(
+            SOLVE_STATS_NAMESPACE,
+            f"ao{n}_{stats_cache_suffix('series', cube_type_id)}_{include_series}",
+            lambda: self.compute_series(n, cube_type_id, include_series),
+            timeout=60 * 5,
+            refresh_ahead=settings.STATS_CACHE_REFRESH_AHEAD,
+        )
+        return Response(data)
 
-        # Take n most recent times and sort them
-        times_to_avg = sorted(times[:n])
 
-        # Remove best and worst
-        if n >= 3:
-            times_to_avg = times_to_avg[1:-1]
+class SolvePrediction(APIView):
+    """Predicted time of the next solve, from the most recent ones"""
 
-        return mean(times_to_avg)
+    def compute_prediction(
+        self, service: SolvePredictionService, cube_type_id: Optional[int]
+    ) -> dict:
+        snapshot = columnar.load()
+        if cube_type_id is not None:
+            snapshot = snapshot.for_cube_type(cube_type_id)
+        recent = snapshot.chronological().take(
+            slice(-CubeSolvePredictor.HISTORY_LENGTH, None)
+        )
+        prediction = service.predict(
+            CubeSolvePredictor.build_features(
+                recent.time_taken, recent.scramble_length, recent.created_at
+            )
+        )
+        return {
+            "cube_type": cube_type_id,
+            "based_on": len(recent),
+            "predicted_time": prediction,
+        }
 
-    def _calculate_trend(self, recent_times):
-        """Calculate improvement trend based on recent solves"""
-        if len(recent_times) < 6:
-            return "insufficient_data"
+    @swagger_auto_schema(
+        operation_description="Predict the next solve time",
+        manual_parameters=[
+            openapi.Parameter("cube_type", openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+        ],
+    )
+    def get(self, request: Request) -> Response:
+        try:
+            cube_type_id = parse_cube_type(request.query_params)
+        except ValidationError as e:
+            return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
 
-        # Use numpy for faster calculations if you have many solves
-        import numpy as np
+        service = get_prediction_service()
+        if not service.is_available():
+            return Response(
+                {"error": "No trained prediction model"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
 
-        recent_array = np.array(recent_times)
-        mid = len(recent_array) // 2
+        try:
+            # The stats namespace is bumped on every solve write, so a
+            # prediction is reused until the history it was made from changes
+            data = cached_compute(
+                SOLVE_STATS_NAMESPACE,
+                f"prediction_{stats_cache_suffix('next', cube_type_id)}",
+                lambda: self.compute_prediction(service, cube_type_id),
+                timeout=60 * 5,
+            )
+        except Exception as e:
+            logger.error(f"Error predicting next solve: {str(e)}")
+            return Response(
+                {"error": "Could not predict the next solve"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+        return Response(data)
 
-        first_half_avg = np.mean(recent_array[:mid])
-        second_half_avg = np.mean(recent_array[mid:])
 
-        improvement = (first_half_avg - second_half_avg) / first_half_avg * 100
+class PersonalBestHistory(APIView):
+    """Every personal best in the order it was set"""
 
-        # Use constants for magic numbers
-        SIGNIFICANT_IMPROVEMENT = 5
-        if improvement > SIGNIFICANT_IMPROVEMENT:
-            return "improving"
-        elif improvement < -SIGNIFICANT_IMPROVEMENT:
-            return "declining"
-        else:
-            return "stable"
+    @swagger_auto_schema(
+        operation_description="PB progression, oldest first",
+        manual_parameters=[
+            openapi.Parameter(
+                "cube_type",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                description="Only this cube type's PBs (default: every cube type)",
+            ),
+            openapi.Parameter(
+                "session",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                description="This session's PBs instead, across cube types",
+            ),
+        ],
+        responses={200: SolveSerializer(many=True)},
+    )
+    def get(self, request: Request) -> Response:
+        try:
+            cube_type_id = parse_cube_type(request.query_params)
+            session_id = parse_session(request.query_params)
+        except ValidationError as e:
+            return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+        if cube_type_id is not None and session_id is not None:
+            # A session's chain spans cube types; it has no per-cube subchain
+            return Response(
+                {"error": "Pass cube_type or session, not both"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        # Served straight from the partial indexes over flagged solves
+        solves = personal_bests.pb_history(cube_type_id, session_id)
+        return Response({"results": SolveSerializer(solves, many=True).data})
 
 
 class CubeScanView(APIView):
@@ -283,8 +825,8 @@ class CubeScanView(APIView):
 
             # Convert base64 to image
             image_bytes = base64.b64decode(image_data.split(",")[1])
-            scanner = CubeScanner()
-            result = scanner.process_frame(image_bytes)
+            with get_scanner_pool().scanner() as scanner:
+                result = scanner.process_frame(image_bytes)
             if result is None:
                 return Response(
                     {"error": "Failed to process image"},
@@ -299,16 +841,64 @@ class CubeScanView(APIView):
             )
 
 
+class QueryPlanList(APIView):
+    """Query plans collected by the sampling profiler (ops only)"""
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request: Request) -> Response:
+        samples = query_plan_profiler.samples()
+        view_name = request.query_params.get("view")
+        if view_name:
+            samples = [sample for sample in samples if sample["view"] == view_name]
+        return Response({"count": len(samples), "results": samples[::-1]})
+
+    def delete(self, request: Request) -> Response:
+        query_plan_profiler.clear()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 @api_view(["POST"])
 def scan_cube(request):
-    # Initial processing
+    """Queue a cube image for the background scan worker"""
     image_data = request.FILES.get("image")
+    if not image_data and isinstance(request.data, dict):
+        image_data = request.data.get("image")
     if not image_data:
         return JsonResponse({"error": "No image data received"}, status=400)
 
-    # Process asynchronously
-    task = process_cube_image_async.delay(image_data)
-    return JsonResponse({"task_id": task.id})
+    try:
+        job = enqueue_cube_scan(image_data)
+    except (ValueError, TypeError, binascii.Error):
+        return JsonResponse({"error": "Invalid image data"}, status=400)
+    return JsonResponse(
+        {
+            "task_id": str(job.id),
+            "status": job.status,
+            "status_url": request.build_absolute_uri(
+                reverse("api:scan-job", kwargs={"task_id": job.id})
+            ),
+        },
+        status=202,
+    )
+
+
+class ScanJobStatus(APIView):
+    """Status and result of a queued cube scan"""
+
+    def get(self, request: Request, task_id) -> Response:
+        job = get_object_or_404(ScanJob, pk=task_id)
+        data = {
+            "task_id": str(job.id),
+            "status": job.status,
+            "created_at": job.created_at,
+            "finished_at": job.finished_at,
+        }
+        if job.status == ScanJob.DONE:
+            data["result"] = job.result
+        elif job.status == ScanJob.FAILED:
+            data["error"] = job.error
+        return Response(data)
 
 
 def health_check(request):
@@ -342,43 +932,62 @@ def liveness_check(request):
     return JsonResponse({"status": "alive"})
 
 
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+@throttle_classes([])
+def metrics_view(request):
+    """
+    Per-view request metrics in the Prometheus text format (ops only).
+
+    Scrapers authenticate as a staff user, e.g. with that user's API token;
+    scrapes are not throttled.
+    """
+    return HttpResponse(
+        metrics.registry.render(), content_type="text/plain; version=0.0.4"
+    )
+
+
 class SolveStatisticsService:
     def __init__(self, user):
         self.user = user
 
     def get_base_stats(self):
-        """Get basic statistics for a user's solves"""
-        from django.db.models import Avg, Min, Max, StdDev, Count
-        from tracker.models import Solve
-
-        return Solve.objects.filter(user=self.user).aggregate(
-            avg_time=Avg("time"),
-            best_time=Min("time"),
-            worst_time=Max("time"),
-            std_dev=StdDev("time"),
-            total_solves=Count("id"),
-        )
+        """Get basic statistics, vectorized over the columnar snapshot"""
+        times = columnar.load().time_taken
+        if not len(times):
+            return {
+                "avg_time": None,
+                "best_time": None,
+                "worst_time": None,
+                "std_dev": None,
+                "total_solves": 0,
+            }
+        return {
+            "avg_time": float(times.mean()),
+            "best_time": float(times.min()),
+            "worst_time": float(times.max()),
+            "std_dev": float(times.std(ddof=1)) if len(times) > 1 else None,
+            "total_solves": len(times),
+        }
 
     def get_rolling_averages(self):
         """Calculate Ao5, Ao12, etc."""
-        # Implementation for rolling averages
+        # Newest first, as average_of_n expects
+        times = columnar.load().chronological().time_taken[::-1]
+        newest = times[: stats_store.ROLLING_WINDOW].tolist()
+        return {
+            f"ao{n}": stats_store.average_of_n(newest, n)
+            for n in stats_store.AVERAGE_SIZES
+        }
 
     def get_time_trends(self, days=30):
         """Get solve time trends over the specified period"""
-        from django.db.models import Avg
-        from django.utils import timezone
-        import datetime
-
-        solves = (
-            Solve.objects.filter(
-                user=self.user, date__gte=timezone.now() - datetime.timedelta(days=days)
-            )
-            .values("date__date")
-            .annotate(daily_avg=Avg("time"))
-            .order_by("date__date")
-        )
-
-        return list(solves)
+        since = timezone.localdate() - timedelta(days=days - 1)
+        # Daily rollups, so this is one row per day rather than a scan
+        return [
+            {"date": point["period_start"], "daily_avg": point["average_time"]}
+            for point in aggregates.trend_series(aggregates.DAY, since=since)
+        ]
 
 
 class SolveListView(APIView):